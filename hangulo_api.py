@@ -0,0 +1,186 @@
+import io
+import os
+import threading
+from hwpx_template import TemplateCache, TemplatePack, expand_table_rows
+from hwpx_writer import SECTION_NAME, compression_policy, read_raw_members, write_hwpx
+from hangulo_config import CONFIG_FILE, load_field_map
+from hangulo_readers import group_records, iter_records
+from hangulo_core import fill_template, select_template
+
+# API에서 읽은 템플릿 캐시 (명령줄 변환과 달리 템플릿 디렉토리에 컴파일된 템플릿 파일을 쓰지 않습니다.)
+api_template_cache = TemplateCache(persist=False)
+
+def load_template(source, name=None):
+    """
+    템플릿 Hwpx를 메모리에 올리는 함수입니다.
+
+    Parameters:
+        source (str | bytes | file | TemplatePack): 템플릿 Hwpx 파일 경로, 파일 내용, 읽기용 바이너리 파일 객체
+        name (str): 오류 메시지에 표시할 템플릿 이름 (경로가 아닐 때)
+
+    Returns:
+        TemplatePack: 메모리에 올린 템플릿
+    """
+    if isinstance(source, TemplatePack):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        return api_template_cache.get(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    name = name or getattr(source, 'name', '<memory>')
+    return TemplatePack(name, None, read_raw_members(source))
+
+def iter_input_records(source, field_map, input_format=None):
+    """
+    행별 값 목록, 또는 입력 파일 내용이나 파일 객체에서 행별 값을 읽는 제너레이터입니다.
+
+    Parameters:
+        source (iterable[dict] | bytes | file): 행별 값(항목 이름 -> 값) 목록, 또는 입력 파일 내용이나 바이너리 파일 객체
+        field_map (FieldMap): config 파일의 항목 설정
+        input_format (str): 파일 내용의 형식 ('.xlsx', '.csv', '.jsonl', None이면 파일 이름의 확장자, 이름이 없으면 xlsx)
+
+    Yields:
+        dict: 행마다 key -> 값
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    if hasattr(source, 'read'):
+        yield from iter_records(source, field_map, input_format)
+    else:
+        yield from source
+
+class HwpxRenderer:
+    """
+    파일을 만들지 않고 메모리에서 Hwpx 문서를 만드는 클래스입니다.
+
+    template이 없으면 CLI와 같이 template_directory의 template-tax-N.hwpx (없으면 기준 템플릿을 확장)를 사용하고,
+    있으면 그 템플릿 하나를 사용합니다. 반복 행이 한 행인 템플릿은 건수만큼 행을 확장합니다.
+    한 객체를 여러 스레드에서 함께 사용할 수 있습니다.
+
+    사용 예:
+        renderer = HwpxRenderer()
+        data = renderer.render([{'문서번호': '징수과-123', '세액': 40000, ...}])
+        with open('notice.hwpx', 'wb') as f:
+            renderer.write(records, f)
+    """
+
+    def __init__(self, template=None, template_directory='', config_file=CONFIG_FILE, field_map=None):
+        """
+        Parameters:
+            template (str | bytes | file | TemplatePack): 사용할 템플릿 (None이면 template_directory에서 건수에 맞게 찾습니다.)
+            template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+            config_file (str): 설정 파일 경로
+            field_map (FieldMap): 항목 설정 (None이면 config_file에서 읽습니다.)
+        """
+        self.template = load_template(template) if template is not None else None
+        self.template_directory = template_directory
+        self.field_map = field_map or load_field_map(config_file)
+
+        # 행 수 -> 행을 확장한 템플릿
+        self._expanded = {}
+        self._lock = threading.Lock()
+
+    def _template_for(self, row_count):
+        # (오류 메시지에 표시할 템플릿 이름, 템플릿)
+        if self.template is None:
+            return select_template(row_count, self.template_directory, self.field_map, api_template_cache)
+
+        row_key = self.field_map.row_key
+        count = self.template.template.count(row_key)
+        if count == row_count:
+            return self.template.path, self.template
+        if count != 1:
+            raise ValueError(f"템플릿 '{self.template.path}'의 '%{row_key}%' 행 수({count})가 값이 있는 행 수({row_count})와 다릅니다.")
+
+        with self._lock:
+            pack = self._expanded.get(row_count)
+        if pack is None:
+            section_xml = expand_table_rows(self.template.section_xml, row_count, row_key)
+            pack = TemplatePack(self.template.path, self.template.mtime, self.template.members, section_xml)
+            with self._lock:
+                self._expanded[row_count] = pack
+        return self.template.path, pack
+
+    def write(self, records, output_file):
+        """
+        문서 하나를 만들어 열려 있는 파일 객체에 씁니다.
+
+        Parameters:
+            records (iterable[dict] | bytes | file): 한 문서에 들어갈 행별 값, 또는 xlsx 파일 내용이나 바이너리 파일 객체
+            output_file (file): 쓰기용 바이너리 파일 객체
+
+        Raises:
+            ValueError: 값이 있는 행이 없거나 값을 채울 수 없는 경우
+        """
+        records = list(iter_input_records(records, self.field_map))
+        if not records:
+            raise ValueError("값이 있는 행이 없어 변환할 수 없습니다.")
+
+        template_name, template_pack = self._template_for(len(records))
+        xml_output_result = fill_template(records, template_pack.template, template_name, self.field_map)
+        write_hwpx(template_pack.members, output_file, {SECTION_NAME: xml_output_result},
+                   compression_policy(self.field_map.compress_level))
+
+    def render(self, records):
+        """
+        문서 하나를 만들어 Hwpx 파일 내용을 리턴합니다.
+
+        Parameters:
+            records (iterable[dict] | bytes | file): 한 문서에 들어갈 행별 값, 또는 xlsx 파일 내용이나 바이너리 파일 객체
+
+        Returns:
+            bytes: Hwpx 파일 내용
+        """
+        buffer = io.BytesIO()
+        self.write(records, buffer)
+        return buffer.getvalue()
+
+    def iter_render(self, records, group_key=None):
+        """
+        여러 문서를 만들면서 하나씩 돌려주는 제너레이터입니다. 한 번에 한 문서의 값만 메모리에 둡니다.
+
+        Parameters:
+            records (iterable[dict] | bytes | file): 행별 값, 또는 xlsx 파일 내용이나 바이너리 파일 객체
+            group_key (str): 문서를 나눌 key (None이면 [Options] group_key, 그것도 없으면 전체가 문서 하나)
+
+        Yields:
+            tuple[str, bytes]: (group_key 값, Hwpx 파일 내용)
+        """
+        group_key = group_key or self.field_map.group_key
+        if group_key is None:
+            yield None, self.render(records)
+            return
+
+        if group_key not in self.field_map.fields:
+            raise ValueError(f"문서를 나눌 '{group_key}' 항목이 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+
+        for group_value, group in group_records(iter_input_records(records, self.field_map), group_key):
+            yield group_value, self.render(group)
+
+def render_hwpx(records, template=None, template_directory='', config_file=CONFIG_FILE):
+    """
+    행별 값으로 Hwpx 파일 내용을 만드는 함수입니다. (HwpxRenderer(...).render()와 같습니다.)
+
+    Parameters:
+        records (iterable[dict] | bytes | file): 행별 값, 또는 xlsx 파일 내용이나 바이너리 파일 객체
+        template (str | bytes | file | TemplatePack): 사용할 템플릿 (None이면 template-tax-N.hwpx)
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        bytes: Hwpx 파일 내용
+    """
+    return HwpxRenderer(template, template_directory, config_file).render(records)
+
+def write_hwpx_document(records, output_file, template=None, template_directory='', config_file=CONFIG_FILE):
+    """
+    행별 값으로 만든 Hwpx 파일 내용을 열려 있는 파일 객체에 쓰는 함수입니다. (HwpxRenderer(...).write()와 같습니다.)
+
+    Parameters:
+        records (iterable[dict] | bytes | file): 행별 값, 또는 xlsx 파일 내용이나 바이너리 파일 객체
+        output_file (file): 쓰기용 바이너리 파일 객체
+        template (str | bytes | file | TemplatePack): 사용할 템플릿 (None이면 template-tax-N.hwpx)
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+    """
+    HwpxRenderer(template, template_directory, config_file).write(records, output_file)
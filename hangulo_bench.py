@@ -0,0 +1,277 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import platform
+import argparse
+import datetime
+import tempfile
+import contextlib
+from openpyxl import Workbook
+from openpyxl.utils import column_index_from_string
+from hwpx_template import template_cache
+from hwpx_writer import SECTION_NAME, compression_policy, write_hwpx
+from hangulo_config import CONFIG_FILE, load_field_map
+from hangulo_readers import iter_xlsx_records, read_xlsx_records
+from hangulo_numerals import korean_numeral, number_to_korean_amounts
+from hangulo_core import (CONVERTER_VERSION, convert_file_groups, convert_files, fill_template,
+                          number_to_korean_amount, replace_values_in_xml)
+
+# 기본으로 측정할 문서 수
+DEFAULT_DOCUMENT_COUNTS = (1, 1000)
+
+# zip 만들기를 비교할 압축 레벨 (0: 압축 안 함, 1: 가장 빠름, 6: 기본값, 9: 가장 작음)
+COMPRESS_LEVELS = (0, 1, 6, 9)
+
+def synthetic_value(field, document_index, row_index, rng):
+    """
+    항목 형식에 맞는 가짜 셀 값을 만드는 함수입니다.
+
+    Parameters:
+        field (FieldSpec): 항목 설정
+        document_index (int): 문서 번호 (0부터)
+        row_index (int): 문서 안의 행 번호 (0부터)
+        rng (random.Random): 난수 생성기
+
+    Returns:
+        셀 값
+    """
+    if field.type == 'date':
+        return datetime.datetime(2020, 1, 1) + datetime.timedelta(days=rng.randrange(3650))
+    if field.type == 'amount':
+        return rng.randrange(1, 100000) * 100
+    if field.key == '문서번호':
+        return f'징수과-{document_index}'
+    return f'{field.key}-{document_index}-{row_index}'
+
+def write_package(members, section_xml, policy):
+    # Hwpx 파일 하나를 메모리에 만들고 크기를 리턴합니다.
+    buffer = io.BytesIO()
+    write_hwpx(members, buffer, {SECTION_NAME: section_xml}, policy)
+    return buffer.tell()
+
+def generate_workbooks(directory, field_map, document_count, row_count, layout='files', seed=0):
+    """
+    config.ini의 열 배치에 맞는 가짜 xlsx 파일들을 만드는 함수입니다.
+
+    Parameters:
+        directory (str): xlsx 파일을 만들 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+        document_count (int): 문서 수
+        row_count (int): 문서 하나의 행 수
+        layout (str): 'files' (문서마다 xlsx 파일 하나) 또는 'split' (모든 문서를 xlsx 파일 하나에)
+        seed (int): 난수 시드 (같은 시드는 같은 파일을 만듭니다.)
+
+    Returns:
+        list[str]: 만든 xlsx 파일 경로 목록
+    """
+    rng = random.Random(seed)
+    indexes = {key: column_index_from_string(field.column) - 1 for key, field in field_map.fields.items()}
+    width = max(indexes.values()) + 1
+
+    header = [None] * width
+    for key, index in indexes.items():
+        header[index] = key
+
+    def document_rows(document_index):
+        for row_index in range(row_count):
+            row = [None] * width
+            for key, index in indexes.items():
+                row[index] = synthetic_value(field_map.fields[key], document_index, row_index, rng)
+            yield row
+
+    def save(path, document_indexes):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(header)
+        for document_index in document_indexes:
+            for row in document_rows(document_index):
+                ws.append(row)
+        wb.save(path)
+        return path
+
+    if layout == 'split':
+        return [save(os.path.join(directory, 'bench.xlsx'), range(document_count))]
+
+    return [save(os.path.join(directory, f'bench-{document_index:06d}.xlsx'), [document_index])
+            for document_index in range(document_count)]
+
+def measure(name, count, function):
+    """
+    function을 한 번 실행하고 걸린 시간을 결과 dict로 리턴합니다.
+
+    Parameters:
+        name (str): 측정 이름
+        count (int): function이 처리하는 항목 수 (처리 속도 계산용)
+        function (callable): 측정할 함수
+
+    Returns:
+        dict: name, count, seconds, per_second, mean_ms
+    """
+    # 변환 함수들이 입력 파일마다 출력하는 '### <파일 경로>' 줄은 측정에서 뺍니다.
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+
+    return {
+        'benchmark': name,
+        'count': count,
+        'seconds': round(seconds, 6),
+        'per_second': round(count / seconds, 3) if seconds > 0 else None,
+        'mean_ms': round(seconds / count * 1000, 6) if count else None,
+    }
+
+def run_benchmarks(document_count, row_count, layout, work_directory, template_directory, config_file,
+                   workers=1, stage_limit=1000, seed=0):
+    """
+    문서 수 하나에 대해 단계별 측정과 전체 변환 측정을 실행하는 함수입니다.
+
+    단계별 측정(xlsx 읽기, 한글 금액, replace_values_in_xml, zip 만들기)은 stage_limit개 문서까지만 실행하고,
+    전체 변환은 모든 문서로 실행합니다.
+
+    Returns:
+        list[dict]: 측정 결과 목록
+    """
+    field_map = load_field_map(config_file)
+    input_directory = os.path.join(work_directory, 'input')
+    output_directory = os.path.join(work_directory, 'output')
+    os.makedirs(input_directory)
+    os.makedirs(output_directory)
+
+    generate_start = time.perf_counter()
+    file_paths = generate_workbooks(input_directory, field_map, document_count, row_count, layout, seed)
+    generate_seconds = time.perf_counter() - generate_start
+
+    results = []
+    stage_count = min(document_count, stage_limit) if stage_limit else document_count
+
+    # 1. xlsx 읽기
+    if layout == 'split':
+        stage_paths = file_paths
+        results.append(measure('workbook_load', document_count,
+                               lambda: sum(1 for _ in iter_xlsx_records(file_paths[0], field_map.columns))))
+    else:
+        stage_paths = file_paths[:stage_count]
+        results.append(measure('workbook_load', stage_count,
+                               lambda: [read_xlsx_records(path, field_map.columns) for path in stage_paths]))
+
+    documents = []
+    for records in (read_xlsx_records(path, field_map.columns) for path in stage_paths):
+        for start in range(0, len(records), row_count):
+            documents.append(records[start:start + row_count])
+            if len(documents) >= stage_count:
+                break
+        if len(documents) >= stage_count:
+            break
+
+    # 2. 한글 금액
+    amounts = [sum(record.get('계') or 0 for record in records) for records in documents]
+    korean_numeral.cache_clear()
+    results.append(measure('number_to_korean_amount', len(amounts),
+                           lambda: [number_to_korean_amount(amount) for amount in amounts]))
+    korean_numeral.cache_clear()
+    results.append(measure('number_to_korean_amounts', len(amounts), lambda: number_to_korean_amounts(amounts)))
+
+    # 3. replace_values_in_xml (xlsx 읽기 + 값 채우기, 문서마다 xlsx 파일 하나일 때만)
+    hwpx_file = os.path.join(template_directory, f'template-tax-{row_count}.hwpx')
+    if os.path.exists(hwpx_file):
+        template_pack = template_cache.get(hwpx_file)
+    else:
+        hwpx_file = os.path.join(template_directory, field_map.base_template)
+        template_pack = template_cache.get_expanded(hwpx_file, row_count, field_map.row_key)
+
+    if layout == 'files':
+        xml_file = os.path.join(work_directory, 'section0.xml')
+        with open(xml_file, 'wt', encoding='UTF-8') as file:
+            file.write(template_pack.section_xml)
+        results.append(measure('replace_values_in_xml', len(stage_paths),
+                               lambda: [replace_values_in_xml(path, xml_file, config_file) for path in stage_paths]))
+
+    # 4. 값 채우기 (분해된 템플릿 사용)
+    rendered = []
+    results.append(measure('render', len(documents),
+                           lambda: rendered.extend(fill_template(records, template_pack.template, hwpx_file, field_map)
+                                                   for records in documents)))
+
+    # 5. zip 만들기 (메모리에, 압축 레벨별 속도와 크기)
+    for compress_level in COMPRESS_LEVELS:
+        policy = compression_policy(compress_level)
+        buffers = []
+        result = measure(f'package_level_{compress_level}', len(rendered),
+                         lambda: buffers.extend(write_package(template_pack.members, xml, policy) for xml in rendered))
+        result['compress_level'] = compress_level
+        result['mean_bytes'] = round(sum(buffers) / len(buffers)) if buffers else None
+        results.append(result)
+
+    # 6. 전체 변환 (파일 쓰기 포함)
+    if layout == 'split':
+        group_key = field_map.group_key or '문서번호'
+        end_to_end = lambda: list(convert_file_groups(file_paths[0], output_directory, group_key,
+                                                      template_directory, config_file))
+    else:
+        end_to_end = lambda: list(convert_files(file_paths, output_directory, template_directory, workers, config_file))
+    results.append(measure('end_to_end', document_count, end_to_end))
+
+    for result in results:
+        result.update({'documents': document_count, 'rows': row_count, 'layout': layout, 'workers': workers})
+    results.append({'benchmark': 'generate', 'documents': document_count, 'rows': row_count, 'layout': layout,
+                    'seconds': round(generate_seconds, 6)})
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='가짜 xlsx 파일을 만들어 변환 단계별 처리 속도를 측정합니다.')
+    parser.add_argument('-n', '--documents', default=','.join(map(str, DEFAULT_DOCUMENT_COUNTS)),
+                        help='측정할 문서 수 (쉼표로 여러 개, 예: 1,1000,100000)')
+    parser.add_argument('-r', '--rows', type=int, default=3, help='문서 하나의 행 수 (기본값: 3)')
+    parser.add_argument('--layout', choices=('files', 'split'), default='files',
+                        help='files: 문서마다 xlsx 파일 하나, split: 모든 문서를 xlsx 파일 하나에 (문서번호로 나눔)')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='전체 변환에 사용할 프로세스 수 (기본값: 1)')
+    parser.add_argument('--stage-limit', type=int, default=1000, help='단계별 측정에 사용할 최대 문서 수 (0: 전체)')
+    parser.add_argument('-t', '--templates', dest='template_directory', default='', help='template-tax-N.hwpx 파일이 있는 디렉토리')
+    parser.add_argument('-c', '--config', dest='config_file', default=CONFIG_FILE, help='설정 파일 경로 (기본값: config.ini)')
+    parser.add_argument('--seed', type=int, default=0, help='가짜 값 난수 시드')
+    parser.add_argument('--work-dir', help='가짜 파일을 만들 디렉토리 (기본값: 임시 디렉토리, 끝나면 지움)')
+    parser.add_argument('-o', '--output', dest='output_file', help='결과(JSON)를 저장할 파일 경로 (기본값: 표준 출력)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    document_counts = [int(count) for count in args.documents.split(',') if count.strip()]
+
+    report = {
+        'version': CONVERTER_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': [],
+    }
+
+    for document_count in document_counts:
+        work_directory = tempfile.mkdtemp(prefix='hangulo-bench-', dir=args.work_dir)
+        try:
+            report['results'].extend(run_benchmarks(document_count, args.rows, args.layout, work_directory,
+                                                    args.template_directory, args.config_file, args.workers,
+                                                    args.stage_limit, args.seed))
+        finally:
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+        for result in report['results']:
+            if result['documents'] == document_count and 'per_second' in result:
+                print(f"{document_count:>8} {result['benchmark']:<24} {result['seconds']:>10.3f}s "
+                      f"{result['per_second'] or 0:>12.1f}/s", file=sys.stderr)
+
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output_file:
+        with open(args.output_file, 'wt', encoding='UTF-8') as file:
+            file.write(report_json)
+    else:
+        print(report_json)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
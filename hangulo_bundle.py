@@ -0,0 +1,111 @@
+import io
+import json
+import time
+import hashlib
+import tarfile
+import zipfile
+
+# 묶음 파일 형식 -> 확장자
+BUNDLE_EXTENSIONS = {'zip': '.zip', 'tar': '.tar'}
+
+# 묶음의 마지막에 넣는 색인 파일 이름 (문서마다 JSON 한 줄)
+INDEX_NAME = 'index.jsonl'
+
+class BundleWriter:
+    """
+    변환한 Hwpx 문서들을 zip 또는 tar 파일 하나에 차례로 쓰는 클래스입니다.
+
+    문서는 받는 즉시 파일에 쓰므로 묶음 전체를 메모리에 두지 않습니다.
+    Hwpx 파일은 이미 압축되어 있으므로 zip은 다시 압축하지 않고(ZIP_STORED) 저장하고,
+    tar는 되돌아가 쓰지 않는 스트림 형식('w|')으로 씁니다.
+    close()하면 문서마다 이름, 입력 파일, 크기, SHA-256을 기록한 색인(index.jsonl)을 마지막 항목으로 넣습니다.
+
+    사용 예:
+        with open('batch.zip', 'wb') as f:
+            bundle = BundleWriter(f, 'zip')
+            bundle.add('case1.hwpx', data, 'case1.xlsx')
+            bundle.close()
+    """
+
+    def __init__(self, fileobj, bundle_format):
+        """
+        Parameters:
+            fileobj (file): 쓰기용 바이너리 파일 객체
+            bundle_format (str): 묶음 형식 ('zip', 'tar')
+
+        Raises:
+            ValueError: 지원하지 않는 형식인 경우
+        """
+        if bundle_format not in BUNDLE_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 묶음 형식 '{bundle_format}' 입니다. ({', '.join(BUNDLE_EXTENSIONS)} 중 하나)")
+
+        self.bundle_format = bundle_format
+        if bundle_format == 'zip':
+            self._archive = zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_STORED)
+        else:
+            self._archive = tarfile.open(fileobj=fileobj, mode='w|', format=tarfile.PAX_FORMAT)
+
+        # 색인에 기록할 문서 정보 (넣은 순서)
+        self.entries = []
+        self._names = set()
+
+    def _write_member(self, name, data):
+        if self.bundle_format == 'zip':
+            self._archive.writestr(zipfile.ZipInfo(name, time.localtime()[:6]), data)
+            return
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._archive.addfile(info, io.BytesIO(data))
+
+    def add(self, name, data, source=None):
+        """
+        문서 하나를 묶음에 넣습니다.
+
+        Parameters:
+            name (str): 묶음 안의 Hwpx 파일 이름
+            data (bytes): Hwpx 파일 내용
+            source (str): 문서를 만든 입력 파일 이름
+
+        Raises:
+            ValueError: 같은 이름의 문서가 이미 들어 있는 경우
+        """
+        if name in self._names or name == INDEX_NAME:
+            raise ValueError(f"묶음에 같은 이름의 문서 '{name}'가 이미 있습니다. 입력 파일 이름이 겹치지 않는지 확인해 주세요.")
+        self._names.add(name)
+
+        self._write_member(name, data)
+        self.entries.append({
+            'name': name,
+            'source': source,
+            'size': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        })
+
+    def close(self):
+        """
+        색인을 넣고 묶음을 닫습니다. (파일 객체는 닫지 않습니다.)
+        """
+        index = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in self.entries)
+        self._write_member(INDEX_NAME, index.encode('UTF-8'))
+        self._archive.close()
+
+def read_bundle_index(bundle_file):
+    """
+    묶음 파일의 색인을 읽는 함수입니다.
+
+    Parameters:
+        bundle_file (str): zip 또는 tar 묶음 파일 경로
+
+    Returns:
+        list[dict]: 문서마다 name, source, size, sha256
+    """
+    # tar 안의 Hwpx 파일도 zip이라 zipfile.is_zipfile()이 참이 될 수 있으므로 tar인지 먼저 확인합니다.
+    if tarfile.is_tarfile(bundle_file):
+        with tarfile.open(bundle_file) as archive:
+            data = archive.extractfile(INDEX_NAME).read()
+    else:
+        with zipfile.ZipFile(bundle_file) as archive:
+            data = archive.read(INDEX_NAME)
+    return [json.loads(line) for line in data.decode('UTF-8').splitlines() if line]
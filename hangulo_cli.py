@@ -0,0 +1,261 @@
+import sys
+import os
+import json
+import time
+import argparse
+import contextlib
+import multiprocessing
+from hangulo_config import CONFIG_FILE, OUTPUT_MODES, load_field_map
+from hangulo_core import CONVERTER_VERSION, ConversionRun, compile_templates, list_input_files, resolve_output_directory
+from hangulo_progress import ProgressTracker
+from hangulo_pipeline import PipelineRun
+from hangulo_profiler import ProfileReport, enable_profiling
+from hangulo_verify import VerificationReport, verify_outputs
+from hwpx_template import enable_template_artifacts
+from hangulo_watch import POLL_INTERVAL, SETTLE_SECONDS, watch_folder
+
+# 종료 코드
+EXIT_OK = 0            # 모든 파일 변환 완료
+EXIT_FAILED = 1        # 변환 중 오류 발생
+EXIT_SKIPPED = 2       # 변환은 끝났지만 변환할 수 없는 파일이 있음
+EXIT_NO_INPUT = 3      # 입력 디렉토리에 입력 파일이 없음
+EXIT_MISMATCH = 4      # 변환은 끝났지만 문서와 입력 값이 일치하지 않음 (--verify)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='xlsx, CSV, JSON-lines 파일들을 Hwpx 파일로 변환합니다. (GUI 없이 실행)')
+    parser.add_argument('input_directory', nargs='?', help='xlsx, CSV, JSON-lines 파일이 있는 디렉토리')
+    parser.add_argument('-o', '--output', dest='output_directory', help='Hwpx 파일을 저장할 디렉토리 (기본값: 설정 파일의 [Options] output_directory, 없으면 입력 디렉토리)')
+    parser.add_argument('--output-mode', choices=OUTPUT_MODES, help='출력 방식 - files: 디렉토리에 Hwpx 파일, sharded: 파일 이름 해시로 나눈 하위 디렉토리, zip/tar: 색인(index.jsonl)이 든 묶음 파일 하나 (기본값: 설정 파일의 [Options] output_mode)')
+    parser.add_argument('--bundle', dest='bundle_file', help='zip/tar 출력의 묶음 파일 경로 (기본값: 출력 디렉토리의 hangulo-<날짜>-<시각>.zip/.tar)')
+    parser.add_argument('-t', '--templates', dest='template_directory', default='', help='template-tax-N.hwpx 파일이 있는 디렉토리 (기본값: 현재 디렉토리)')
+    parser.add_argument('-c', '--config', dest='config_file', default=CONFIG_FILE, help='설정 파일 경로 (기본값: config.ini)')
+    parser.add_argument('-w', '--workers', type=int, help='변환에 사용할 프로세스 수 (0: CPU 코어 수, 기본값: 설정 파일의 [Options] workers)')
+    parser.add_argument('--split-by', dest='group_key', help='xlsx 파일 하나를 이 항목 값별로 여러 Hwpx 파일로 나눕니다. (예: 문서번호, 기본값: 설정 파일의 [Options] group_key)')
+    parser.add_argument('--merge', dest='merge_file', help='모든 문서를 구역별로 담은 Hwpx 파일 하나를 이 경로에 저장합니다. (모든 template-tax-N.hwpx의 header.xml이 같아야 합니다.)')
+    parser.add_argument('--incremental', action=argparse.BooleanOptionalAction, default=None, help='이전 실행 이후 바뀐 xlsx 파일만 다시 변환합니다. --no-incremental이면 모두 다시 변환합니다. (기본값: 설정 파일의 [Options] incremental)')
+    parser.add_argument('--progress', action='store_true', help='파일 하나를 처리할 때마다 진행 상황(파일 수, 크기, 속도, 남은 시간)을 표준 에러로 출력합니다.')
+    parser.add_argument('--profile', dest='profile_file', help='문서별 단계 시간(xlsx 읽기, 템플릿, 값 채우기, zip, 쓰기)과 최대 메모리를 측정해 JSON 리포트로 저장합니다.')
+    parser.add_argument('--watch', action='store_true', help='입력 디렉토리를 계속 감시하면서 새로 들어오거나 바뀐 xlsx 파일을 변환합니다. (Ctrl+C로 종료)')
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, help=f'--watch: 디렉토리를 다시 확인하는 간격 (초, 기본값: {POLL_INTERVAL})')
+    parser.add_argument('--settle', dest='settle_seconds', type=float, default=SETTLE_SECONDS, help=f'--watch: 파일이 다 쓰였다고 볼 때까지 기다리는 시간 (초, 기본값: {SETTLE_SECONDS})')
+    parser.add_argument('--summary', dest='summary_file', help='변환 결과 요약(JSON)을 저장할 파일 경로')
+    parser.add_argument('--pipeline', action=argparse.BooleanOptionalAction, default=None, help='읽기, 값 채우기, zip 만들기, 쓰기를 단계별 스레드로 겹쳐 실행하고 단계별 대기열 통계를 요약에 기록합니다. (기본값: 설정 파일의 [Pipeline] enabled)')
+    parser.add_argument('--verify', action=argparse.BooleanOptionalAction, default=None, help='변환이 끝나면 문서들을 다시 열어 입력 값, 계의 합계와 대조하고 불일치가 있으면 종료 코드 4를 돌려줍니다. (기본값: 설정 파일의 [Options] verify)')
+    parser.add_argument('--verify-report', dest='verify_report', help='--verify: 불일치 목록 리포트(JSON)를 저장할 파일 경로')
+    parser.add_argument('--compile-templates', action='store_true', help='템플릿들을 config.ini와 대조해 미리 컴파일해 두고 종료합니다. (입력 디렉토리가 필요 없습니다.)')
+    args = parser.parse_args(argv)
+    if args.input_directory is None and not args.compile_templates:
+        parser.error('input_directory가 필요합니다.')
+    return args
+
+def run_batch(input_directory, output_directory=None, template_directory='', config_file=CONFIG_FILE, workers=None, group_key=None, merge_file=None, incremental=None, on_progress=None, profile_file=None, pipeline=None, output_mode=None, bundle_file=None, verify=None, verify_report=None):
+    """
+    GUI의 ConverterThread.run과 같은 방식으로 디렉토리 안의 xlsx 파일들을 변환하는 함수입니다.
+
+    Parameters:
+        input_directory (str): xlsx 파일이 있는 디렉토리
+        output_directory (str): Hwpx 파일을 저장할 디렉토리 (None이면 설정 파일 값, 그것도 없으면 입력 디렉토리)
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        workers (int): 사용할 프로세스 수 (None이면 설정 파일 값, 0이면 CPU 코어 수)
+        group_key (str): xlsx 파일 하나를 여러 문서로 나눌 key (None이면 설정 파일 값)
+        merge_file (str): 모든 문서를 합친 Hwpx 파일 경로 (None이면 문서마다 Hwpx 파일 하나)
+        incremental (bool): 바뀐 파일만 다시 변환할지 여부 (None이면 설정 파일 값, 합치는 경우에는 사용하지 않음)
+        on_progress (callable): 결과가 나올 때마다 ProgressSnapshot을 받아 호출할 함수
+        profile_file (str): 단계별 측정 리포트(JSON)를 저장할 파일 경로 (None이면 측정하지 않음)
+        pipeline (bool): 단계별 파이프라인으로 변환할지 여부 (None이면 설정 파일의 [Pipeline] enabled)
+        output_mode (str): 출력 방식 ('files', 'sharded', 'zip', 'tar', None이면 설정 파일 값)
+        bundle_file (str): zip/tar 출력의 묶음 파일 경로 (None이면 출력 디렉토리에 날짜와 시각으로 이름을 만듭니다.)
+        verify (bool): 변환이 끝나면 문서들을 입력 값과 대조할지 여부 (None이면 설정 파일 값, 합치는 경우에는 사용하지 않음)
+        verify_report (str): 불일치 리포트(JSON)를 저장할 파일 경로 (None이면 요약에 개수만 기록)
+
+    Returns:
+        dict: 변환 결과 요약 (exit_code 포함)
+    """
+    start_time = time.perf_counter()
+
+    summary = {
+        'exit_code': EXIT_OK,
+        'input_directory': input_directory,
+        'output_directory': output_directory,
+        'workers': workers,
+        'total': 0,
+        'converted': [],
+        'invalid': [],
+        'up_to_date': [],
+        'error': None,
+    }
+
+    # 설정 파일은 변환을 시작하기 전에 한 번 읽고 검증합니다.
+    try:
+        field_map = load_field_map(config_file)
+    except ValueError as e:
+        summary['exit_code'] = EXIT_FAILED
+        summary['error'] = str(e)
+        return summary
+
+    output_directory = output_directory or resolve_output_directory(input_directory, field_map.output_directory)
+    summary['output_directory'] = output_directory
+    summary['output_mode'] = output_mode = output_mode or field_map.output_mode
+
+    if workers is None:
+        workers = field_map.workers
+    elif workers <= 0:
+        workers = os.cpu_count() or 1
+    summary['workers'] = workers
+    summary['group_key'] = group_key = group_key or field_map.group_key
+    summary['compress_level'] = field_map.compress_level
+    if incremental is None:
+        incremental = field_map.incremental
+    if pipeline is None:
+        pipeline = field_map.pipeline.enabled
+    if verify is None:
+        verify = field_map.verify
+
+    input_files = list_input_files(input_directory)
+    summary['total'] = len(input_files)
+    if not input_files:
+        summary['exit_code'] = EXIT_NO_INPUT
+        summary['error'] = 'There are no .xlsx, .csv or .jsonl files in the selected directory.'
+        return summary
+
+    os.makedirs(output_directory, exist_ok=True)
+    file_paths = [os.path.join(input_directory, filename) for filename in input_files]
+
+    profile_report = None
+    if profile_file:
+        enable_profiling()
+        profile_report = ProfileReport(CONVERTER_VERSION, workers)
+
+    run_class = PipelineRun if pipeline else ConversionRun
+    run = run_class(file_paths, output_directory, template_directory, config_file, workers, group_key,
+                    incremental, merge_file, output_mode=output_mode, bundle_file=bundle_file)
+    if run.bundle_file:
+        os.makedirs(os.path.dirname(os.path.abspath(run.bundle_file)), exist_ok=True)
+        summary['bundle_file'] = run.bundle_file
+
+    progress = ProgressTracker(len(file_paths))
+    try:
+        for result in run.results():
+            if profile_report is not None:
+                profile_report.add(result)
+
+            snapshot = progress.update(result)
+            if on_progress is not None:
+                on_progress(snapshot)
+    except (ValueError, OSError) as e:
+        summary['exit_code'] = EXIT_FAILED
+        summary['error'] = str(e)
+
+    summary['converted'] = run.converted
+    summary['invalid'] = run.invalid
+    summary['up_to_date'] = run.up_to_date
+
+    if summary['exit_code'] == EXIT_OK and summary['invalid']:
+        summary['exit_code'] = EXIT_SKIPPED
+
+    snapshot = progress.finish()
+    summary['documents'] = snapshot.documents
+    summary['bytes_written'] = snapshot.bytes_written
+    # 압축 레벨에 따른 크기/속도를 비교할 수 있도록 문서당 크기와 처리 속도를 함께 기록합니다.
+    summary['bytes_per_document'] = round(snapshot.bytes_written / snapshot.documents) if snapshot.documents else None
+    summary['files_per_second'] = round(snapshot.files_per_second, 3)
+    summary['elapsed_seconds'] = round(time.perf_counter() - start_time, 3)
+
+    if pipeline and run.pipeline_stats is not None:
+        summary['pipeline'] = run.pipeline_stats
+
+    if profile_report is not None:
+        profile_report.write(profile_file)
+        summary['profile_file'] = profile_file
+
+    if verify and not merge_file and summary['exit_code'] != EXIT_FAILED:
+        # 이번에 건너뛴(up-to-date) 파일의 문서도 함께 확인합니다.
+        report = VerificationReport()
+        try:
+            for check in verify_outputs(file_paths, run.bundle_file or output_directory, output_mode, template_directory,
+                                        config_file, workers, group_key):
+                report.add(check)
+        except (ValueError, OSError) as e:
+            summary['exit_code'] = EXIT_FAILED
+            summary['error'] = str(e)
+
+        summary['verification'] = report.to_dict(include_mismatches=False)
+        if verify_report:
+            report.write(verify_report)
+            summary['verification']['report_file'] = verify_report
+        if report.mismatches and summary['exit_code'] in (EXIT_OK, EXIT_SKIPPED):
+            summary['exit_code'] = EXIT_MISMATCH
+
+    return summary
+
+def run_watch(args):
+    """
+    --watch 모드: 변환한 문서마다 결과를 JSON 한 줄로 출력하면서 Ctrl+C를 누를 때까지 실행합니다.
+    """
+    # 변환 중 로그는 표준 에러로 보내고, 결과만 표준 출력으로 내보냅니다.
+    stdout = sys.stdout
+
+    def on_result(result):
+        print(json.dumps({'filename': result.filename, 'status': result.status, 'output_path': result.output_path,
+                          'source': result.source}, ensure_ascii=False), file=stdout, flush=True)
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            watch_folder(args.input_directory, args.output_directory, args.template_directory, args.config_file,
+                         args.workers, args.group_key, args.poll_interval, args.settle_seconds, on_result,
+                         output_mode=args.output_mode)
+    except KeyboardInterrupt:
+        pass
+    except ValueError as e:
+        print(json.dumps({'exit_code': EXIT_FAILED, 'error': str(e)}, ensure_ascii=False))
+        return EXIT_FAILED
+
+    return EXIT_OK
+
+def run_compile(args):
+    """
+    --compile-templates: 템플릿들을 미리 컴파일하고 결과(JSON)를 출력합니다.
+    """
+    summary = {'exit_code': EXIT_OK, 'template_directory': args.template_directory or '.', 'templates': [], 'error': None}
+    try:
+        summary['templates'] = [result._asdict() for result in compile_templates(args.template_directory, args.config_file)]
+    except (ValueError, OSError) as e:
+        summary['exit_code'] = EXIT_FAILED
+        summary['error'] = str(e)
+
+    print(json.dumps(summary, ensure_ascii=False))
+    return summary['exit_code']
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compile_templates:
+        return run_compile(args)
+
+    # 명령줄 변환은 같은 템플릿으로 여러 번 실행하므로 기준 템플릿을 분해한 결과를 템플릿 디렉토리에 저장해 두고 다시 씁니다.
+    enable_template_artifacts()
+    if args.watch:
+        return run_watch(args)
+
+    # 변환 중 출력되는 로그가 요약(JSON)과 섞이지 않도록 표준 에러로 보냅니다.
+    on_progress = None
+    if args.progress:
+        on_progress = lambda snapshot: print(f"Progress: {snapshot.format()}", file=sys.stderr, flush=True)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        summary = run_batch(args.input_directory, args.output_directory, args.template_directory,
+                            args.config_file, args.workers, args.group_key, args.merge_file, args.incremental,
+                            on_progress, args.profile_file, args.pipeline, args.output_mode, args.bundle_file,
+                            args.verify, args.verify_report)
+
+    summary_json = json.dumps(summary, ensure_ascii=False)
+    if args.summary_file:
+        with open(args.summary_file, 'wt', encoding='UTF-8') as summary_file:
+            summary_file.write(summary_json)
+    print(summary_json)
+
+    return summary['exit_code']
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
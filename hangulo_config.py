@@ -0,0 +1,276 @@
+import os
+import re
+import threading
+import configparser
+from collections import namedtuple
+from types import MappingProxyType
+from hwpx_writer import DEFAULT_COMPRESS_LEVEL
+
+# 기본 설정 파일 경로
+CONFIG_FILE = 'config.ini'
+
+# 합계(TAX_TOTAL_AMOUNT)를 계산할 때 더하는 key
+TOTAL_KEY = '계'
+
+# 건수에 맞는 템플릿이 없을 때 행을 확장해 사용할 기준 템플릿
+BASE_TEMPLATE = 'template-tax-1.hwpx'
+
+# 파이프라인 단계 (discover: 최신 여부 확인, read: 입력 파일 읽기, render: 값 채우기, package: zip 만들기, write: 파일 쓰기)
+PIPELINE_STAGES = ('discover', 'read', 'render', 'package', 'write')
+
+# [Pipeline] 섹션에 지정하지 않은 단계의 기본 스레드 수 (파일을 읽고 쓰는 단계는 I/O를 기다리는 동안 다른 스레드가 일합니다.)
+DEFAULT_PIPELINE_WORKERS = {'discover': 1, 'read': 2, 'render': 1, 'package': 1, 'write': 2}
+
+# 파이프라인 단계 사이 대기열의 기본 크기 (동시에 메모리에 두는 문서 수의 상한)
+DEFAULT_QUEUE_SIZE = 8
+
+# 출력 방식
+# files: 출력 디렉토리에 Hwpx 파일, sharded: 파일 이름 해시로 나눈 하위 디렉토리에 Hwpx 파일,
+# zip/tar: 모든 문서와 색인(index.jsonl)을 담은 묶음 파일 하나
+OUTPUT_MODES = ('files', 'sharded', 'zip', 'tar')
+
+# [Types] 섹션에 지정하지 않은 key의 기본 값 형식
+DEFAULT_FIELD_TYPES = {
+    '법정기일': 'date',
+    '세액': 'amount',
+    '가산금': 'amount',
+    '계': 'amount',
+}
+
+# 값 형식별 기본 서식
+DEFAULT_FORMATS = {
+    'text': None,
+    'date': '%Y-%m-%d',
+    'amount': '{:,}',
+}
+
+# 엑셀 열 이름 (A ~ XFD)
+COLUMN_PATTERN = re.compile(r'[A-Z]{1,3}')
+MAX_COLUMN_INDEX = 16384
+
+def _column_index(column):
+    index = 0
+    for char in column:
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index
+
+class FieldSpec(namedtuple('FieldSpec', ['key', 'column', 'type', 'format'])):
+    """
+    config 파일에 설정된 항목 하나입니다.
+
+    Attributes:
+        key (str): 템플릿의 자리표시자 key (예: '세액')
+        column (str): 값을 읽을 엑셀 열 이름 (예: 'AJ')
+        type (str): 값 형식 ('text', 'date', 'amount')
+        format (str): 값 서식 (date는 strftime 서식, amount는 str.format 서식)
+    """
+    __slots__ = ()
+
+    def format_value(self, value):
+        """
+        셀 값을 항목의 형식에 맞는 문자열로 바꾸는 함수입니다.
+
+        Parameters:
+            value: 셀 값
+
+        Returns:
+            tuple[str, int]: (문자열, 금액) - 금액은 type이 'amount'일 때만 정수, 아니면 None
+
+        Raises:
+            ValueError: 값이 형식에 맞지 않는 경우
+        """
+        if self.type == 'date':
+            if hasattr(value, 'strftime'):
+                return value.strftime(self.format), None
+            if value is None:
+                raise ValueError(f"XLSX 파일에서 해당 셀의 값이 날짜가 아닙니다. config.ini 파일에서 '{self.key}' 항목의 셀 이름을 확인하세요.")
+            return str(value), None
+
+        if self.type == 'amount':
+            if str(value).isdigit():
+                # 숫자로 이루어진 문자열이라면 정수형으로 변환
+                amount = int(value)
+                return self.format.format(amount), amount
+            raise ValueError(f"XLSX 파일에서 해당 셀의 값이 숫자가 아닙니다. config.ini 파일에서 '{self.key}' 항목의 셀 이름을 확인하세요.")
+
+        return str(value), None
+
+# [Pipeline] 섹션 설정
+# enabled: 파이프라인으로 변환할지 여부, workers: 단계 이름 -> 스레드 수, queue_size: 단계 사이 대기열 크기
+PipelineSettings = namedtuple('PipelineSettings', ['enabled', 'workers', 'queue_size'])
+
+class FieldMap(namedtuple('FieldMap', ['config_file', 'mtime', 'fields', 'columns', 'workers', 'row_key', 'base_template', 'group_key', 'incremental', 'compress_level', 'pipeline', 'output_mode', 'output_directory', 'verify'])):
+    """
+    config 파일을 한 번 읽고 검증한 결과입니다. (변경할 수 없습니다.)
+
+    Attributes:
+        config_file (str): 설정 파일의 절대 경로
+        mtime (int): 읽을 당시의 파일 수정 시각 (ns)
+        fields (Mapping[str, FieldSpec]): key -> 항목 설정 (config 파일 순서)
+        columns (Mapping[str, str]): key -> 엑셀 열 이름
+        workers (int): [Options] 섹션의 프로세스 수 (설정이 없으면 1, 0이면 CPU 코어 수)
+        row_key (str): 기준 템플릿에서 반복 행을 찾을 때 사용할 key (설정이 없으면 '계')
+        base_template (str): 행을 확장할 기준 템플릿 파일 이름
+        group_key (str): xlsx 파일 하나를 여러 문서로 나눌 key (설정이 없으면 None)
+        incremental (bool): 바뀐 xlsx 파일만 다시 변환할지 여부 (설정이 없으면 False)
+        compress_level (int): 새로 압축하는 XML 멤버의 deflate 압축 레벨 (0: 압축 안 함 ~ 9, 설정이 없으면 6)
+        pipeline (PipelineSettings): [Pipeline] 섹션의 단계별 스레드 수와 대기열 크기
+        output_mode (str): 출력 방식 (OUTPUT_MODES 중 하나, 설정이 없으면 'files')
+        output_directory (str): 출력 디렉토리 (설정이 없으면 '' - 입력 디렉토리, 상대 경로는 입력 디렉토리 기준)
+        verify (bool): 변환이 끝나면 문서들을 입력 값과 대조할지 여부 (설정이 없으면 False)
+    """
+    __slots__ = ()
+
+def parse_field_map(config_file, mtime=None):
+    """
+    config 파일을 읽어 검증한 뒤 FieldMap을 만드는 함수입니다.
+
+    Parameters:
+        config_file (str): 설정 파일 경로
+        mtime (int): 파일 수정 시각 (ns)
+
+    Returns:
+        FieldMap: 검증된 설정
+
+    Raises:
+        ValueError: 설정 파일을 읽을 수 없거나 열 이름이 잘못되었거나 중복된 경우
+    """
+    config = configparser.ConfigParser(interpolation=None)
+    try:
+        with open(config_file, 'r', encoding='utf-8') as file:
+            config.read_file(file)
+    except (OSError, UnicodeDecodeError, configparser.Error) as e:
+        raise ValueError(f"설정 파일 '{config_file}'을 읽을 수 없습니다. 오류: {e}")
+
+    if 'Section1' not in config:
+        raise ValueError(f"설정 파일 '{config_file}'에 [Section1] 섹션이 존재하지 않습니다.")
+
+    types = config['Types'] if 'Types' in config else {}
+    for key in types:
+        if key not in config['Section1']:
+            raise ValueError(f"설정 파일 '{config_file}'의 [Types] 섹션에 [Section1]에 없는 '{key}' 항목이 있습니다.")
+
+    fields = {}
+    used_columns = {}
+    for key, column in config['Section1'].items():
+        column = column.strip().upper()
+        if not COLUMN_PATTERN.fullmatch(column) or _column_index(column) > MAX_COLUMN_INDEX:
+            raise ValueError(f"설정 파일 '{config_file}'에서 '{key}' 항목의 셀 이름 '{column}'이 올바르지 않습니다.")
+        if column in used_columns:
+            raise ValueError(f"설정 파일 '{config_file}'에서 '{key}' 항목과 '{used_columns[column]}' 항목의 셀 이름 '{column}'이 중복됩니다.")
+        used_columns[column] = key
+
+        # [Types] 섹션의 값은 '형식' 또는 '형식:서식' (예: 법정기일=date:%Y.%m.%d)
+        field_type, _, field_format = types.get(key, DEFAULT_FIELD_TYPES.get(key, 'text')).partition(':')
+        field_type = field_type.strip()
+        if field_type not in DEFAULT_FORMATS:
+            raise ValueError(f"설정 파일 '{config_file}'에서 '{key}' 항목의 형식 '{field_type}'을 알 수 없습니다.")
+
+        fields[key] = FieldSpec(key, column, field_type, field_format or DEFAULT_FORMATS[field_type])
+
+    try:
+        workers = config.getint('Options', 'workers', fallback=1)
+    except ValueError:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] workers 값이 숫자가 아닙니다.")
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    row_key = config.get('Options', 'row_key', fallback=TOTAL_KEY).strip()
+    if row_key not in fields:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] row_key '{row_key}'가 [Section1]에 존재하지 않습니다.")
+
+    base_template = config.get('Options', 'base_template', fallback=BASE_TEMPLATE).strip()
+
+    group_key = config.get('Options', 'group_key', fallback='').strip() or None
+    if group_key is not None and group_key not in fields:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] group_key '{group_key}'가 [Section1]에 존재하지 않습니다.")
+
+    try:
+        incremental = config.getboolean('Options', 'incremental', fallback=False)
+    except ValueError:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] incremental 값은 yes 또는 no 이어야 합니다.")
+
+    try:
+        compress_level = config.getint('Options', 'compress_level', fallback=DEFAULT_COMPRESS_LEVEL)
+    except ValueError:
+        compress_level = -1
+    if not 0 <= compress_level <= 9:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] compress_level 값은 0 ~ 9 사이의 숫자여야 합니다.")
+
+    try:
+        pipeline_enabled = config.getboolean('Pipeline', 'enabled', fallback=False)
+    except ValueError:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Pipeline] enabled 값은 yes 또는 no 이어야 합니다.")
+
+    pipeline_workers = {}
+    for name in PIPELINE_STAGES + ('queue_size',):
+        default = DEFAULT_QUEUE_SIZE if name == 'queue_size' else DEFAULT_PIPELINE_WORKERS[name]
+        try:
+            value = config.getint('Pipeline', name, fallback=default)
+        except ValueError:
+            value = 0
+        if value <= 0:
+            raise ValueError(f"설정 파일 '{config_file}'의 [Pipeline] {name} 값은 1 이상의 숫자여야 합니다.")
+        pipeline_workers[name] = value
+    queue_size = pipeline_workers.pop('queue_size')
+
+    output_mode = config.get('Options', 'output_mode', fallback='files').strip().lower()
+    if output_mode not in OUTPUT_MODES:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] output_mode 값은 {', '.join(OUTPUT_MODES)} 중 하나여야 합니다.")
+
+    output_directory = config.get('Options', 'output_directory', fallback='').strip()
+
+    try:
+        verify = config.getboolean('Options', 'verify', fallback=False)
+    except ValueError:
+        raise ValueError(f"설정 파일 '{config_file}'의 [Options] verify 값은 yes 또는 no 이어야 합니다.")
+
+    return FieldMap(
+        config_file=os.path.abspath(config_file),
+        mtime=mtime,
+        fields=MappingProxyType(fields),
+        columns=MappingProxyType({key: spec.column for key, spec in fields.items()}),
+        workers=workers,
+        row_key=row_key,
+        base_template=base_template,
+        group_key=group_key,
+        incremental=incremental,
+        compress_level=compress_level,
+        pipeline=PipelineSettings(pipeline_enabled, MappingProxyType(pipeline_workers), queue_size),
+        output_mode=output_mode,
+        output_directory=output_directory,
+        verify=verify,
+    )
+
+_field_maps = {}
+_field_maps_lock = threading.Lock()
+
+def load_field_map(config_file=CONFIG_FILE):
+    """
+    config 파일의 FieldMap을 리턴하는 함수입니다.
+
+    한 프로세스 안에서는 파일이 수정되었을 때만 다시 읽고, 그 외에는 이미 읽은 결과를 함께 사용합니다.
+
+    Parameters:
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        FieldMap: 검증된 설정
+    """
+    path = os.path.abspath(config_file)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError as e:
+        raise ValueError(f"설정 파일 '{config_file}'을 읽을 수 없습니다. 오류: {e}")
+
+    with _field_maps_lock:
+        field_map = _field_maps.get(path)
+        if field_map is not None and field_map.mtime == mtime:
+            return field_map
+
+    field_map = parse_field_map(path, mtime)
+
+    with _field_maps_lock:
+        _field_maps[path] = field_map
+
+    return field_map
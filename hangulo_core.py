@@ -0,0 +1,930 @@
+import io
+import os
+import re
+import time
+import uuid
+import hashlib
+import functools
+import contextlib
+from collections import namedtuple
+from xml.sax.saxutils import escape
+from concurrent.futures import ProcessPoolExecutor
+from hwpx_template import (TemplateCache, compile_template_file, enable_template_artifacts, template_artifact_path,
+                          template_cache)
+from hwpx_writer import SECTION_NAME, MergedHwpxWriter, compression_policy, write_hwpx
+from hangulo_readers import group_records, is_input_file, iter_records, read_records
+from hangulo_config import CONFIG_FILE, OUTPUT_MODES, TOTAL_KEY, load_field_map
+from hangulo_bundle import BUNDLE_EXTENSIONS, BundleWriter
+from hangulo_manifest import BuildManifest, build_fingerprint
+from hangulo_numerals import number_to_korean_amount
+from hangulo_profiler import enable_profiling, finish_document, is_profiling, iter_documents, stage, start_document
+
+# 변환기 버전 (출력 결과가 달라지는 변경이 있으면 올려서 이전 변환 기록을 무효로 합니다.)
+CONVERTER_VERSION = '2.2'
+
+# 파일 이름에 쓸 수 없는 문자
+INVALID_FILENAME_PATTERN = re.compile(r'[\\/:*?"<>|\s]+')
+
+# config.ini 항목이 아니라 계산해서 채우는 자리표시자
+COMPUTED_KEYS = ('TAX_TOTAL_AMOUNT', 'TAX_TOTAL_AMOUNT_STR')
+
+# 묶음 파일 하나에 쓰는 출력 방식 (OUTPUT_MODES 참고)
+BUNDLE_MODES = ('zip', 'tar')
+
+# 하위 디렉토리 이름의 길이 (16진수 2글자 = 256개 디렉토리)
+SHARD_WIDTH = 2
+
+# 건수별 템플릿 파일 이름
+TEMPLATE_FILE_PATTERN = re.compile(r'template-tax-(\d+)\.hwpx')
+
+# 문서 하나를 변환한 결과
+# status: 'converted' (변환 완료), 'invalid' (값이 있는 행이 없어 변환할 수 없음), 'up-to-date' (이전 변환 결과가 최신)
+# source: 문서를 만든 입력 파일 이름
+# timings: 단계별 측정 시간 (측정이 꺼져 있으면 None)
+# final: 입력 파일의 마지막 결과인지 여부 (입력 파일 하나를 여러 문서로 나누면 마지막 문서만 True)
+# rows: 변환한 문서의 값이 있는 행 수 (사용한 템플릿을 정합니다. 변환하지 않았으면 None)
+ConversionResult = namedtuple('ConversionResult', ['filename', 'status', 'output_path', 'source', 'timings', 'final', 'rows'],
+                              defaults=(None, True, None))
+
+# 템플릿 하나를 컴파일한 결과
+# slots: 자리표시자 수, normalized: 여러 조각으로 나뉘어 있어 합친 자리표시자 수, artifact: 컴파일된 템플릿 파일 경로
+TemplateCompileResult = namedtuple('TemplateCompileResult', ['filename', 'slots', 'normalized', 'artifact'])
+
+def get_config_value(key, config_file=CONFIG_FILE):
+    """
+    주어진 key에 해당하는 값을 config 파일에서 가져오는 함수입니다.
+
+    Parameters:
+        key (str): 찾을 값의 key
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        str: key에 해당하는 값 (찾을 수 없으면 None 반환)
+    """
+    field = load_field_map(config_file).fields.get(key)
+
+    return field.column if field is not None else None
+
+def replace_values_in_xml(xlsx_file, xml_file, config_file=CONFIG_FILE):
+    # Read XML file and split it into literal segments and placeholder slots once
+    template = compile_template_file(xml_file)
+
+    field_map = load_field_map(config_file)
+    records = read_records(xlsx_file, field_map)
+
+    return fill_template(records, template, xml_file, field_map)
+
+def fill_template(records, template, template_name, field_map):
+    """
+    xlsx 파일에서 읽은 행별 값으로 분해된 템플릿을 채워 section0.xml 내용을 리턴하는 함수입니다.
+
+    Parameters:
+        records (list[dict]): read_xlsx_records()로 읽은 행별 값 목록
+        template (CompiledTemplate): 분해된 section0.xml 템플릿
+        template_name (str): 오류 메시지에 표시할 템플릿 이름
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Returns:
+        str: 값이 채워진 section0.xml 내용
+    """
+    matches = template.keys
+
+    if len(matches) == 0:
+        raise ValueError(f"템플릿 Hwp 파일 '{template_name}'에서 '%변수%'가 존재하지 않습니다.")
+    check_template_keys(template, template_name, field_map)
+    variables = []
+    values = {}
+
+    total_amount = 0
+    for key in matches:
+        field = field_map.fields.get(key)
+        variables.append(field)
+        if field is not None:
+            count = template.count(key)
+
+            cell_values = []
+
+            for i in range(count):
+                cell_value = records[i].get(key) if i < len(records) else None
+                cell_value_str, amount = field.format_value(cell_value)
+
+                if (key == TOTAL_KEY and amount is not None):
+                    total_amount += amount
+
+                # 값은 <hp:t> 텍스트로 들어가므로 주소 등의 '&', '<', '>'가 XML을 깨뜨리지 않도록 바꿉니다.
+                cell_values.append(escape(cell_value_str))
+
+            values[key] = cell_values
+
+    # Calculate the sum of amounts from L2 to L(num_tax_numbers + 1)
+    tax_total_amount = "{:,}원".format(total_amount)
+    korean_total_amount_str = number_to_korean_amount(total_amount)
+    tax_total_amount_str = tax_total_amount + '(' + korean_total_amount_str  + ')'
+
+    values.setdefault("TAX_TOTAL_AMOUNT_STR", tax_total_amount_str)
+    values.setdefault("TAX_TOTAL_AMOUNT", tax_total_amount)
+
+    # 모든 자리표시자를 한 번의 join으로 채웁니다.
+    return template.render(values)
+
+def check_template_keys(template, template_name, field_map):
+    """
+    템플릿의 자리표시자가 모두 config.ini의 [Section1] 항목이거나 계산해서 채우는 값인지 확인하는 함수입니다.
+
+    Parameters:
+        template (CompiledTemplate): 분해된 section0.xml 템플릿
+        template_name (str): 오류 메시지에 표시할 템플릿 이름
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Raises:
+        ValueError: 설정에 없는 자리표시자가 있는 경우 (채워지지 않고 '%key%'로 남기 때문입니다.)
+    """
+    unknown_keys = [key for key in template.keys if key not in field_map.fields and key not in COMPUTED_KEYS]
+    if unknown_keys:
+        placeholders = ', '.join(f'%{key}%' for key in unknown_keys)
+        raise ValueError(f"템플릿 Hwp 파일 '{template_name}'의 자리표시자 {placeholders}가 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+
+def compile_templates(template_directory='', config_file=CONFIG_FILE):
+    """
+    template-tax-N.hwpx 파일들과 기준 템플릿을 미리 컴파일해 저장하는 함수입니다.
+
+    나뉜 자리표시자를 합치고, 모든 자리표시자를 config.ini와 대조한 뒤, 분해한 결과를
+    '<템플릿 디렉토리>/.hangulo-templates'에 저장합니다. 이후 실행과 작업 프로세스는 템플릿을 다시 분해하지 않습니다.
+
+    Parameters:
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        list[TemplateCompileResult]: 템플릿별 컴파일 결과 (파일 이름 순)
+
+    Raises:
+        ValueError: 템플릿이 없거나 설정에 없는 자리표시자가 있는 경우
+    """
+    field_map = load_field_map(config_file)
+
+    filenames = {filename for filename in os.listdir(template_directory or '.') if TEMPLATE_FILE_PATTERN.fullmatch(filename)}
+    if os.path.exists(os.path.join(template_directory, field_map.base_template)):
+        filenames.add(field_map.base_template)
+    if not filenames:
+        raise ValueError(f"템플릿 디렉토리 '{template_directory or '.'}'에 template-tax-N.hwpx 파일이 존재하지 않습니다.")
+
+    # 컴파일된 템플릿 파일을 쓰는 것이 목적이므로 전역 캐시 설정과 관계없이 저장하는 캐시를 사용합니다.
+    cache = TemplateCache(persist=True)
+    results = []
+    for filename in sorted(filenames):
+        hwpx_file = os.path.join(template_directory, filename)
+        template_pack = cache.get(hwpx_file)
+        check_template_keys(template_pack.template, hwpx_file, field_map)
+        artifact = template_artifact_path(hwpx_file)
+        results.append(TemplateCompileResult(filename, len(template_pack.template.slots), template_pack.normalized,
+                                             artifact if os.path.exists(artifact) else None))
+    return results
+
+def initialize_worker(profiling, template_artifacts):
+    """
+    프로세스 풀의 작업 프로세스에서 부모 프로세스의 측정, 컴파일된 템플릿 파일 설정을 그대로 켜는 함수입니다.
+    """
+    if profiling:
+        enable_profiling()
+    enable_template_artifacts(template_artifacts)
+
+def worker_initializer():
+    """
+    현재 프로세스의 설정을 작업 프로세스에 전달하는 프로세스 풀 initializer를 리턴하는 함수입니다.
+
+    Returns:
+        functools.partial: ProcessPoolExecutor(initializer=...)에 넘길 함수 (spawn 방식에서도 pickle할 수 있습니다.)
+    """
+    return functools.partial(initialize_worker, is_profiling(), template_cache.persist)
+
+def get_worker_count(config_file=CONFIG_FILE):
+    """
+    config 파일의 [Options] 섹션에서 변환에 사용할 프로세스 수를 가져오는 함수입니다.
+
+    Parameters:
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        int: 프로세스 수 (설정이 없으면 1, 0이면 CPU 코어 수)
+    """
+    return load_field_map(config_file).workers
+
+def template_file(row_count, template_directory, field_map):
+    """
+    값이 있는 행 수에 사용할 템플릿 파일 경로를 리턴하는 함수입니다.
+
+    template-tax-N.hwpx가 있으면 그 파일, 없으면 반복 행을 복제할 기준 템플릿 파일입니다.
+
+    Parameters:
+        row_count (int): 값이 있는 행 수
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Returns:
+        str: 템플릿 파일 경로
+    """
+    hwpx_file = os.path.join(template_directory, f'template-tax-{row_count}.hwpx')
+    if os.path.exists(hwpx_file):
+        return hwpx_file
+    return os.path.join(template_directory, field_map.base_template)
+
+def select_template(row_count, template_directory, field_map, cache=None):
+    """
+    값이 있는 행 수에 맞는 템플릿을 캐시에서 가져오는 함수입니다.
+
+    template-tax-N.hwpx가 있으면 그 템플릿을, 없으면 기준 템플릿의 반복 행을 건수만큼 복제한 템플릿을 사용합니다.
+
+    Parameters:
+        row_count (int): 값이 있는 행 수
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+        cache (TemplateCache): 사용할 템플릿 캐시 (None이면 template_cache)
+
+    Returns:
+        tuple[str, TemplatePack]: (템플릿 파일 경로, 템플릿)
+    """
+    cache = cache or template_cache
+    hwpx_file = template_file(row_count, template_directory, field_map)
+    if hwpx_file == os.path.join(template_directory, f'template-tax-{row_count}.hwpx'):
+        return hwpx_file, cache.get(hwpx_file)
+
+    return hwpx_file, cache.get_expanded(hwpx_file, row_count, field_map.row_key)
+
+def render_document(records, template_directory, field_map):
+    """
+    행별 값으로 템플릿을 채워 section0.xml 내용을 만드는 함수입니다.
+
+    Parameters:
+        records (list[dict]): 한 문서에 들어갈 행별 값 목록
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Returns:
+        tuple[TemplatePack, str]: (사용한 템플릿, 값이 채워진 section0.xml 내용)
+    """
+    # 템플릿 Hwpx 파일은 캐시에서 가져옵니다. (처음 한 번만 읽고 분해합니다.)
+    with stage('template'):
+        hwpx_file, template_pack = select_template(len(records), template_directory, field_map)
+
+    with stage('render'):
+        xml_output_result = fill_template(records, template_pack.template, hwpx_file, field_map)
+
+    return template_pack, xml_output_result
+
+def replace_output(temp_path, gen_hwpx_file_path):
+    """
+    임시 파일을 최종 Hwpx 파일 이름으로 바꾸는 함수입니다. (기존 파일이 있으면 한 번에 바꿉니다.)
+
+    Raises:
+        ValueError: 기존 파일이 열려 있어 바꿀 수 없는 경우
+    """
+    try:
+        os.replace(temp_path, gen_hwpx_file_path)
+    except OSError as e:
+        raise ValueError(f"기존에 생성된 Hwp 파일 '{gen_hwpx_file_path}'를 바꿀 수 없습니다. 열린 '{gen_hwpx_file_path}' 를 닫은 뒤 다시 시도해 주세요. 오류: {e}")
+
+@contextlib.contextmanager
+def atomic_output(gen_hwpx_file_path):
+    """
+    같은 디렉토리의 임시 파일에 쓰고, with 블록이 끝나면 최종 이름으로 바꾸는 context manager입니다.
+
+    쓰는 도중에는 최종 경로에 반쯤 쓰인 파일이 보이지 않으며, 오류가 나면 임시 파일을 지웁니다.
+    임시 파일 이름은 실행마다 다르므로 여러 변환이 같은 디렉토리에 동시에 써도 섞이지 않습니다.
+
+    Parameters:
+        gen_hwpx_file_path (str): 저장할 Hwpx 파일 경로
+
+    Yields:
+        file: 쓰기용 임시 파일
+    """
+    directory, name = os.path.split(os.path.abspath(gen_hwpx_file_path))
+    temp_path = os.path.join(directory, f'.{name}.{uuid.uuid4().hex}.tmp')
+    try:
+        with open(temp_path, 'xb') as output_file:
+            yield output_file
+        with stage('rename'):
+            replace_output(temp_path, gen_hwpx_file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def write_document_to(records, output_file, template_directory, field_map):
+    """
+    행별 값으로 템플릿을 채운 Hwpx 파일 내용을 열려 있는 파일 객체에 쓰는 함수입니다. (파일을 만들지 않습니다.)
+
+    Parameters:
+        records (list[dict]): 한 문서에 들어갈 행별 값 목록
+        output_file (file): 쓰기용 바이너리 파일 객체 (예: io.BytesIO)
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Raises:
+        ValueError: 값을 채울 수 없는 경우
+    """
+    template_pack, xml_output_result = render_document(records, template_directory, field_map)
+    with stage('package'):
+        write_hwpx(template_pack.members, output_file, {SECTION_NAME: xml_output_result},
+                   compression_policy(field_map.compress_level))
+
+def write_document(records, gen_hwpx_file_path, template_directory, field_map):
+    """
+    행별 값으로 템플릿을 채워 Hwpx 파일 하나를 쓰는 함수입니다.
+
+    Parameters:
+        records (list[dict]): 한 문서에 들어갈 행별 값 목록
+        gen_hwpx_file_path (str): 저장할 Hwpx 파일 경로
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Raises:
+        ValueError: 값을 채울 수 없거나 기존 Hwpx 파일을 바꿀 수 없는 경우
+    """
+    if is_profiling():
+        # 측정할 때는 zip 만들기와 파일 쓰기 시간을 나누기 위해 메모리에서 먼저 만듭니다.
+        buffer = io.BytesIO()
+        write_document_to(records, buffer, template_directory, field_map)
+        with atomic_output(gen_hwpx_file_path) as output_file:
+            with stage('write'):
+                output_file.write(buffer.getbuffer())
+        return
+
+    # 템플릿 zip 항목들을 그대로 복사하면서 section0.xml만 바꿔 Hwpx 파일을 바로 씁니다.
+    with atomic_output(gen_hwpx_file_path) as output_file:
+        write_document_to(records, output_file, template_directory, field_map)
+
+def output_path(output_directory, filename, sharded=False):
+    """
+    Hwpx 파일을 저장할 경로를 리턴하는 함수입니다.
+
+    sharded이면 파일 이름의 SHA-1 해시 앞 SHARD_WIDTH 글자를 하위 디렉토리로 사용합니다.
+    (예: 'case1.hwpx' -> '<출력 디렉토리>/3d/case1.hwpx') 같은 이름은 항상 같은 하위 디렉토리에 저장되므로
+    색인 없이도 위치를 찾을 수 있고, 한 디렉토리의 파일 수가 256분의 1로 줄어듭니다.
+
+    Parameters:
+        output_directory (str): 출력 디렉토리
+        filename (str): Hwpx 파일 이름
+        sharded (bool): 하위 디렉토리에 나누어 저장할지 여부
+
+    Returns:
+        str: Hwpx 파일 경로 (하위 디렉토리는 만들어 둡니다.)
+    """
+    if not sharded:
+        return os.path.join(output_directory, filename)
+
+    directory = os.path.join(output_directory, shard_name(filename))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+def shard_name(filename):
+    """
+    Hwpx 파일 이름이 들어갈 하위 디렉토리 이름을 리턴하는 함수입니다. (파일 이름의 SHA-1 해시 앞 SHARD_WIDTH 글자)
+    """
+    return hashlib.sha1(filename.encode('utf-8')).hexdigest()[:SHARD_WIDTH]
+
+def resolve_output_directory(input_directory, output_directory=''):
+    """
+    입력 디렉토리와 설정된 출력 디렉토리로 실제 출력 디렉토리를 리턴하는 함수입니다.
+
+    Parameters:
+        input_directory (str): 입력 디렉토리
+        output_directory (str): 설정된 출력 디렉토리 (''이면 입력 디렉토리, 상대 경로는 입력 디렉토리 기준)
+
+    Returns:
+        str: 출력 디렉토리 경로
+    """
+    return os.path.join(input_directory, os.path.expanduser(output_directory)) if output_directory else input_directory
+
+def convert_file(file_path, output_directory, template_directory='', config_file=CONFIG_FILE, sharded=False):
+    """
+    입력 파일(xlsx, CSV, JSON-lines) 하나를 Hwpx 파일로 변환하는 함수입니다.
+
+    Parameters:
+        file_path (str): 변환할 입력 파일 경로
+        output_directory (str): Hwpx 파일을 저장할 디렉토리
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        sharded (bool): 출력 디렉토리의 하위 디렉토리에 나누어 저장할지 여부 (output_path() 참고)
+
+    Returns:
+        ConversionResult: 변환 결과
+
+    Raises:
+        ValueError: 값을 채울 수 없거나 기존 Hwpx 파일을 바꿀 수 없는 경우
+    """
+    filename = os.path.basename(file_path)
+
+    print("### ", file_path)
+
+    start_document()
+
+    # 입력 파일(xlsx, CSV, JSON-lines)을 한 번만 읽어 설정된 항목의 값만 가져옵니다.
+    field_map = load_field_map(config_file)
+    with stage('load'):
+        records = read_records(file_path, field_map)
+
+    if (len(records) == 0):
+        return ConversionResult(filename, 'invalid', None, filename, finish_document())
+
+    gen_hwpx_file_name = os.path.splitext(filename)[0]
+    gen_hwpx_file = f'{gen_hwpx_file_name}.hwpx'
+    gen_hwpx_file_path = output_path(output_directory, gen_hwpx_file, sharded)
+
+    write_document(records, gen_hwpx_file_path, template_directory, field_map)
+
+    return ConversionResult(filename, 'converted', gen_hwpx_file_path, filename, finish_document(), rows=len(records))
+
+def group_output_name(gen_hwpx_file_name, group_value, used_names):
+    """
+    group_key 값으로 나눈 문서의 Hwpx 파일 이름(확장자 제외)을 만드는 함수입니다.
+
+    Parameters:
+        gen_hwpx_file_name (str): 입력 파일 이름 (확장자 제외)
+        group_value: 문서의 group_key 값
+        used_names (set[str]): 같은 입력 파일에서 이미 사용한 이름 (만든 이름을 추가합니다.)
+
+    Returns:
+        str: '<입력 파일 이름>_<group_key 값>' (같은 값이 다시 나오면 '_2', '_3', ...을 붙입니다.)
+    """
+    name = f'{gen_hwpx_file_name}_{INVALID_FILENAME_PATTERN.sub("_", str(group_value))}'
+    # 같은 값이 떨어져서 다시 나오면 번호를 붙여 덮어쓰지 않도록 합니다.
+    if name in used_names:
+        suffix = 2
+        while f'{name}_{suffix}' in used_names:
+            suffix += 1
+        name = f'{name}_{suffix}'
+    used_names.add(name)
+    return name
+
+def mark_final(results, source):
+    """
+    입력 파일 하나의 결과들 중 마지막 결과만 final로 표시해 돌려주는 제너레이터입니다.
+
+    마지막 결과인지는 다음 결과가 없어야 알 수 있으므로 결과를 하나씩 늦게 돌려줍니다.
+    결과가 하나도 없으면(값이 있는 행이 없으면) 입력 파일의 'invalid' 결과를 돌려줍니다.
+
+    Parameters:
+        results (iterable[ConversionResult]): 입력 파일 하나의 문서별 변환 결과
+        source (str): 입력 파일 이름
+
+    Yields:
+        ConversionResult: final을 표시한 결과
+    """
+    previous = None
+    for result in results:
+        if previous is not None:
+            yield previous._replace(final=False)
+        previous = result
+
+    if previous is None:
+        yield ConversionResult(source, 'invalid', None, source)
+    else:
+        yield previous._replace(final=True)
+
+def convert_file_groups(file_path, output_directory, group_key, template_directory='', config_file=CONFIG_FILE, sharded=False):
+    """
+    여러 건이 들어 있는 입력 파일 하나를 group_key 값별로 나누어 Hwpx 파일들로 변환하는 제너레이터입니다.
+
+    파일을 스트리밍으로 읽으면서 group_key 값이 같은 연속된 행들을 한 문서로 묶어 바로 씁니다.
+    각 문서의 머리 항목(문서번호, 성명 등)은 묶음의 첫 번째 행에서 가져옵니다.
+    Hwpx 파일 이름은 '<입력 파일 이름>_<group_key 값>.hwpx' 입니다.
+
+    Parameters:
+        file_path (str): 변환할 입력 파일 경로
+        output_directory (str): Hwpx 파일을 저장할 디렉토리
+        group_key (str): 문서를 나눌 key (예: '문서번호')
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        sharded (bool): 출력 디렉토리의 하위 디렉토리에 나누어 저장할지 여부
+
+    Yields:
+        ConversionResult: 문서별 변환 결과 (시트 순서, 마지막 문서만 final - 값이 있는 행이 없으면 'invalid' 하나)
+    """
+    filename = os.path.basename(file_path)
+
+    print("### ", file_path)
+
+    field_map = load_field_map(config_file)
+    if group_key not in field_map.fields:
+        raise ValueError(f"문서를 나눌 '{group_key}' 항목이 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+
+    def convert_groups():
+        gen_hwpx_file_name = os.path.splitext(filename)[0]
+        used_names = set()
+
+        records = iter_records(file_path, field_map)
+        for group_value, group in iter_documents(group_records(records, group_key)):
+            name = group_output_name(gen_hwpx_file_name, group_value, used_names)
+            gen_hwpx_file_path = output_path(output_directory, f'{name}.hwpx', sharded)
+            write_document(group, gen_hwpx_file_path, template_directory, field_map)
+
+            yield ConversionResult(f'{name}.hwpx', 'converted', gen_hwpx_file_path, filename, finish_document(), rows=len(group))
+
+    yield from mark_final(convert_groups(), filename)
+
+def _convert_file_groups_list(file_path, output_directory, group_key, template_directory, config_file, sharded):
+    return list(convert_file_groups(file_path, output_directory, group_key, template_directory, config_file, sharded))
+
+def convert_files(file_paths, output_directory, template_directory='', workers=1, config_file=CONFIG_FILE, group_key=None, executor=None, sharded=False):
+    """
+    여러 xlsx 파일을 변환하고 결과를 입력 순서대로 돌려주는 제너레이터입니다.
+
+    workers가 2 이상이면 여러 프로세스에 파일을 나누어 변환합니다.
+    각 프로세스는 자신의 템플릿 캐시를 유지하며, 결과 파일은 순차 변환과 바이트 단위로 같습니다.
+    group_key가 있으면 xlsx 파일 하나를 group_key 값별로 여러 Hwpx 파일로 나눕니다.
+
+    Parameters:
+        file_paths (list[str]): 변환할 입력 파일 경로 목록
+        output_directory (str): Hwpx 파일을 저장할 디렉토리
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        workers (int): 사용할 프로세스 수
+        config_file (str): 설정 파일 경로
+        group_key (str): 문서를 나눌 key (None이면 xlsx 파일 하나가 문서 하나)
+        executor (Executor): 계속 띄워 둔 프로세스 풀 (있으면 workers 대신 이 풀을 사용하고 닫지 않습니다.)
+        sharded (bool): 출력 디렉토리의 하위 디렉토리에 나누어 저장할지 여부
+
+    Yields:
+        ConversionResult: 문서별 변환 결과 (입력 순서)
+    """
+    if executor is not None:
+        yield from _map_files(executor, file_paths, output_directory, template_directory, config_file, group_key, sharded)
+        return
+
+    if workers <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            if group_key:
+                yield from convert_file_groups(file_path, output_directory, group_key, template_directory, config_file, sharded)
+            else:
+                yield convert_file(file_path, output_directory, template_directory, config_file, sharded)
+        return
+
+    count = len(file_paths)
+    # 측정 중이면 작업 프로세스에서도 측정을 켭니다.
+    with ProcessPoolExecutor(max_workers=min(workers, count), initializer=worker_initializer()) as executor:
+        yield from _map_files(executor, file_paths, output_directory, template_directory, config_file, group_key, sharded)
+
+def _map_files(executor, file_paths, output_directory, template_directory, config_file, group_key, sharded=False):
+    count = len(file_paths)
+    # map()은 제출 순서대로 결과를 돌려주므로 진행률과 메시지 순서가 순차 변환과 같습니다.
+    if group_key:
+        for results in executor.map(_convert_file_groups_list, file_paths, [output_directory] * count,
+                                    [group_key] * count, [template_directory] * count, [config_file] * count,
+                                    [sharded] * count):
+            yield from results
+    else:
+        yield from executor.map(convert_file, file_paths, [output_directory] * count,
+                                [template_directory] * count, [config_file] * count, [sharded] * count)
+
+def convert_batch(file_paths, output_directory, template_directory='', workers=1, config_file=CONFIG_FILE, group_key=None, incremental=False, executor=None, sharded=False):
+    """
+    convert_files()와 같지만, incremental이면 출력 디렉토리의 변환 기록을 보고 바뀐 파일만 다시 변환하는 제너레이터입니다.
+
+    최신인 파일은 status가 'up-to-date'인 결과로 먼저 돌려주고, 나머지를 변환하면서
+    입력 파일 하나가 끝날 때마다 변환 기록을 남깁니다.
+
+    Parameters:
+        file_paths (list[str]): 변환할 입력 파일 경로 목록
+        output_directory (str): Hwpx 파일을 저장할 디렉토리
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        workers (int): 사용할 프로세스 수
+        config_file (str): 설정 파일 경로
+        group_key (str): 문서를 나눌 key (None이면 xlsx 파일 하나가 문서 하나)
+        incremental (bool): 바뀐 파일만 다시 변환할지 여부
+        executor (Executor): 계속 띄워 둔 프로세스 풀 (None이면 workers만큼 새로 띄웁니다.)
+        sharded (bool): 출력 디렉토리의 하위 디렉토리에 나누어 저장할지 여부
+
+    Yields:
+        ConversionResult: 문서별 변환 결과
+    """
+    if not incremental:
+        yield from convert_files(file_paths, output_directory, template_directory, workers, config_file, group_key, executor, sharded)
+        return
+
+    field_map = load_field_map(config_file)
+    manifest = BuildManifest(output_directory, build_fingerprint(CONVERTER_VERSION, config_file),
+                             lambda row_count: template_file(row_count, template_directory, field_map))
+    try:
+        stale_paths = []
+        for file_path in file_paths:
+            if manifest.is_up_to_date(file_path):
+                filename = os.path.basename(file_path)
+                yield ConversionResult(filename, 'up-to-date', None, filename)
+            else:
+                stale_paths.append(file_path)
+
+        source_paths = {os.path.basename(file_path): file_path for file_path in stale_paths}
+        outputs = []
+        row_counts = []
+        for result in convert_files(stale_paths, output_directory, template_directory, workers, config_file, group_key, executor, sharded):
+            if result.output_path:
+                outputs.append(result.output_path)
+            if result.rows is not None:
+                row_counts.append(result.rows)
+            # 입력 파일의 마지막(final) 결과가 나오면 그 파일의 모든 문서를 쓴 것입니다.
+            if result.final:
+                manifest.record(source_paths[result.source], outputs, row_counts)
+                outputs = []
+                row_counts = []
+            yield result
+    finally:
+        manifest.close()
+
+def render_file_documents(file_path, template_directory='', config_file=CONFIG_FILE, group_key=None):
+    """
+    입력 파일 하나를 파일로 쓰지 않고 메모리에서 Hwpx 문서로 변환하는 함수입니다. (묶음 출력에서 사용합니다.)
+
+    문서 이름은 convert_file(), convert_file_groups()와 같습니다.
+
+    Parameters:
+        file_path (str): 변환할 입력 파일 경로
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        group_key (str): 문서를 나눌 key (None이면 입력 파일 하나가 문서 하나)
+
+    Returns:
+        list[tuple[ConversionResult, str, bytes]]: 문서별 (변환 결과, Hwpx 파일 이름, Hwpx 파일 내용)
+            - 변환하지 못한 문서의 이름과 내용은 None, 마지막 문서의 결과만 final
+    """
+    filename = os.path.basename(file_path)
+    gen_hwpx_file_name = os.path.splitext(filename)[0]
+
+    print("### ", file_path)
+
+    field_map = load_field_map(config_file)
+    if group_key is None:
+        start_document()
+        with stage('load'):
+            records = read_records(file_path, field_map)
+        if not records:
+            return [(ConversionResult(filename, 'invalid', None, filename, finish_document()), None, None)]
+        documents = [(f'{gen_hwpx_file_name}.hwpx', records)]
+    else:
+        if group_key not in field_map.fields:
+            raise ValueError(f"문서를 나눌 '{group_key}' 항목이 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+        used_names = set()
+        documents = ((f'{group_output_name(gen_hwpx_file_name, group_value, used_names)}.hwpx', group)
+                     for group_value, group in iter_documents(group_records(iter_records(file_path, field_map), group_key)))
+
+    rendered = []
+    for name, records in documents:
+        buffer = io.BytesIO()
+        write_document_to(records, buffer, template_directory, field_map)
+        result = ConversionResult(name if group_key else filename, 'converted', None, filename, finish_document(), final=False,
+                                  rows=len(records))
+        rendered.append((result, name, buffer.getvalue()))
+
+    if not rendered:
+        return [(ConversionResult(filename, 'invalid', None, filename), None, None)]
+    result, name, data = rendered[-1]
+    rendered[-1] = (result._replace(final=True), name, data)
+    return rendered
+
+def default_bundle_path(output_directory, bundle_format):
+    """
+    묶음 파일 경로를 지정하지 않았을 때 사용할 경로를 리턴하는 함수입니다.
+
+    Returns:
+        str: '<출력 디렉토리>/hangulo-<날짜>-<시각>.zip' (또는 .tar)
+    """
+    return os.path.join(output_directory, f"hangulo-{time.strftime('%Y%m%d-%H%M%S')}{BUNDLE_EXTENSIONS[bundle_format]}")
+
+def convert_files_bundled(file_paths, bundle_file, bundle_format, template_directory='', workers=1,
+                          config_file=CONFIG_FILE, group_key=None, executor=None):
+    """
+    여러 입력 파일을 변환해 문서들을 zip 또는 tar 묶음 파일 하나에 차례로 쓰는 제너레이터입니다.
+
+    문서는 작업 프로세스에서 메모리에 만들고, 이 프로세스에서 입력 순서대로 묶음에 씁니다.
+    묶음 안의 Hwpx 파일은 파일로 저장한 경우와 바이트 단위로 같으며, 마지막에 색인(index.jsonl)을 넣습니다.
+    묶음은 임시 파일에 쓰고 모든 문서를 넣은 뒤 최종 이름으로 바꿉니다.
+
+    Parameters:
+        file_paths (list[str]): 변환할 입력 파일 경로 목록
+        bundle_file (str): 저장할 묶음 파일 경로
+        bundle_format (str): 묶음 형식 ('zip', 'tar')
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        workers (int): 사용할 프로세스 수
+        config_file (str): 설정 파일 경로
+        group_key (str): 문서를 나눌 key (None이면 입력 파일 하나가 문서 하나)
+        executor (Executor): 계속 띄워 둔 프로세스 풀 (있으면 workers 대신 이 풀을 사용하고 닫지 않습니다.)
+
+    Yields:
+        ConversionResult: 문서별 변환 결과 (입력 순서, output_path는 묶음 파일 경로)
+    """
+    count = len(file_paths)
+    with atomic_output(bundle_file) as output_file:
+        bundle = BundleWriter(output_file, bundle_format)
+
+        with contextlib.ExitStack() as stack:
+            if executor is None and workers > 1 and count > 1:
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=min(workers, count),
+                                                                   initializer=worker_initializer()))
+
+            arguments = (file_paths, [template_directory] * count, [config_file] * count, [group_key] * count)
+            if executor is not None:
+                rendered_files = executor.map(render_file_documents, *arguments)
+            else:
+                rendered_files = map(render_file_documents, *arguments)
+
+            for rendered in rendered_files:
+                for result, name, data in rendered:
+                    if data is not None:
+                        bundle.add(name, data, result.source)
+                        result = result._replace(output_path=bundle_file)
+                    yield result
+
+        bundle.close()
+
+def convert_files_merged(file_paths, gen_hwpx_file_path, template_directory='', config_file=CONFIG_FILE, group_key=None):
+    """
+    여러 xlsx 파일의 문서들을 각각 하나의 구역으로 담아 Hwpx 파일 하나로 합치는 제너레이터입니다.
+
+    문서는 만들어지는 대로 바로 기록하고, 공통 header.xml과 content.hpf는 마지막에 한 번만 기록합니다.
+    한 번만 열어서 전체를 인쇄하거나 보관할 수 있습니다.
+    header.xml은 하나만 기록하므로 사용하는 template-tax-N.hwpx들의 header.xml이 모두 같아야 합니다. (MergedHwpxWriter 참고)
+
+    Parameters:
+        file_paths (list[str]): 변환할 입력 파일 경로 목록
+        gen_hwpx_file_path (str): 저장할 Hwpx 파일 경로
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        group_key (str): xlsx 파일 하나를 여러 문서로 나눌 key (None이면 xlsx 파일 하나가 문서 하나)
+
+    Yields:
+        ConversionResult: 문서별 변환 결과 (입력 순서)
+
+    Raises:
+        ValueError: header.xml이 다른 템플릿의 문서를 합치려는 경우, 합친 파일이 zip 한도(4GB, 65535개 항목)를 넘는 경우
+    """
+    field_map = load_field_map(config_file)
+    if group_key is not None and group_key not in field_map.fields:
+        raise ValueError(f"문서를 나눌 '{group_key}' 항목이 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+
+    def merge_documents(writer, documents, filename):
+        # 입력 파일 하나의 문서들을 구역으로 추가하면서 결과를 돌려줍니다.
+        for name, group in iter_documents(documents):
+            with stage('load'):
+                group = list(group)
+            if not group:
+                yield ConversionResult(name, 'invalid', None, filename, finish_document())
+                continue
+
+            template_pack, xml_output_result = render_document(group, template_directory, field_map)
+            with stage('package'):
+                writer.add_section(template_pack.members, xml_output_result)
+
+            yield ConversionResult(name, 'converted', gen_hwpx_file_path, filename, finish_document(), rows=len(group))
+
+    with atomic_output(gen_hwpx_file_path) as output_file:
+        writer = MergedHwpxWriter(output_file, compression_policy(field_map.compress_level))
+
+        for file_path in file_paths:
+            filename = os.path.basename(file_path)
+
+            print("### ", file_path)
+
+            records = iter_records(file_path, field_map)
+            if group_key:
+                documents = ((f'{filename} [{group_value}]', group) for group_value, group in group_records(records, group_key))
+            else:
+                documents = [(filename, records)]
+
+            yield from mark_final(merge_documents(writer, documents, filename), filename)
+
+        writer.close()
+
+class ConversionRun:
+    """
+    변환 한 번에 필요한 입력, 옵션, 결과를 담는 클래스입니다.
+
+    실행할 때마다 새로 만들어 사용하므로, 한 프로세스나 한 서버에서 여러 변환을 동시에 실행해도
+    결과 목록이 섞이지 않습니다. 중간 파일은 만들지 않고, 출력 파일은 임시 파일에 쓴 뒤 이름을 바꿉니다.
+
+    Attributes:
+        converted (list[str]): 변환한 문서 이름
+        invalid (list[str]): 값이 있는 행이 없어 변환하지 못한 문서 이름
+        up_to_date (list[str]): 이전 변환 결과가 최신이라 건너뛴 xlsx 파일 이름
+        bundle_file (str): 묶음 출력(zip, tar)이면 묶음 파일 경로, 아니면 None
+    """
+
+    def __init__(self, file_paths, output_directory, template_directory='', config_file=CONFIG_FILE, workers=1,
+                 group_key=None, incremental=False, merge_file=None, executor=None, output_mode='files', bundle_file=None):
+        """
+        Parameters:
+            file_paths (list[str]): 변환할 입력 파일 경로 목록
+            output_directory (str): Hwpx 파일을 저장할 디렉토리
+            template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+            config_file (str): 설정 파일 경로
+            workers (int): 사용할 프로세스 수
+            group_key (str): 문서를 나눌 key (None이면 xlsx 파일 하나가 문서 하나)
+            incremental (bool): 바뀐 파일만 다시 변환할지 여부 (합치거나 묶는 경우에는 사용하지 않음)
+            merge_file (str): 모든 문서를 합친 Hwpx 파일 경로 (None이면 문서마다 Hwpx 파일 하나)
+            executor (Executor): 계속 띄워 둔 프로세스 풀 (None이면 workers만큼 새로 띄웁니다.)
+            output_mode (str): 출력 방식 (OUTPUT_MODES 참고, 합치는 경우에는 사용하지 않음)
+            bundle_file (str): 묶음 파일 경로 (묶음 출력에서 None이면 출력 디렉토리에 날짜와 시각으로 이름을 만듭니다.)
+
+        Raises:
+            ValueError: 지원하지 않는 출력 방식인 경우
+        """
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"지원하지 않는 출력 방식 '{output_mode}' 입니다. ({', '.join(OUTPUT_MODES)} 중 하나)")
+
+        self.file_paths = list(file_paths)
+        self.output_directory = output_directory
+        self.template_directory = template_directory
+        self.config_file = config_file
+        self.workers = workers
+        self.group_key = group_key
+        self.incremental = incremental
+        self.merge_file = merge_file
+        self.executor = executor
+        self.output_mode = output_mode
+        self.bundle_file = None
+        if output_mode in BUNDLE_MODES and not merge_file:
+            self.bundle_file = bundle_file or default_bundle_path(output_directory, output_mode)
+
+        self.converted = []
+        self.invalid = []
+        self.up_to_date = []
+
+    def results(self):
+        """
+        변환을 실행하면서 문서별 결과를 돌려주는 제너레이터입니다. 결과는 이 객체의 목록에도 기록합니다.
+
+        Yields:
+            ConversionResult: 문서별 변환 결과
+
+        Raises:
+            ValueError: 확장자만 다른 입력 파일들이 같은 Hwpx 파일 이름으로 변환되는 경우 (아무것도 변환하기 전에 확인합니다.)
+        """
+        if not self.merge_file:
+            check_output_names(self.file_paths)
+
+        for result in self._iter_results():
+            if result.status == 'invalid':
+                self.invalid.append(result.filename)
+            elif result.status == 'up-to-date':
+                self.up_to_date.append(result.filename)
+            else:
+                self.converted.append(result.filename)
+            yield result
+
+    def _iter_results(self):
+        if self.merge_file:
+            return convert_files_merged(self.file_paths, self.merge_file, self.template_directory,
+                                        self.config_file, self.group_key)
+        if self.bundle_file:
+            # 묶음은 매번 새로 만들므로 변환 기록(incremental)을 사용하지 않습니다.
+            return convert_files_bundled(self.file_paths, self.bundle_file, self.output_mode, self.template_directory,
+                                         self.workers, self.config_file, self.group_key, self.executor)
+        return convert_batch(self.file_paths, self.output_directory, self.template_directory, self.workers,
+                             self.config_file, self.group_key, self.incremental, self.executor,
+                             self.output_mode == 'sharded')
+
+def find_output_name_collisions(filenames):
+    """
+    확장자만 달라 같은 Hwpx 파일 이름으로 변환되는 입력 파일들을 찾는 함수입니다. (예: 'case.xlsx'와 'case.csv')
+
+    Windows에서는 대소문자만 다른 이름도 같은 파일이므로 os.path.normcase()로 비교합니다.
+
+    Parameters:
+        filenames (iterable[str]): 입력 파일 이름 또는 경로 목록
+
+    Returns:
+        dict[str, list[str]]: Hwpx 파일 이름 -> 그 이름으로 변환되는 입력 파일 이름 목록 (2개 이상인 것만)
+    """
+    stems = {}
+    for filename in filenames:
+        filename = os.path.basename(filename)
+        stem = os.path.splitext(filename)[0]
+        stems.setdefault(os.path.normcase(stem), []).append(filename)
+    return {f'{os.path.splitext(names[0])[0]}.hwpx': names for names in stems.values() if len(names) > 1}
+
+def check_output_names(file_paths):
+    """
+    입력 파일들이 서로 다른 Hwpx 파일 이름으로 변환되는지 확인하는 함수입니다.
+
+    Parameters:
+        file_paths (list[str]): 변환할 입력 파일 경로 목록
+
+    Raises:
+        ValueError: 확장자만 다른 입력 파일이 있어 나중 파일이 앞 파일의 결과를 덮어쓰게 되는 경우
+    """
+    collisions = find_output_name_collisions(file_paths)
+    if collisions:
+        details = ', '.join(f"{' / '.join(names)} -> {name}" for name, names in collisions.items())
+        raise ValueError(f"확장자만 다른 입력 파일들이 같은 Hwpx 파일로 변환되어 서로 덮어쓰게 됩니다: {details}. 파일 이름이 겹치지 않도록 바꿔 주세요.")
+
+def list_input_files(directory):
+    """
+    디렉토리 안의 입력 파일(xlsx, CSV, JSON-lines 등 읽을 수 있는 형식) 이름 목록을 리턴하는 함수입니다.
+
+    Parameters:
+        directory (str): 검색할 디렉토리
+
+    Returns:
+        list[str]: 입력 파일 이름 목록
+    """
+    return [filename for filename in os.listdir(directory) if is_input_file(filename)]
@@ -0,0 +1,167 @@
+import os
+import json
+import hashlib
+import uuid
+import threading
+
+# 출력 디렉토리에 저장하는 변환 기록 파일 (한 줄에 입력 파일 하나씩, JSON)
+MANIFEST_FILE = '.hangulo-manifest.jsonl'
+
+def file_digest(path):
+    """
+    파일 내용의 sha256 해시를 리턴하는 함수입니다.
+
+    Parameters:
+        path (str): 파일 경로
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_fingerprint(version, config_file):
+    """
+    모든 출력에 영향을 주는 공통 입력(변환기 버전, 설정 파일)의 해시를 만드는 함수입니다.
+
+    템플릿은 문서의 건수에 따라 다르므로 여기에 넣지 않고, 입력 파일마다 사용한 템플릿만 기록합니다.
+
+    Parameters:
+        version (str): 변환기 버전
+        config_file (str): 설정 파일 경로
+
+    Returns:
+        dict: version, config 해시
+    """
+    return {
+        'version': version,
+        'config': file_digest(config_file),
+    }
+
+class BuildManifest:
+    """
+    출력 디렉토리에 입력 파일별 변환 기록을 남겨 바뀐 파일만 다시 변환하도록 하는 클래스입니다.
+
+    입력 파일 하나의 변환이 끝날 때마다 기록을 한 줄씩 덧붙이므로,
+    변환이 중간에 멈춰도 다음 실행에서는 끝난 파일을 건너뛰고 이어서 변환합니다.
+    템플릿은 입력 파일의 문서들이 사용한 것만 기록하므로, 다른 건수의 템플릿이 바뀌어도 다시 변환하지 않습니다.
+    """
+
+    def __init__(self, output_directory, fingerprint, template_file):
+        """
+        Parameters:
+            output_directory (str): Hwpx 파일을 저장할 디렉토리
+            fingerprint (dict): build_fingerprint()로 만든 공통 입력의 해시
+            template_file (callable): template_file(row_count)로 호출하면 그 건수에 사용할 템플릿 파일 경로를 리턴하는 함수
+        """
+        self.output_directory = output_directory
+        self.fingerprint = fingerprint
+        self.template_file = template_file
+        self.path = os.path.join(output_directory, MANIFEST_FILE)
+        self.entries = self._load()
+
+        # 템플릿 파일 경로 -> 해시 (한 번의 실행에서 한 번만 계산합니다.)
+        self._template_digests = {}
+        self._lock = threading.Lock()
+
+        # 같은 입력 파일의 기록이 여러 줄 쌓이지 않도록 시작할 때 한 번 정리해서 다시 씁니다.
+        temp_path = f'{self.path}.{uuid.uuid4().hex}.tmp'
+        with open(temp_path, 'wt', encoding='UTF-8') as file:
+            for entry in self.entries.values():
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(temp_path, self.path)
+
+        self.file = open(self.path, 'at', encoding='UTF-8')
+
+    def _load(self):
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, 'rt', encoding='UTF-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 기록 중에 멈춘 마지막 줄은 무시합니다.
+                    continue
+                entries[entry['source']] = entry
+
+        return entries
+
+    def _templates(self, row_counts):
+        # 건수 -> [템플릿 파일 이름, 해시] (건수에 맞는 template-tax-N.hwpx가 새로 생기면 기록과 달라집니다.)
+        templates = {}
+        for row_count in sorted(set(row_counts)):
+            template_file = self.template_file(row_count)
+            digest = self._template_digests.get(template_file)
+            if digest is None:
+                digest = self._template_digests[template_file] = file_digest(template_file) if os.path.exists(template_file) else ''
+            templates[str(row_count)] = [os.path.basename(template_file), digest]
+        return templates
+
+    def _append(self, entry):
+        with self._lock:
+            self.entries[entry['source']] = entry
+            self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.file.flush()
+
+    def is_up_to_date(self, file_path):
+        """
+        입력 파일의 변환 결과가 최신인지 확인하는 함수입니다.
+
+        설정 파일, 변환기 버전, 문서들이 사용한 템플릿이 같고, 입력 파일 내용이 같고, 출력 파일이 모두 남아 있으면 최신입니다.
+        수정 시각만 바뀌고 내용이 같으면 기록의 수정 시각을 바꿔 다음 실행에서는 해시를 다시 계산하지 않습니다.
+
+        Parameters:
+            file_path (str): 입력 xlsx 파일 경로
+
+        Returns:
+            bool: 다시 변환할 필요가 없으면 True
+        """
+        entry = self.entries.get(os.path.basename(file_path))
+        if entry is None or entry['fingerprint'] != self.fingerprint:
+            return False
+
+        if not all(os.path.exists(os.path.join(self.output_directory, output)) for output in entry['outputs']):
+            return False
+
+        templates = entry.get('templates', {})
+        if self._templates(int(row_count) for row_count in templates) != templates:
+            return False
+
+        stat = os.stat(file_path)
+        if (stat.st_size, stat.st_mtime_ns) == (entry['size'], entry['mtime']):
+            return True
+
+        # 수정 시각만 바뀐 경우에는 내용 해시로 다시 확인합니다.
+        if file_digest(file_path) != entry['sha256']:
+            return False
+        self._append(dict(entry, size=stat.st_size, mtime=stat.st_mtime_ns))
+        return True
+
+    def record(self, file_path, outputs, row_counts=()):
+        """
+        입력 파일 하나의 변환이 끝났음을 기록합니다.
+
+        Parameters:
+            file_path (str): 입력 xlsx 파일 경로
+            outputs (list[str]): 만들어진 Hwpx 파일 경로 목록
+            row_counts (list[int]): 만들어진 문서마다 값이 있는 행 수 (사용한 템플릿을 기록합니다.)
+        """
+        stat = os.stat(file_path)
+        self._append({
+            'source': os.path.basename(file_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha256': file_digest(file_path),
+            'fingerprint': self.fingerprint,
+            'templates': self._templates(row_counts),
+            'outputs': [os.path.relpath(output, self.output_directory) for output in outputs],
+        })
+
+    def close(self):
+        self.file.close()
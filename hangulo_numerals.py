@@ -0,0 +1,87 @@
+from functools import lru_cache
+
+# 한글 숫자와 자리 단위
+KOREAN_DIGITS = ('', '일', '이', '삼', '사', '오', '육', '칠', '팔', '구')
+KOREAN_UNITS = ('', '십', '백', '천')
+
+# 네 자리마다 붙는 큰 단위 (만 = 10^4, 억 = 10^8, ..., 극 = 10^48)
+KOREAN_BIG_UNITS = ('', '만', '억', '조', '경', '해', '자', '양', '구', '간', '정', '재', '극')
+
+# 변환할 수 있는 가장 큰 수 + 1
+MAX_AMOUNT = 10 ** (4 * len(KOREAN_BIG_UNITS))
+
+# 같은 금액을 다시 변환할 때 사용할 캐시 크기
+KOREAN_NUMERAL_CACHE_SIZE = 4096
+
+def _group_to_korean(group):
+    text = ''
+    for unit_index in range(3, -1, -1):
+        digit = group // 10 ** unit_index % 10
+        if digit:
+            text += KOREAN_DIGITS[digit] + KOREAN_UNITS[unit_index]
+    return text
+
+# 0 ~ 9999의 한글 표기 (예: _GROUP_TABLE[1204] == '일천이백사')
+_GROUP_TABLE = tuple(_group_to_korean(group) for group in range(10000))
+
+@lru_cache(maxsize=KOREAN_NUMERAL_CACHE_SIZE)
+def korean_numeral(number):
+    """
+    주어진 숫자를 한글 숫자로 바꾸는 함수입니다. 네 자리씩 끊어 미리 만든 표에서 찾습니다.
+
+    Parameters:
+        number (int): 변환할 숫자 (0 이상 10^52 미만)
+
+    Returns:
+        str: 한글 숫자 (예: 128600 -> '일십이만팔천육백', 0 -> '' - 기존 변환기와 같이 금액 표현은 '금원정')
+
+    Raises:
+        ValueError: 음수이거나 너무 큰 수인 경우
+    """
+    number = int(number)
+    if number < 0 or number >= MAX_AMOUNT:
+        raise ValueError(f"금액 {number}은(는) 한글로 변환할 수 없습니다. (0 이상 10^{4 * len(KOREAN_BIG_UNITS)} 미만)")
+
+    parts = []
+    big_unit_index = 0
+    while number:
+        number, group = divmod(number, 10000)
+        # 네 자리가 모두 0이면 큰 단위도 붙이지 않습니다. (예: 1억 -> '일억', '일억만' 아님)
+        if group:
+            parts.append(_GROUP_TABLE[group] + KOREAN_BIG_UNITS[big_unit_index])
+        big_unit_index += 1
+
+    return ''.join(reversed(parts))
+
+def number_to_korean_amount(number):
+    """
+    주어진 숫자를 한글로 변환하여 금액 표현과 함께 리턴하는 함수입니다.
+
+    Parameters:
+        number (int): 변환할 숫자
+
+    Returns:
+        str: 한글로 변환된 금액 표현 (예: 128600 -> "금일십이만팔천육백원정", 0 -> "금원정")
+    """
+    return '금' + korean_numeral(number) + '원정'
+
+def number_to_korean_amounts(numbers):
+    """
+    여러 금액(예: 문서별 계 합계 열)을 한 번에 한글 금액 표현으로 바꾸는 함수입니다.
+
+    같은 금액은 한 번만 변환합니다.
+
+    Parameters:
+        numbers (iterable[int]): 변환할 숫자들
+
+    Returns:
+        list[str]: 입력 순서대로 한글 금액 표현
+    """
+    converted = {}
+    result = []
+    for number in numbers:
+        text = converted.get(number)
+        if text is None:
+            text = converted[number] = number_to_korean_amount(number)
+        result.append(text)
+    return result
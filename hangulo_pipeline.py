@@ -0,0 +1,461 @@
+import io
+import os
+import time
+import queue
+import threading
+import contextlib
+from collections import namedtuple
+from hwpx_writer import SECTION_NAME, compression_policy, write_hwpx
+from hangulo_readers import group_records, iter_records
+from hangulo_config import CONFIG_FILE, PIPELINE_STAGES, load_field_map
+from hangulo_manifest import BuildManifest, build_fingerprint
+from hangulo_bundle import BundleWriter
+from hangulo_profiler import document_timer, finish, measure, stage
+from hangulo_core import (CONVERTER_VERSION, ConversionResult, ConversionRun, atomic_output, group_output_name,
+                          output_path, render_document, template_file)
+
+# 대기열을 기다리다가 멈춤 요청이 있었는지 확인하는 간격 (초)
+POLL_SECONDS = 0.1
+
+# 단계의 모든 스레드가 끝났음을 다음 단계에 알리는 표시
+_DONE = object()
+
+# 입력 파일 하나를 다 읽었음을 알리는 항목 (count: 그 파일에서 나올 결과 수)
+_SourceRead = namedtuple('_SourceRead', ['source', 'file_path', 'count'])
+
+class _Stopped(Exception):
+    # 다른 단계의 오류로 파이프라인이 멈췄을 때 대기를 끝내기 위한 예외
+    pass
+
+class StageStats:
+    """
+    파이프라인 단계 하나의 처리 수, 작업 시간, 대기 시간, 입력 대기열 길이를 모으는 클래스입니다.
+
+    Attributes:
+        name (str): 단계 이름
+        workers (int): 스레드 수
+        items (int): 처리한 항목 수
+        busy_seconds (float): 모든 스레드가 일한 시간의 합 (초)
+        input_wait_seconds (float): 입력 대기열이 비어 기다린 시간의 합 (초, 앞 단계가 느림)
+        output_wait_seconds (float): 다음 대기열이 가득 차 기다린 시간의 합 (초, 뒤 단계가 느림)
+    """
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.input_wait_seconds = 0.0
+        self.output_wait_seconds = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def add(self, busy_seconds, input_wait_seconds, output_wait_seconds, depth):
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += busy_seconds
+            self.input_wait_seconds += input_wait_seconds
+            self.output_wait_seconds += output_wait_seconds
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'items': self.items,
+                'busy_seconds': round(self.busy_seconds, 6),
+                'input_wait_seconds': round(self.input_wait_seconds, 6),
+                'output_wait_seconds': round(self.output_wait_seconds, 6),
+                'queue_max': self.max_depth,
+                'queue_mean': round(self.depth_total / self.depth_samples, 3) if self.depth_samples else 0.0,
+            }
+
+class Pipeline:
+    """
+    단계들을 크기가 정해진 대기열로 이어, 단계마다 정해진 수의 스레드로 동시에 실행하는 클래스입니다.
+
+    다음 단계의 대기열이 가득 차면 앞 단계가 기다리므로(backpressure), 입력 파일이 아무리 많아도
+    메모리에 있는 문서 수는 대기열 크기와 스레드 수의 합을 넘지 않습니다.
+    한 단계에서 오류가 나면 모든 단계를 멈추고, results()에서 그 오류를 다시 발생시킵니다.
+
+    각 단계의 함수는 function(item, emit, report)로 호출됩니다.
+    emit(item)은 다음 단계로 넘기고, report(item)은 단계를 건너뛰어 results()로 바로 보냅니다.
+    마지막 단계의 emit()도 results()로 보냅니다.
+    """
+
+    def __init__(self, stages, queue_size):
+        """
+        Parameters:
+            stages (list[tuple[str, callable, int]]): (단계 이름, 함수, 스레드 수) 목록 (실행 순서)
+            queue_size (int): 단계 사이 대기열 크기
+        """
+        self.stages = stages
+        self.stats = {name: StageStats(name, workers) for name, _, workers in stages}
+        self.inputs = [queue.Queue() if i == 0 else queue.Queue(maxsize=queue_size) for i in range(len(stages))]
+        # 결과 대기열은 작은 결과만 담으므로 크기를 제한하지 않습니다.
+        self.output = queue.Queue()
+
+        self._stop = threading.Event()
+        self._errors = []
+        self._threads = []
+        self._remaining = [workers for _, _, workers in stages]
+        self._lock = threading.Lock()
+
+    def _put(self, target, item):
+        # 대기열이 가득 차 있으면 멈춤 요청을 확인하면서 기다립니다.
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped()
+
+    def _get(self, source):
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+        raise _Stopped()
+
+    def _run_stage(self, index):
+        name, function, _ = self.stages[index]
+        stats = self.stats[name]
+        source = self.inputs[index]
+        target = self.inputs[index + 1] if index + 1 < len(self.stages) else self.output
+        waited = [0.0]
+
+        def emit(item):
+            start = time.perf_counter()
+            self._put(target, item)
+            waited[0] += time.perf_counter() - start
+
+        def report(item):
+            self._put(self.output, item)
+
+        try:
+            while True:
+                start = time.perf_counter()
+                depth = source.qsize()
+                item = self._get(source)
+                input_wait = time.perf_counter() - start
+                if item is _DONE:
+                    break
+
+                waited[0] = 0.0
+                start = time.perf_counter()
+                function(item, emit, report)
+                elapsed = time.perf_counter() - start
+                stats.add(elapsed - waited[0], input_wait, waited[0], depth)
+        except _Stopped:
+            return
+        except BaseException as e:
+            with self._lock:
+                self._errors.append(e)
+            self._stop.set()
+            return
+
+        # 이 단계의 마지막 스레드가 끝나면 다음 단계의 스레드 수만큼 끝 표시를 넘깁니다.
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if last:
+            count = self.stages[index + 1][2] if index + 1 < len(self.stages) else 1
+            try:
+                for _ in range(count):
+                    self._put(target, _DONE)
+            except _Stopped:
+                pass
+
+    def start(self, items):
+        """
+        첫 번째 단계에 items를 넣고 모든 단계의 스레드를 시작합니다.
+        """
+        first = self.inputs[0]
+        for item in items:
+            first.put(item)
+        for _ in range(self.stages[0][2]):
+            first.put(_DONE)
+
+        for index, (name, _, workers) in enumerate(self.stages):
+            for worker_index in range(workers):
+                thread = threading.Thread(target=self._run_stage, args=(index,), name=f'pipeline-{name}-{worker_index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def results(self):
+        """
+        마지막 단계의 결과와 report()로 보낸 항목을 나오는 순서대로 돌려주는 제너레이터입니다.
+
+        Raises:
+            Exception: 단계에서 발생한 첫 번째 오류
+        """
+        try:
+            while True:
+                try:
+                    item = self._get(self.output)
+                except _Stopped:
+                    break
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self.close()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def close(self):
+        """
+        모든 단계를 멈추고 스레드가 끝날 때까지 기다립니다.
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def stats_dict(self):
+        return {name: self.stats[name].to_dict() for name, _, _ in self.stages}
+
+def convert_pipeline(file_paths, output_directory, template_directory='', config_file=CONFIG_FILE, group_key=None,
+                     incremental=False, settings=None, on_stats=None, sharded=False, bundle_file=None, bundle_format=None):
+    """
+    입력 파일들을 discover, read, render, package, write 단계의 파이프라인으로 변환하는 제너레이터입니다.
+
+    단계들은 크기가 정해진 대기열로 이어져 동시에 실행되므로, 한 파일을 읽는 동안 다른 문서를 채우고
+    또 다른 문서를 디스크에 씁니다. 결과는 끝난 순서대로 나옵니다. (입력 순서와 다를 수 있습니다.)
+    변환 기록(incremental)은 입력 파일의 모든 문서를 쓴 뒤에 남기고, 그 파일의 마지막 결과를 final로 표시합니다.
+    (마지막 결과는 파일을 다 읽고 모든 문서를 쓸 때까지 하나씩 늦게 돌려줍니다.)
+    bundle_file이 있으면 write 단계가 문서를 묶음 파일 하나에 넣습니다. 먼저 끝난 문서는 앞 문서들이 끝날 때까지 메모리에 두었다가
+    입력 순서대로 넣으므로, 묶음의 항목과 색인 순서는 convert_files_bundled()와 같습니다. (변환 기록은 사용하지 않습니다.)
+
+    Parameters:
+        file_paths (list[str]): 변환할 입력 파일 경로 목록
+        output_directory (str): Hwpx 파일을 저장할 디렉토리
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        group_key (str): 문서를 나눌 key (None이면 입력 파일 하나가 문서 하나)
+        incremental (bool): 바뀐 파일만 다시 변환할지 여부
+        settings (PipelineSettings): 단계별 스레드 수와 대기열 크기 (None이면 설정 파일의 [Pipeline])
+        on_stats (callable): 변환이 끝나면 단계별 통계(dict)를 받아 호출할 함수
+        sharded (bool): 출력 디렉토리의 하위 디렉토리에 나누어 저장할지 여부 (output_path() 참고)
+        bundle_file (str): 문서들을 넣을 묶음 파일 경로 (None이면 문서마다 Hwpx 파일 하나)
+        bundle_format (str): 묶음 형식 ('zip', 'tar')
+
+    Yields:
+        ConversionResult: 문서별 변환 결과
+    """
+    field_map = load_field_map(config_file)
+    settings = settings or field_map.pipeline
+    if group_key is not None and group_key not in field_map.fields:
+        raise ValueError(f"문서를 나눌 '{group_key}' 항목이 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+    policy = compression_policy(field_map.compress_level)
+
+    manifest = None
+    if incremental and not bundle_file:
+        manifest = BuildManifest(output_directory, build_fingerprint(CONVERTER_VERSION, config_file),
+                                 lambda row_count: template_file(row_count, template_directory, field_map))
+
+    def discover(file_path, emit, report):
+        filename = os.path.basename(file_path)
+        if manifest is not None and manifest.is_up_to_date(file_path):
+            report(ConversionResult(filename, 'up-to-date', None, filename))
+        else:
+            emit(file_path)
+
+    # 입력 파일 경로 -> 입력 순서
+    file_indexes = {file_path: index for index, file_path in enumerate(file_paths)}
+
+    # 단계 사이에 넘기는 문서: (입력 파일 이름, 결과 이름, 출력 파일 이름, (입력 순서, 파일 안의 문서 순서),
+    #                          측정 (측정이 꺼져 있으면 None), 행 수 (render부터), ...)
+    # 결과 이름은 convert_file()/convert_file_groups()와 같이 나누지 않으면 입력 파일 이름, 나누면 출력 파일 이름입니다.
+    def read(file_path, emit, report):
+        filename = os.path.basename(file_path)
+
+        print("### ", file_path)
+
+        gen_hwpx_file_name = os.path.splitext(filename)[0]
+        timer = document_timer()
+        with measure(timer), stage('load'):
+            records = iter_records(file_path, field_map)
+        count = 0
+        if group_key:
+            used_names = set()
+            documents = group_records(records, group_key)
+            while True:
+                # 문서마다 그 문서를 읽는 데 걸린 시간을 load 단계로 기록합니다.
+                with measure(timer), stage('load'):
+                    document = next(documents, None)
+                if document is None:
+                    break
+                group_value, group = document
+                name = group_output_name(gen_hwpx_file_name, group_value, used_names)
+                emit((filename, f'{name}.hwpx', f'{name}.hwpx', (file_indexes[file_path], count), timer, group))
+                count += 1
+                timer = document_timer()
+        else:
+            with measure(timer), stage('load'):
+                group = list(records)
+            if group:
+                emit((filename, filename, f'{gen_hwpx_file_name}.hwpx', (file_indexes[file_path], 0), timer, group))
+                count = 1
+        if bundle is not None:
+            # 이 파일의 문서 수를 알았으므로, 이 파일을 기다리던 뒤 파일의 문서들을 넣을 수 있습니다.
+            with bundle_lock:
+                bundle_counts[file_indexes[file_path]] = count
+                for result in flush_bundle():
+                    report(result)
+        if count == 0:
+            report(ConversionResult(filename, 'invalid', None, filename, finish(timer)))
+            count = 1
+        report(_SourceRead(filename, file_path, count))
+
+    def render(item, emit, report):
+        filename, result_name, output_name, order, timer, group = item
+        with measure(timer):
+            template_pack, xml_output_result = render_document(group, template_directory, field_map)
+        emit((filename, result_name, output_name, order, timer, len(group), template_pack.members, xml_output_result))
+
+    def package(item, emit, report):
+        filename, result_name, output_name, order, timer, rows, members, xml_output_result = item
+        buffer = io.BytesIO()
+        with measure(timer), stage('package'):
+            write_hwpx(members, buffer, {SECTION_NAME: xml_output_result}, policy)
+        emit((filename, result_name, output_name, order, timer, rows, buffer.getbuffer()))
+
+    def flush_bundle():
+        # 입력 순서대로 넣을 차례가 된 문서들을 묶음에 넣고 결과 목록을 리턴합니다. (bundle_lock 안에서 호출합니다.)
+        results = []
+        while bundle_next[0] < len(file_paths):
+            file_index, document_index = bundle_next
+            if bundle_counts.get(file_index) == document_index:
+                # 이 파일의 문서를 모두 넣었습니다.
+                bundle_next[:] = [file_index + 1, 0]
+                continue
+            pending = bundle_pending.pop((file_index, document_index), None)
+            if pending is None:
+                break
+            filename, result_name, output_name, timer, rows, data = pending
+            with measure(timer), stage('write'):
+                bundle.add(output_name, bytes(data), filename)
+            results.append(ConversionResult(result_name, 'converted', bundle_file, filename, finish(timer), rows=rows))
+            bundle_next[1] += 1
+        return results
+
+    def write(item, emit, report):
+        filename, result_name, output_name, order, timer, rows, data = item
+        if bundle is not None:
+            # 묶음은 한 파일에 입력 순서대로 써야 하므로 차례가 올 때까지 기다렸다가 하나씩 넣습니다.
+            with bundle_lock:
+                bundle_pending[order] = (filename, result_name, output_name, timer, rows, data)
+                for result in flush_bundle():
+                    emit(result)
+            return
+
+        gen_hwpx_file_path = output_path(output_directory, output_name, sharded)
+        with measure(timer):
+            with atomic_output(gen_hwpx_file_path) as output_file:
+                with stage('write'):
+                    output_file.write(data)
+        emit(ConversionResult(result_name, 'converted', gen_hwpx_file_path, filename, finish(timer), rows=rows))
+
+    functions = {'discover': discover, 'read': read, 'render': render, 'package': package, 'write': write}
+    pipeline = Pipeline([(name, functions[name], settings.workers[name]) for name in PIPELINE_STAGES], settings.queue_size)
+
+    # 입력 파일 이름 -> [나온 결과 수, 출력 파일 목록, 나올 결과 수 (다 읽기 전에는 None), 입력 파일 경로, 문서별 행 수]
+    sources = {}
+
+    # 입력 파일 이름 -> 아직 돌려주지 않은 가장 최근 결과 (마지막 결과인지 알 수 있을 때까지 기다립니다.)
+    held = {}
+
+    def finish_source(source):
+        # 입력 파일의 모든 결과가 나왔으면 변환 기록을 남기고 마지막 결과를 final로 리턴합니다. (아니면 None)
+        done, outputs, expected, file_path, row_counts = sources[source]
+        if expected is None or done != expected:
+            return None
+        del sources[source]
+        if manifest is not None:
+            manifest.record(file_path, outputs, row_counts)
+        return held.pop(source)._replace(final=True)
+
+    bundle = None
+    bundle_lock = threading.Lock()
+    # 묶음에 넣을 차례를 기다리는 문서: (입력 순서, 파일 안의 문서 순서) -> 문서
+    bundle_pending = {}
+    # 입력 순서 -> 그 파일의 문서 수 (파일을 다 읽은 뒤에 기록합니다.)
+    bundle_counts = {}
+    # 다음에 넣을 [입력 순서, 파일 안의 문서 순서]
+    bundle_next = [0, 0]
+    with contextlib.ExitStack() as stack:
+        if bundle_file:
+            bundle = BundleWriter(stack.enter_context(atomic_output(bundle_file)), bundle_format)
+
+        try:
+            pipeline.start(file_paths)
+            for item in pipeline.results():
+                if isinstance(item, _SourceRead):
+                    entry = sources.setdefault(item.source, [0, [], None, None, []])
+                    entry[2], entry[3] = item.count, item.file_path
+                    final = finish_source(item.source)
+                    if final is not None:
+                        yield final
+                    continue
+
+                if item.status != 'up-to-date':
+                    entry = sources.setdefault(item.source, [0, [], None, None, []])
+                    entry[0] += 1
+                    if item.output_path:
+                        entry[1].append(item.output_path)
+                    if item.rows is not None:
+                        entry[4].append(item.rows)
+                    previous = held.get(item.source)
+                    held[item.source] = item
+                    if previous is not None:
+                        yield previous._replace(final=False)
+                    final = finish_source(item.source)
+                    if final is not None:
+                        yield final
+                else:
+                    yield item
+            if bundle is not None:
+                bundle.close()
+        finally:
+            pipeline.close()
+            if manifest is not None:
+                manifest.close()
+            if on_stats is not None:
+                on_stats(pipeline.stats_dict())
+
+class PipelineRun(ConversionRun):
+    """
+    ConversionRun과 같지만 문서마다 Hwpx 파일을 만드는 경우 convert_pipeline()으로 변환하는 클래스입니다.
+
+    모든 문서를 합치는 경우(merge_file)는 문서 순서가 중요하므로 ConversionRun과 같이 변환합니다.
+
+    Attributes:
+        pipeline_stats (dict): 단계 이름 -> 처리 수, 작업/대기 시간, 대기열 길이 (변환이 끝난 뒤)
+    """
+
+    def __init__(self, *args, settings=None, **kwargs):
+        """
+        Parameters:
+            settings (PipelineSettings): 단계별 스레드 수와 대기열 크기 (None이면 설정 파일의 [Pipeline])
+            그 밖의 인자는 ConversionRun과 같습니다. (workers, executor는 사용하지 않습니다.)
+        """
+        super().__init__(*args, **kwargs)
+        self.settings = settings
+        self.pipeline_stats = None
+
+    def _iter_results(self):
+        if self.merge_file:
+            return super()._iter_results()
+        return convert_pipeline(self.file_paths, self.output_directory, self.template_directory, self.config_file,
+                                self.group_key, self.incremental, self.settings, self._set_stats,
+                                self.output_mode == 'sharded', self.bundle_file, self.output_mode)
+
+    def _set_stats(self, stats):
+        self.pipeline_stats = stats
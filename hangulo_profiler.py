@@ -0,0 +1,248 @@
+import sys
+import json
+import time
+import platform
+import threading
+import contextlib
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없습니다.
+    resource = None
+
+# 문서 하나를 만드는 단계
+# load: xlsx 읽기, template: 템플릿 가져오기, render: 값 채우기,
+# package: Hwpx(zip) 만들기, write: 임시 파일 쓰기, rename: 최종 이름으로 바꾸기
+STAGES = ('load', 'template', 'render', 'package', 'write', 'rename')
+
+# 리포트에 기록할 백분위수
+PERCENTILES = (50, 90, 99)
+
+_enabled = False
+
+# 측정 중인 문서의 단계별 시간 (스레드마다 따로 둡니다.)
+_local = threading.local()
+
+def _current():
+    return getattr(_local, 'timings', None)
+
+def enable_profiling():
+    """
+    현재 프로세스에서 단계별 시간 측정을 켜는 함수입니다. (프로세스 풀의 initializer로도 사용합니다.)
+    """
+    global _enabled
+    _enabled = True
+
+    # resource 모듈이 없으면 최대 메모리를 tracemalloc으로 측정합니다.
+    if resource is None and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def is_profiling():
+    return _enabled
+
+def peak_memory():
+    """
+    현재 프로세스의 최대 메모리 사용량(byte)을 리턴하는 함수입니다. (측정할 수 없으면 None)
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 byte 단위입니다.
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1]
+    return None
+
+def start_document():
+    """
+    문서 하나의 측정을 시작합니다. (측정이 꺼져 있으면 아무 일도 하지 않습니다.)
+    """
+    if not _enabled:
+        return
+    _local.timings = {}
+    _local.start = time.perf_counter()
+
+def finish_document():
+    """
+    문서 하나의 측정을 끝내고 단계별 시간을 리턴합니다.
+
+    Returns:
+        dict: 단계 이름 -> 초, total (초), peak_memory (byte) - 측정이 꺼져 있으면 None
+    """
+    current = _current()
+    if current is None:
+        return None
+
+    timings = {name: round(seconds, 6) for name, seconds in current.items()}
+    timings['total'] = round(time.perf_counter() - _local.start, 6)
+    timings['peak_memory'] = peak_memory()
+
+    _local.timings = None
+    return timings
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    with 블록에 걸린 시간을 현재 문서의 name 단계에 더합니다.
+    """
+    if _current() is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        # 측정 중에 finish_document()가 호출되었을 수 있으므로 다시 확인합니다.
+        current = _current()
+        if current is not None:
+            current[name] = current.get(name, 0.0) + time.perf_counter() - start
+
+def iter_documents(iterable):
+    """
+    문서를 하나씩 꺼낼 때마다 측정을 시작하고, 꺼내는 데 걸린 시간을 load 단계로 기록하는 제너레이터입니다.
+
+    xlsx 파일을 스트리밍으로 읽으면서 문서를 나누는 경우에 사용합니다.
+    """
+    iterator = iter(iterable)
+    while True:
+        start_document()
+        with stage('load'):
+            item = next(iterator, None)
+        if item is None:
+            finish_document()
+            return
+        yield item
+
+class DocumentTimer:
+    """
+    여러 스레드를 거쳐 만들어지는 문서 하나의 단계별 시간을 모으는 클래스입니다. (파이프라인에서 사용합니다.)
+
+    각 스레드는 measure() 블록 안에서 stage()로 측정하고, 마지막 단계에서 finish()로 결과를 만듭니다.
+    total은 처음 만든 때부터 finish()까지의 시간이므로 단계 사이 대기열에서 기다린 시간도 들어갑니다.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def measure(self):
+        """
+        with 블록 안의 stage()가 이 문서의 단계별 시간에 더해지도록 합니다.
+        """
+        previous = _current()
+        _local.timings = self.timings
+        try:
+            yield
+        finally:
+            _local.timings = previous
+
+    def finish(self):
+        """
+        측정을 끝내고 단계별 시간을 리턴합니다. (finish_document()와 같은 형식)
+        """
+        timings = {name: round(seconds, 6) for name, seconds in self.timings.items()}
+        timings['total'] = round(time.perf_counter() - self.start, 6)
+        timings['peak_memory'] = peak_memory()
+        return timings
+
+def document_timer():
+    """
+    문서 하나의 DocumentTimer를 만듭니다. (측정이 꺼져 있으면 None)
+    """
+    return DocumentTimer() if _enabled else None
+
+def measure(timer):
+    """
+    timer.measure()와 같습니다. (timer가 None이면 아무 일도 하지 않습니다.)
+    """
+    return timer.measure() if timer is not None else contextlib.nullcontext()
+
+def finish(timer):
+    """
+    timer.finish()와 같습니다. (timer가 None이면 None)
+    """
+    return timer.finish() if timer is not None else None
+
+def percentile(sorted_values, percent):
+    """
+    정렬된 값 목록의 백분위수를 선형 보간으로 계산합니다.
+    """
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(values):
+    """
+    값 목록의 개수, 합계, 평균, 백분위수, 최대값을 리턴합니다.
+    """
+    values = sorted(values)
+    summary = {
+        'count': len(values),
+        'total': round(sum(values), 6),
+        'mean': round(sum(values) / len(values), 6) if values else None,
+    }
+    for percent in PERCENTILES:
+        value = percentile(values, percent)
+        summary[f'p{percent}'] = round(value, 6) if value is not None else None
+    summary['max'] = round(values[-1], 6) if values else None
+    return summary
+
+class ProfileReport:
+    """
+    변환 결과에 담긴 문서별 측정값을 모아 JSON 리포트를 만드는 클래스입니다.
+    """
+
+    def __init__(self, version, workers):
+        self.version = version
+        self.workers = workers
+        self.start_time = time.perf_counter()
+        self.documents = []
+
+    def add(self, result):
+        """
+        변환 결과 하나의 측정값을 추가합니다. (측정값이 없는 결과는 무시합니다.)
+
+        Parameters:
+            result (ConversionResult): 변환 결과
+        """
+        if result.timings is None:
+            return
+        document = {'filename': result.filename, 'source': result.source}
+        document.update(result.timings)
+        self.documents.append(document)
+
+    def to_dict(self):
+        stages = {}
+        for name in STAGES + ('total',):
+            values = [document[name] for document in self.documents if name in document]
+            if values:
+                stages[name] = summarize(values)
+
+        peaks = [document['peak_memory'] for document in self.documents if document.get('peak_memory') is not None]
+
+        return {
+            'version': self.version,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'workers': self.workers,
+            'elapsed_seconds': round(time.perf_counter() - self.start_time, 3),
+            'document_count': len(self.documents),
+            'stages': stages,
+            'peak_memory': max(peaks) if peaks else peak_memory(),
+            'documents': self.documents,
+        }
+
+    def write(self, report_file):
+        """
+        리포트를 JSON 파일로 저장합니다.
+
+        Parameters:
+            report_file (str): 저장할 파일 경로
+        """
+        with open(report_file, 'wt', encoding='UTF-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
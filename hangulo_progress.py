@@ -0,0 +1,118 @@
+import os
+import time
+from collections import namedtuple
+
+class ProgressSnapshot(namedtuple('ProgressSnapshot', ['files_done', 'total_files', 'documents', 'bytes_written',
+                                                       'elapsed_seconds', 'files_per_second', 'eta_seconds'])):
+    """
+    변환 진행 상황 한 시점의 값입니다.
+
+    Attributes:
+        files_done (int): 처리한 xlsx 파일 수
+        total_files (int): 전체 xlsx 파일 수
+        documents (int): 만든 Hwpx 문서 수
+        bytes_written (int): 저장한 Hwpx 파일 크기의 합 (byte)
+        elapsed_seconds (float): 시작 후 지난 시간 (초)
+        files_per_second (float): 초당 처리한 xlsx 파일 수
+        eta_seconds (float): 남은 예상 시간 (초, 아직 알 수 없으면 None)
+    """
+    __slots__ = ()
+
+    @property
+    def percent(self):
+        if not self.total_files:
+            return 100
+        return int(self.files_done / self.total_files * 100)
+
+    def format(self):
+        """
+        진행 상황을 한 줄 문자열로 리턴하는 함수입니다. (예: '12/100 파일, 1.2 MB, 3.4 파일/초, 남은 시간 0:26')
+        """
+        text = (f"{self.files_done}/{self.total_files} 파일, {self.bytes_written / (1024 * 1024):.1f} MB, "
+                f"{self.files_per_second:.1f} 파일/초")
+        if self.eta_seconds is not None:
+            minutes, seconds = divmod(int(round(self.eta_seconds)), 60)
+            text += f", 남은 시간 {minutes}:{seconds:02d}"
+        return text
+
+    def to_dict(self):
+        values = self._asdict()
+        values['elapsed_seconds'] = round(self.elapsed_seconds, 3)
+        values['files_per_second'] = round(self.files_per_second, 3)
+        if self.eta_seconds is not None:
+            values['eta_seconds'] = round(self.eta_seconds, 3)
+        return values
+
+class ProgressTracker:
+    """
+    convert_batch()의 결과를 받아 처리한 파일 수, 저장한 크기, 처리 속도, 남은 시간을 계산하는 클래스입니다.
+
+    GUI와 CLI가 같은 계산을 쓰도록 Qt와 관계없이 만듭니다.
+    """
+
+    def __init__(self, total_files):
+        self.total_files = total_files
+        self.start_time = time.perf_counter()
+        self.sources = set()
+        self.documents = 0
+
+        # 출력 경로 -> 파일 크기 (여러 문서를 한 파일로 합치는 경우에도 한 번만 더합니다.)
+        self.output_sizes = {}
+
+        # 이미 최신이라 건너뛴 파일은 처리 속도 계산에서 뺍니다.
+        self.skipped_files = 0
+
+    def update(self, result):
+        """
+        변환 결과 하나를 반영하고 현재 진행 상황을 리턴합니다.
+
+        Parameters:
+            result (ConversionResult): 변환 결과
+
+        Returns:
+            ProgressSnapshot: 현재 진행 상황
+        """
+        # 입력 파일 하나를 여러 문서로 나누면 마지막(final) 결과가 나와야 그 파일이 끝난 것입니다.
+        if result.final and result.source not in self.sources:
+            self.sources.add(result.source)
+            if result.status == 'up-to-date':
+                self.skipped_files += 1
+
+        if result.output_path:
+            self.documents += 1
+            self._stat_output(result.output_path)
+
+        return self.snapshot()
+
+    def _stat_output(self, path):
+        try:
+            self.output_sizes[path] = os.path.getsize(path)
+        except OSError:
+            # 모든 문서를 합치는 경우에는 마지막에 파일이 만들어지므로 finish()에서 다시 읽습니다.
+            self.output_sizes.setdefault(path, 0)
+
+    def finish(self):
+        """
+        변환이 모두 끝난 뒤 출력 파일 크기를 다시 읽어 마지막 진행 상황을 리턴합니다.
+
+        Returns:
+            ProgressSnapshot: 마지막 진행 상황
+        """
+        for path in self.output_sizes:
+            self._stat_output(path)
+        return self.snapshot()
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.start_time
+        files_done = len(self.sources)
+        converted_files = files_done - self.skipped_files
+        files_per_second = converted_files / elapsed if elapsed > 0 else 0.0
+
+        eta_seconds = None
+        if files_done >= self.total_files:
+            eta_seconds = 0.0
+        elif files_per_second > 0:
+            eta_seconds = (self.total_files - files_done) / files_per_second
+
+        return ProgressSnapshot(files_done, self.total_files, self.documents, sum(self.output_sizes.values()),
+                                elapsed, files_per_second, eta_seconds)
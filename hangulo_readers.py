@@ -0,0 +1,284 @@
+import io
+import os
+import re
+import csv
+import json
+import datetime
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
+
+# CSV 파일에서 시도할 인코딩 (UTF-8로 읽을 수 없으면 한글 Windows 기본 인코딩)
+CSV_ENCODINGS = ('utf-8-sig', 'cp949')
+
+# 텍스트로 된 날짜 (예: 2022-5-30, 2022.05.30, 2022/05/30)
+DATE_TEXT_PATTERN = re.compile(r'(\d{4})[-./](\d{1,2})[-./](\d{1,2})')
+
+def iter_xlsx_records(xlsx_file, fields):
+    """
+    xlsx 파일의 첫 번째 시트를 읽기 전용(스트리밍) 모드로 한 행씩 읽는 제너레이터입니다.
+
+    fields에 있는 열만 골라 값이 있는 행만 돌려줍니다. 첫 번째 행은 제목 행으로 보고 건너뜁니다.
+
+    Parameters:
+        xlsx_file (str): 읽을 xlsx 파일 경로
+        fields (dict): key -> 열 이름 (예: {'세액': 'AJ'})
+
+    Yields:
+        dict: 행마다 key -> 셀 값 (2행부터 순서대로)
+    """
+    indexes = {key: column_index_from_string(column) - 1 for key, column in fields.items()}
+    max_column = max(indexes.values(), default=0) + 1
+
+    wb = load_workbook(xlsx_file, read_only=True, data_only=True)
+    try:
+        # 기본으로 첫 번째 시트 선택
+        ws = wb.active
+
+        for row in ws.iter_rows(min_row=2, max_col=max_column, values_only=True):
+            record = {key: row[index] if index < len(row) else None for key, index in indexes.items()}
+            if any(value is not None and value != '' for value in record.values()):
+                yield record
+    finally:
+        wb.close()
+
+def read_xlsx_records(xlsx_file, fields):
+    """
+    xlsx 파일의 첫 번째 시트를 한 번만 읽어 행별 값 목록을 리턴하는 함수입니다.
+
+    Parameters:
+        xlsx_file (str): 읽을 xlsx 파일 경로
+        fields (dict): key -> 열 이름 (예: {'세액': 'AJ'})
+
+    Returns:
+        list[dict]: 행마다 key -> 셀 값을 담은 목록 (2행부터 순서대로)
+    """
+    return list(iter_xlsx_records(xlsx_file, fields))
+
+def group_records(records, group_key):
+    """
+    연속된 행들을 group_key 값이 같은 것끼리 묶어 돌려주는 제너레이터입니다.
+
+    group_key 값이 비어 있는 행은 바로 앞 묶음에 이어 붙입니다.
+    한 번에 한 묶음만 메모리에 두므로 큰 시트도 가장 큰 묶음 크기만큼의 메모리로 처리합니다.
+
+    Parameters:
+        records (iterable[dict]): 행별 값
+        group_key (str): 묶음을 나눌 key (예: '문서번호')
+
+    Yields:
+        tuple[object, list[dict]]: (group_key 값, 묶음에 속한 행 목록)
+    """
+    group_value = None
+    group = []
+    for record in records:
+        value = record.get(group_key)
+        if value is not None and value != '':
+            if group and value != group_value:
+                yield group_value, group
+                group = []
+            group_value = value
+        group.append(record)
+
+    if group:
+        yield group_value, group
+
+def _read_source(source):
+    # 경로나 바이너리 파일 객체에서 내용을 한 번에 읽습니다.
+    if hasattr(source, 'read'):
+        return source.read()
+    with open(source, 'rb') as file:
+        return file.read()
+
+def _text_converter(field):
+    """
+    텍스트 값을 xlsx에서 읽은 값과 같은 형태로 바꾸는 함수를 리턴합니다. (날짜는 datetime, 금액은 int)
+    """
+    if field.type == 'date':
+        def convert(value):
+            match = DATE_TEXT_PATTERN.fullmatch(value)
+            if match is None:
+                return value
+            try:
+                return datetime.datetime(*map(int, match.groups()))
+            except ValueError:
+                return value
+        return convert
+
+    if field.type == 'amount':
+        def convert(value):
+            digits = value.replace(',', '')
+            return int(digits) if digits.isdigit() else value
+        return convert
+
+    return None
+
+def iter_csv_records(csv_file, field_map):
+    """
+    CSV 파일을 한 번만 읽어 행별 값을 돌려주는 제너레이터입니다.
+
+    첫 번째 행은 제목 행입니다. 제목에 config.ini의 항목 이름이 있으면 이름으로 열을 찾고,
+    없으면 xlsx와 같이 열 이름(A, B, ...)의 위치로 찾습니다. 값이 있는 행만 돌려줍니다.
+    날짜와 금액 항목은 xlsx에서 읽은 값과 같도록 datetime과 int로 바꿉니다.
+
+    Parameters:
+        csv_file (str | file): CSV 파일 경로 또는 읽기용 바이너리 파일 객체
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Yields:
+        dict: 행마다 key -> 값 (2행부터 순서대로)
+    """
+    data = _read_source(csv_file)
+    for encoding in CSV_ENCODINGS:
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"CSV 파일 '{csv_file}'의 인코딩을 알 수 없습니다. (UTF-8 또는 CP949로 저장해 주세요.)")
+
+    rows = csv.reader(io.StringIO(text, newline=''))
+    header = [name.strip() for name in next(rows, [])]
+
+    if any(key in header for key in field_map.fields):
+        indexes = {key: header.index(key) for key in field_map.fields if key in header}
+    else:
+        indexes = {key: column_index_from_string(field.column) - 1 for key, field in field_map.fields.items()}
+    converters = {key: _text_converter(field_map.fields[key]) for key in indexes}
+
+    for row in rows:
+        record = dict.fromkeys(field_map.fields)
+        populated = False
+        for key, index in indexes.items():
+            value = row[index].strip() if index < len(row) else ''
+            if value == '':
+                continue
+            converter = converters[key]
+            record[key] = converter(value) if converter is not None else value
+            populated = True
+        if populated:
+            yield record
+
+def iter_jsonl_records(jsonl_file, field_map):
+    """
+    JSON-lines 파일(한 줄에 JSON 객체 하나)을 한 번만 읽어 행별 값을 돌려주는 제너레이터입니다.
+
+    각 객체의 키는 config.ini의 항목 이름입니다. 날짜와 금액이 문자열이면 xlsx에서 읽은 값과 같도록 바꿉니다.
+
+    Parameters:
+        jsonl_file (str | file): JSON-lines 파일 경로 또는 읽기용 바이너리 파일 객체
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Yields:
+        dict: 행마다 key -> 값 (파일 순서대로)
+    """
+    converters = {key: _text_converter(field) for key, field in field_map.fields.items()}
+
+    for line_number, line in enumerate(_read_source(jsonl_file).decode('utf-8-sig').splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"JSON-lines 파일 '{jsonl_file}'의 {line_number}번째 줄을 읽을 수 없습니다. 오류: {e}")
+        if not isinstance(data, dict):
+            raise ValueError(f"JSON-lines 파일 '{jsonl_file}'의 {line_number}번째 줄이 JSON 객체가 아닙니다.")
+
+        record = _json_record(data, converters, field_map)
+        if record is not None:
+            yield record
+
+def _json_record(data, converters, field_map):
+    record = dict.fromkeys(field_map.fields)
+    populated = False
+    for key, converter in converters.items():
+        value = data.get(key)
+        if value is None or value == '':
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if converter is not None:
+                value = converter(value)
+        record[key] = value
+        populated = True
+    return record if populated else None
+
+def iter_json_records(rows, field_map):
+    """
+    JSON에서 읽은 행 목록(항목 이름 -> 값 객체)을 JSON-lines 파일과 같은 방식으로 바꾸는 제너레이터입니다.
+
+    Parameters:
+        rows (list[dict]): 행마다 항목 이름 -> 값
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Yields:
+        dict: 값이 있는 행마다 key -> 값 (목록 순서대로)
+    """
+    converters = {key: _text_converter(field) for key, field in field_map.fields.items()}
+    for data in rows:
+        record = _json_record(data, converters, field_map)
+        if record is not None:
+            yield record
+
+def _iter_xlsx_field_records(xlsx_file, field_map):
+    return iter_xlsx_records(xlsx_file, field_map.columns)
+
+# 입력 파일 확장자 -> 읽기 함수 (source, field_map) -> 행별 값 제너레이터
+READERS = {
+    '.xlsx': _iter_xlsx_field_records,
+    '.csv': iter_csv_records,
+    '.jsonl': iter_jsonl_records,
+    '.ndjson': iter_jsonl_records,
+}
+
+def register_reader(extension, reader):
+    """
+    새로운 입력 형식의 읽기 함수를 등록합니다.
+
+    Parameters:
+        extension (str): 파일 확장자 (예: '.tsv')
+        reader (callable): reader(source, field_map)로 호출하면 행별 값(dict)을 돌려주는 함수
+    """
+    READERS[extension.lower()] = reader
+
+def is_input_file(filename):
+    """
+    읽을 수 있는 입력 파일인지 확인합니다. ('~$'로 시작하는 엑셀 잠금 파일은 제외합니다.)
+    """
+    return not filename.startswith('~$') and os.path.splitext(filename)[1].lower() in READERS
+
+def iter_records(source, field_map, input_format=None):
+    """
+    입력 형식에 맞는 읽기 함수로 행별 값을 돌려주는 제너레이터입니다.
+
+    Parameters:
+        source (str | file): 입력 파일 경로 또는 읽기용 바이너리 파일 객체
+        field_map (FieldMap): config 파일의 항목 설정
+        input_format (str): 입력 형식 확장자 (예: '.csv', None이면 경로의 확장자, 파일 객체이면 '.xlsx')
+
+    Yields:
+        dict: 행마다 key -> 값
+
+    Raises:
+        ValueError: 읽을 수 없는 형식인 경우
+    """
+    if input_format is None:
+        name = source if isinstance(source, str) else getattr(source, 'name', '')
+        input_format = os.path.splitext(name)[1] if isinstance(name, str) and name else '.xlsx'
+
+    input_format = input_format.lower()
+    if not input_format.startswith('.'):
+        input_format = '.' + input_format
+
+    reader = READERS.get(input_format)
+    if reader is None:
+        raise ValueError(f"'{input_format}' 형식의 입력 파일은 읽을 수 없습니다. (읽을 수 있는 형식: {', '.join(READERS)})")
+
+    return reader(source, field_map)
+
+def read_records(source, field_map, input_format=None):
+    """
+    iter_records()로 읽은 행별 값 목록을 리턴하는 함수입니다.
+    """
+    return list(iter_records(source, field_map, input_format))
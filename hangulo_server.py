@@ -0,0 +1,409 @@
+import io
+import sys
+import json
+import time
+import bisect
+import zipfile
+import argparse
+import ipaddress
+import threading
+from urllib.parse import parse_qs, quote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from hwpx_template import template_cache
+from hangulo_config import CONFIG_FILE, load_field_map
+from hangulo_readers import group_records, iter_json_records, iter_records, read_records
+from hangulo_core import INVALID_FILENAME_PATTERN, write_document_to
+
+# 기본 주소 (이 컴퓨터에서만 접속할 수 있습니다.)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 변환에 사용할 기본 스레드 수
+DEFAULT_WORKERS = 4
+
+# 받을 수 있는 최대 요청 크기 (byte)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# 응답 시간 히스토그램 구간 (ms)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+HWPX_CONTENT_TYPE = 'application/hwp+zip'
+
+# 요청 수를 따로 모으는 경로 (그 밖의 경로는 'other' 하나로 모읍니다.)
+METRICS_ENDPOINTS = ('/convert', '/batch', '/metrics', '/health')
+
+# 요청 본문 Content-Type -> 입력 형식 (없는 Content-Type은 xlsx로 봅니다.)
+INPUT_FORMATS = {
+    'text/csv': '.csv',
+    'application/x-ndjson': '.jsonl',
+    'application/jsonl': '.jsonl',
+}
+
+class ServiceMetrics:
+    """
+    요청 수, 오류 수, 응답 시간 히스토그램, 작업 대기열 길이를 모으는 클래스입니다.
+    """
+
+    def __init__(self):
+        self.start_time = time.monotonic()
+        self.queued = 0
+        self.running = 0
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def job_queued(self):
+        with self._lock:
+            self.queued += 1
+
+    def job_started(self):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+
+    def job_finished(self):
+        with self._lock:
+            self.running -= 1
+
+    def record(self, endpoint, status, seconds):
+        """
+        요청 하나의 결과를 기록합니다.
+
+        Parameters:
+            endpoint (str): 요청 경로 (예: '/convert')
+            status (int): HTTP 상태 코드
+            seconds (float): 응답 시간 (초)
+        """
+        milliseconds = seconds * 1000
+        with self._lock:
+            metrics = self.endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self.endpoints[endpoint] = {
+                    'count': 0,
+                    'errors': 0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    'sum_ms': 0.0,
+                }
+            metrics['count'] += 1
+            if status >= 400:
+                metrics['errors'] += 1
+            metrics['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+            metrics['sum_ms'] += milliseconds
+
+    def to_dict(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, metrics in self.endpoints.items():
+                # 누적 히스토그램 (응답 시간이 le ms 이하인 요청 수)
+                buckets = {}
+                total = 0
+                for bound, count in zip(LATENCY_BUCKETS_MS + ('+Inf',), metrics['buckets']):
+                    total += count
+                    buckets[str(bound)] = total
+                endpoints[endpoint] = {
+                    'count': metrics['count'],
+                    'errors': metrics['errors'],
+                    'latency_ms': {
+                        'buckets': buckets,
+                        'sum': round(metrics['sum_ms'], 3),
+                        'mean': round(metrics['sum_ms'] / metrics['count'], 3),
+                    },
+                }
+
+            return {
+                'uptime_seconds': round(time.monotonic() - self.start_time, 3),
+                'queue_depth': self.queued,
+                'in_flight': self.running,
+                'endpoints': endpoints,
+            }
+
+class ConversionService:
+    """
+    HTTP 요청으로 받은 값을 Hwpx 파일로 변환하는 클래스입니다.
+
+    변환은 계속 띄워 둔 스레드 풀에서 실행하므로, 모든 요청이 한 프로세스의 템플릿 캐시와 설정을 함께 사용합니다.
+    동시에 workers개보다 많은 요청이 오면 나머지는 대기열에서 기다립니다.
+    """
+
+    def __init__(self, template_directory='', config_file=CONFIG_FILE, workers=DEFAULT_WORKERS):
+        self.template_directory = template_directory
+        self.config_file = config_file
+        self.workers = workers
+        self.metrics = ServiceMetrics()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hangulo-worker')
+
+        # 설정 파일은 시작할 때 한 번 검증합니다.
+        load_field_map(config_file)
+
+    def _run(self, function, *args):
+        self.metrics.job_started()
+        try:
+            return function(*args)
+        finally:
+            self.metrics.job_finished()
+
+    def submit(self, function, *args):
+        """
+        작업을 스레드 풀에 넣고 Future를 리턴합니다.
+        """
+        self.metrics.job_queued()
+        return self.executor.submit(self._run, function, *args)
+
+    def render(self, records):
+        """
+        행별 값으로 Hwpx 파일 내용을 만듭니다. (스레드 풀에서 실행됩니다.)
+
+        Returns:
+            bytes: Hwpx 파일 내용
+        """
+        field_map = load_field_map(self.config_file)
+        buffer = io.BytesIO()
+        write_document_to(records, buffer, self.template_directory, field_map)
+        return buffer.getvalue()
+
+    def read_documents(self, body, content_type, split_by=None):
+        """
+        요청 본문에서 문서 목록을 읽는 함수입니다. (스레드 풀에서 실행됩니다.)
+
+        JSON 본문은 {"rows": [...]} (문서 하나), 행 목록 (문서 하나),
+        또는 {"documents": [{"name": ..., "rows": [...]}, ...]} (여러 문서) 형식이며, 값은 JSON-lines와 같은 방식으로 바꿉니다.
+        text/csv는 CSV, application/x-ndjson은 JSON-lines, 그 밖의 본문은 xlsx 파일로 보고, split_by가 있으면 그 항목 값별로 문서를 나눕니다.
+
+        Returns:
+            list[tuple[str, list[dict]]]: (문서 이름, 행별 값 목록)
+
+        Raises:
+            ValueError: 본문을 읽을 수 없는 경우
+        """
+        field_map = load_field_map(self.config_file)
+        media_type = content_type.split(';')[0].strip().lower()
+
+        if media_type == 'application/json':
+            try:
+                data = json.loads(body.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError) as e:
+                raise ValueError(f"JSON 본문을 읽을 수 없습니다. 오류: {e}")
+
+            if isinstance(data, list):
+                documents = [{'rows': data}]
+            elif isinstance(data, dict) and 'documents' in data:
+                documents = data['documents']
+            elif isinstance(data, dict) and 'rows' in data:
+                documents = [data]
+            else:
+                raise ValueError("JSON 본문에 'rows' 또는 'documents'가 없습니다.")
+
+            result = []
+            for index, document in enumerate(documents, 1):
+                rows = document.get('rows') if isinstance(document, dict) else None
+                if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                    raise ValueError(f"{index}번째 문서의 'rows'는 항목 이름 -> 값 객체의 목록이어야 합니다.")
+                result.append((str(document.get('name') or f'document-{index}'), list(iter_json_records(rows, field_map))))
+            return result
+
+        input_format = INPUT_FORMATS.get(media_type, '.xlsx')
+        try:
+            if split_by:
+                if split_by not in field_map.fields:
+                    raise ValueError(f"문서를 나눌 '{split_by}' 항목이 config.ini 파일의 [Section1]에 존재하지 않습니다.")
+                records = iter_records(io.BytesIO(body), field_map, input_format)
+                return [(str(value), group) for value, group in group_records(records, split_by)]
+            return [('document', read_records(io.BytesIO(body), field_map, input_format))]
+        except (zipfile.BadZipFile, KeyError, OSError) as e:
+            raise ValueError(f"{input_format[1:]} 파일을 읽을 수 없습니다. 오류: {e}")
+
+    def convert(self, body, content_type):
+        """
+        문서 하나를 변환합니다.
+
+        Returns:
+            tuple[str, bytes]: (문서 이름, Hwpx 파일 내용)
+        """
+        documents = self.submit(self.read_documents, body, content_type).result()
+        if len(documents) != 1:
+            raise ValueError("/convert는 문서 하나만 변환합니다. 여러 문서는 /batch를 사용하세요.")
+
+        name, records = documents[0]
+        if not records:
+            raise ValueError("값이 있는 행이 없어 변환할 수 없습니다.")
+
+        return name, self.submit(self.render, records).result()
+
+    def convert_batch(self, body, content_type, split_by=None):
+        """
+        여러 문서를 변환해 zip 파일 하나로 묶습니다. 값이 있는 행이 없는 문서는 skipped.json에 기록합니다.
+
+        Returns:
+            bytes: zip 파일 내용
+        """
+        documents = self.submit(self.read_documents, body, content_type, split_by).result()
+
+        # 문서들을 한꺼번에 스레드 풀에 넣고, 넣은 순서대로 zip에 담습니다.
+        futures = []
+        skipped = []
+        for name, records in documents:
+            if records:
+                futures.append((name, self.submit(self.render, records)))
+            else:
+                skipped.append(name)
+
+        if not futures:
+            raise ValueError("값이 있는 행이 있는 문서가 없어 변환할 수 없습니다.")
+
+        buffer = io.BytesIO()
+        used_names = set()
+        # Hwpx 파일은 이미 압축되어 있으므로 다시 압축하지 않습니다.
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+            for name, future in futures:
+                filename = INVALID_FILENAME_PATTERN.sub('_', name)
+                if filename in used_names:
+                    suffix = 2
+                    while f'{filename}_{suffix}' in used_names:
+                        suffix += 1
+                    filename = f'{filename}_{suffix}'
+                used_names.add(filename)
+                archive.writestr(f'{filename}.hwpx', future.result())
+            if skipped:
+                archive.writestr('skipped.json', json.dumps(skipped, ensure_ascii=False))
+
+        return buffer.getvalue()
+
+    def metrics_dict(self):
+        metrics = self.metrics.to_dict()
+        metrics['workers'] = self.workers
+        metrics['template_cache'] = template_cache.stats()
+        return metrics
+
+    def close(self):
+        self.executor.shutdown()
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /convert, POST /batch, GET /metrics 요청을 처리합니다.
+    """
+    server_version = 'hangulo'
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def _send_json(self, status, data):
+        return self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ValueError("요청 본문이 비어 있습니다.")
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"요청 본문이 너무 큽니다. (최대 {MAX_BODY_BYTES} byte)")
+        return self.rfile.read(length)
+
+    def _attachment(self, filename):
+        return {'Content-Disposition': f"attachment; filename*=UTF-8''{quote(filename)}"}
+
+    def _handle(self, method):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        status = 500
+        try:
+            if method == 'GET' and url.path == '/metrics':
+                status = self._send_json(200, self.service.metrics_dict())
+            elif method == 'GET' and url.path == '/health':
+                status = self._send_json(200, {'status': 'ok'})
+            elif method == 'POST' and url.path == '/convert':
+                name, data = self.service.convert(self._read_body(), self.headers.get('Content-Type', ''))
+                status = self._send(200, data, HWPX_CONTENT_TYPE, self._attachment(f'{name}.hwpx'))
+            elif method == 'POST' and url.path == '/batch':
+                split_by = query.get('split_by', [None])[0] or load_field_map(self.service.config_file).group_key
+                data = self.service.convert_batch(self._read_body(), self.headers.get('Content-Type', ''), split_by)
+                status = self._send(200, data, 'application/zip', self._attachment('hangulo.zip'))
+            else:
+                status = self._send_json(404, {'error': f'{method} {url.path}을(를) 찾을 수 없습니다.'})
+        except ValueError as e:
+            status = self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            status = self._send_json(500, {'error': f'{type(e).__name__}: {e}'})
+        finally:
+            endpoint = url.path if url.path in METRICS_ENDPOINTS else 'other'
+            self.service.metrics.record(endpoint, status, time.perf_counter() - start)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"{self.address_string()} - {format % args}\n")
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, template_directory='', config_file=CONFIG_FILE,
+                  workers=DEFAULT_WORKERS):
+    """
+    변환 서버를 만드는 함수입니다. (serve_forever()로 실행합니다.)
+
+    Parameters:
+        host (str): 접속을 받을 주소 (이 컴퓨터의 주소만 사용할 수 있습니다.)
+        port (int): 포트 번호 (0이면 비어 있는 포트)
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        workers (int): 변환에 사용할 스레드 수
+
+    Returns:
+        ThreadingHTTPServer: 서버 (service 속성에 ConversionService)
+
+    Raises:
+        ValueError: host가 이 컴퓨터의 주소가 아닌 경우
+    """
+    if host != 'localhost':
+        try:
+            loopback = ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise ValueError(f"변환 서버는 이 컴퓨터에서만 사용할 수 있습니다. (host: {host}, 예: 127.0.0.1)")
+
+    server = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+    server.daemon_threads = True
+    server.service = ConversionService(template_directory, config_file, workers)
+    return server
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='xlsx, CSV, JSON-lines 파일이나 JSON 값을 Hwpx 파일로 변환하는 로컬 HTTP 서버를 실행합니다.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'접속을 받을 주소 (기본값: {DEFAULT_HOST})')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT, help=f'포트 번호 (기본값: {DEFAULT_PORT})')
+    parser.add_argument('-t', '--templates', dest='template_directory', default='', help='template-tax-N.hwpx 파일이 있는 디렉토리 (기본값: 현재 디렉토리)')
+    parser.add_argument('-c', '--config', dest='config_file', default=CONFIG_FILE, help='설정 파일 경로 (기본값: config.ini)')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS, help=f'변환에 사용할 스레드 수 (기본값: {DEFAULT_WORKERS})')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        server = create_server(args.host, args.port, args.template_directory, args.config_file, args.workers)
+    except (ValueError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"Serving on http://{args.host}:{server.server_address[1]} (Ctrl+C로 종료)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,400 @@
+import io
+import os
+import re
+import json
+import codecs
+import time
+import tarfile
+import datetime
+import zipfile
+import threading
+import xml.etree.ElementTree as ElementTree
+from collections import Counter, namedtuple
+from xml.sax.saxutils import unescape
+from concurrent.futures import ProcessPoolExecutor
+from hwpx_writer import SECTION_NAME
+from hangulo_config import CONFIG_FILE, TOTAL_KEY, load_field_map
+from hangulo_readers import group_records, iter_records
+from hangulo_numerals import number_to_korean_amount
+from hangulo_core import BUNDLE_MODES, group_output_name, select_template, shard_name, worker_initializer
+
+# 문서의 합계 표기 (TAX_TOTAL_AMOUNT: '283,200원', TAX_TOTAL_AMOUNT_STR: '283,200원(금이십팔만삼천이백원정)')
+TOTAL_AMOUNT_PATTERN = re.compile(r'(\d[\d,]*)원')
+TOTAL_AMOUNT_STR_PATTERN = re.compile(r'(\d[\d,]*)원\((.*)\)')
+
+# section0.xml을 읽는 단위 (byte)
+SECTION_CHUNK_SIZE = 64 * 1024
+
+# 불일치 종류
+# missing_output: Hwpx 파일이 없음, xml_error: section0.xml을 읽을 수 없음 (예: 값의 '&', '<'),
+# layout_mismatch: 템플릿의 고정 문자열이 문서에 없어 값의 위치를 찾을 수 없음,
+# unreplaced_placeholder: 채워지지 않은 '%key%', invalid_value: 입력 값이 항목 형식에 맞지 않음,
+# value_mismatch: 자리의 값이 그 행의 입력 값과 다름 (빠지거나 다른 자리/행의 값이 들어감),
+# total_mismatch: 계의 합계가 문서의 합계와 다름
+MISMATCH_KINDS = ('missing_output', 'xml_error', 'layout_mismatch', 'unreplaced_placeholder', 'invalid_value',
+                  'value_mismatch', 'total_mismatch')
+
+# 불일치 하나
+# document: Hwpx 파일 이름, source: 입력 파일 이름, key: 항목 이름 (없으면 None),
+# row: 문서 안의 행 번호 (0부터, 문서 전체에 해당하면 None),
+# expected: 입력 파일의 값, found: 문서에서 읽은 값
+Mismatch = namedtuple('Mismatch', ['document', 'source', 'kind', 'key', 'row', 'expected', 'found'])
+
+# 문서 하나를 확인한 결과 (mismatches가 비어 있으면 일치)
+DocumentCheck = namedtuple('DocumentCheck', ['document', 'source', 'mismatches'])
+
+def extract_slot_values(section_xml, template):
+    """
+    문서의 section0.xml에서 템플릿의 자리표시자 자리마다 들어간 값을 읽는 함수입니다.
+
+    템플릿의 고정 문자열 조각을 앞에서부터 차례로 찾아, 조각 사이의 문자열을 그 자리의 값으로 봅니다.
+    값은 XML 이스케이프되어 있어 '<'를 포함하지 않으므로, '<'로 시작하는 조각의 첫 위치가 값의 끝입니다.
+
+    Parameters:
+        section_xml (str): 문서의 section0.xml 내용
+        template (CompiledTemplate): 문서를 만들 때 사용한 템플릿
+
+    Returns:
+        list[tuple[str, int, str]]: 자리마다 (key, 몇 번째 등장인지, 이스케이프를 푼 값) (문서 순서)
+
+    Raises:
+        ValueError: 템플릿의 고정 문자열을 문서에서 찾을 수 없는 경우
+    """
+    segments = template.segments
+    if not section_xml.startswith(segments[0]):
+        raise ValueError("문서의 시작 부분이 템플릿과 다릅니다.")
+
+    values = []
+    position = len(segments[0])
+    last = len(template.slots) - 1
+    for index, (key, occurrence) in enumerate(template.slots):
+        segment = segments[index + 1]
+        if index == last:
+            end = len(section_xml) - len(segment)
+            if end < position or not section_xml.endswith(segment):
+                raise ValueError(f"'%{key}%' 뒤의 문서 끝 부분이 템플릿과 다릅니다.")
+        elif not segment:
+            raise ValueError(f"'%{key}%' 바로 뒤에 다른 자리표시자가 있어 값을 나눌 수 없습니다.")
+        else:
+            end = section_xml.find(segment, position)
+            if end < 0:
+                raise ValueError(f"'%{key}%'({occurrence + 1}번째) 뒤의 고정 문자열을 문서에서 찾을 수 없습니다.")
+
+        values.append((key, occurrence, unescape(section_xml[position:end])))
+        position = end + len(segment)
+
+    return values
+
+def _parse_amount(text):
+    # 문서의 '40,400' 형식 금액을 정수로 읽습니다. (읽을 수 없으면 None)
+    digits = text.replace(',', '')
+    return int(digits) if digits.isdigit() else None
+
+def _expected_value(field, value):
+    """
+    입력 값을 문서에서 읽은 값과 비교할 형태로 바꿉니다. (금액은 int, 날짜는 date, 나머지는 str)
+
+    Raises:
+        ValueError: 입력 값이 항목 형식에 맞지 않는 경우
+    """
+    if field.type == 'amount':
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            return int(value)
+        raise ValueError(value)
+    if field.type == 'date' and isinstance(value, datetime.datetime):
+        return value.date()
+    if field.type == 'date' and isinstance(value, datetime.date):
+        return value
+    return str(value)
+
+def _found_value(field, text):
+    # 문서에서 읽은 값을 _expected_value()와 같은 형태로 읽습니다. (읽을 수 없으면 문자열 그대로)
+    if field.type == 'amount':
+        amount = _parse_amount(text)
+        return text if amount is None else amount
+    if field.type == 'date':
+        try:
+            return datetime.datetime.strptime(text, field.format).date()
+        except ValueError:
+            return text
+    return text
+
+def reconcile(name, source, section_xml, records, template, field_map):
+    """
+    문서의 자리마다 들어간 값을 읽어 입력 파일의 같은 행, 같은 항목 값과 하나씩 대조하는 함수입니다.
+
+    n번째로 등장하는 '%key%' 자리에는 n번째 행의 값이 들어가야 합니다. 금액은 숫자로, 날짜는 날짜로 읽어
+    비교하므로 문서의 서식과 관계없이 값이 다른 자리, 다른 행의 값이 들어간 자리를 찾습니다.
+    합계는 모든 행의 계를 더한 값과 문서의 숫자 금액을, 그 값을 한글로 바꾼 표기와 문서의 한글 금액을 비교합니다.
+    입력 값이 비어 있는 텍스트 항목은 대조하지 않습니다.
+
+    Parameters:
+        name (str): Hwpx 파일 이름
+        source (str): 입력 파일 이름
+        section_xml (str): 문서의 section0.xml 내용
+        records (list[dict]): 문서를 만든 행별 값 목록
+        template (CompiledTemplate): 문서를 만들 때 사용한 템플릿 (자리의 위치를 찾는 데만 사용합니다.)
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Returns:
+        list[Mismatch]: 불일치 목록
+    """
+    try:
+        slot_values = extract_slot_values(section_xml, template)
+    except ValueError as e:
+        return [Mismatch(name, source, 'layout_mismatch', None, None, None, str(e))]
+
+    mismatches = []
+    total_amount = 0
+    for record in records:
+        amount = record.get(TOTAL_KEY)
+        if isinstance(amount, int) or (isinstance(amount, str) and amount.isdigit()):
+            total_amount += int(amount)
+
+    for key, row, found in slot_values:
+        if found == f'%{key}%':
+            mismatches.append(Mismatch(name, source, 'unreplaced_placeholder', key, row, None, found))
+            continue
+
+        if key == 'TAX_TOTAL_AMOUNT':
+            match = TOTAL_AMOUNT_PATTERN.fullmatch(found)
+            if match is None or _parse_amount(match.group(1)) != total_amount:
+                mismatches.append(Mismatch(name, source, 'total_mismatch', key, None, total_amount, found))
+            continue
+        if key == 'TAX_TOTAL_AMOUNT_STR':
+            # 한글 금액은 '구'가 숫자 9와 큰 단위(10^32)에 함께 쓰여 거꾸로 읽을 수 없으므로, 합계를 한글로 바꿔 비교합니다.
+            match = TOTAL_AMOUNT_STR_PATTERN.fullmatch(found)
+            if (match is None or _parse_amount(match.group(1)) != total_amount
+                    or match.group(2) != number_to_korean_amount(total_amount)):
+                mismatches.append(Mismatch(name, source, 'total_mismatch', key, None, total_amount, found))
+            continue
+
+        field = field_map.fields.get(key)
+        if field is None:
+            continue
+        value = records[row].get(key) if row < len(records) else None
+        if value is None or value == '':
+            if field.type != 'text':
+                mismatches.append(Mismatch(name, source, 'invalid_value', key, row, None, found))
+            continue
+        try:
+            expected = _expected_value(field, value)
+        except ValueError:
+            mismatches.append(Mismatch(name, source, 'invalid_value', key, row, str(value), found))
+            continue
+
+        if _found_value(field, found) != expected:
+            mismatches.append(Mismatch(name, source, 'value_mismatch', key, row, str(expected), found))
+
+    return mismatches
+
+# 작업 프로세스마다 열어 둔 묶음 파일 (경로 -> (수정 시각, 이름으로 내용을 읽는 함수, 열린 묶음))
+_bundles = {}
+_bundles_lock = threading.Lock()
+
+def _bundle_reader(bundle_file):
+    mtime = os.stat(bundle_file).st_mtime_ns
+    with _bundles_lock:
+        cached = _bundles.get(bundle_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        # tar 안의 Hwpx 파일도 zip이므로 tar인지 먼저 확인합니다.
+        if tarfile.is_tarfile(bundle_file):
+            archive = tarfile.open(bundle_file)
+            # 이름 -> 항목 (tarfile.getmember()는 매번 전체 목록을 검색하므로 한 번만 만듭니다.)
+            members = {member.name: member for member in archive.getmembers()}
+            reader = lambda name: archive.extractfile(members[name]).read() if name in members else None
+        else:
+            archive = zipfile.ZipFile(bundle_file)
+            names = set(archive.namelist())
+            reader = lambda name: archive.read(name) if name in names else None
+
+        if cached is not None:
+            cached[2].close()
+        _bundles[bundle_file] = (mtime, reader, archive)
+        return reader
+
+def _open_document(output_location, name, output_mode):
+    """Hwpx 파일 내용을 읽을 바이너리 파일 객체를 리턴합니다. (없으면 None)"""
+    if output_mode in BUNDLE_MODES:
+        data = _bundle_reader(output_location)(name)
+        return io.BytesIO(data) if data is not None else None
+
+    if output_mode == 'sharded':
+        path = os.path.join(output_location, shard_name(name), name)
+    else:
+        path = os.path.join(output_location, name)
+    try:
+        return open(path, 'rb')
+    except FileNotFoundError:
+        return None
+
+def _read_section(package):
+    """
+    section0.xml을 한 번 읽으면서 XML이 깨지지 않았는지(값의 '&', '<' 등) 확인하고 문자열로 리턴합니다.
+
+    Raises:
+        ElementTree.ParseError: XML이 올바르지 않은 경우
+        UnicodeDecodeError: UTF-8이 아닌 경우
+    """
+    parser = ElementTree.XMLPullParser(events=('end',))
+    decoder = codecs.getincrementaldecoder('UTF-8')()
+    parts = []
+    with package.open(SECTION_NAME) as section:
+        for chunk in iter(lambda: section.read(SECTION_CHUNK_SIZE), b''):
+            parser.feed(chunk)
+            # 끝난 요소의 내용은 필요 없으므로 비워 문서 크기만큼 트리가 쌓이지 않게 합니다.
+            for _, element in parser.read_events():
+                element.clear()
+            parts.append(decoder.decode(chunk))
+    parser.close()
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts)
+
+def check_document(name, source, records, output_location, output_mode, template_directory, field_map):
+    """
+    Hwpx 문서 하나를 열어 입력 값과 대조하는 함수입니다.
+
+    Parameters:
+        name (str): Hwpx 파일 이름
+        source (str): 입력 파일 이름
+        records (list[dict]): 문서를 만든 행별 값 목록
+        output_location (str): 출력 디렉토리 (묶음이면 묶음 파일 경로)
+        output_mode (str): 출력 방식 ('files', 'sharded', 'zip', 'tar')
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        field_map (FieldMap): config 파일의 항목 설정
+
+    Returns:
+        DocumentCheck: 확인 결과
+    """
+    document_file = _open_document(output_location, name, output_mode)
+    if document_file is None:
+        return DocumentCheck(name, source, [Mismatch(name, source, 'missing_output', None, None, name, None)])
+
+    try:
+        with document_file, zipfile.ZipFile(document_file) as package:
+            section_xml = _read_section(package)
+    except (ElementTree.ParseError, zipfile.BadZipFile, KeyError, UnicodeDecodeError) as e:
+        return DocumentCheck(name, source, [Mismatch(name, source, 'xml_error', None, None, None, str(e))])
+
+    _, template_pack = select_template(len(records), template_directory, field_map)
+    return DocumentCheck(name, source, reconcile(name, source, section_xml, records, template_pack.template, field_map))
+
+def verify_file(file_path, output_location, output_mode='files', template_directory='', config_file=CONFIG_FILE, group_key=None):
+    """
+    입력 파일 하나로 만든 Hwpx 문서들을 확인하는 함수입니다. (문서 이름은 변환할 때와 같은 방법으로 정합니다.)
+
+    Parameters:
+        file_path (str): 입력 파일 경로
+        output_location (str): 출력 디렉토리 (묶음이면 묶음 파일 경로)
+        output_mode (str): 출력 방식 ('files', 'sharded', 'zip', 'tar')
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        group_key (str): 문서를 나눌 key (None이면 입력 파일 하나가 문서 하나)
+
+    Returns:
+        list[DocumentCheck]: 문서별 확인 결과 (값이 있는 행이 없어 변환하지 않은 파일은 빈 목록)
+    """
+    filename = os.path.basename(file_path)
+    gen_hwpx_file_name = os.path.splitext(filename)[0]
+    field_map = load_field_map(config_file)
+
+    records = iter_records(file_path, field_map)
+    if group_key:
+        used_names = set()
+        documents = ((f'{group_output_name(gen_hwpx_file_name, group_value, used_names)}.hwpx', list(group))
+                     for group_value, group in group_records(records, group_key))
+    else:
+        documents = [(f'{gen_hwpx_file_name}.hwpx', list(records))]
+
+    return [check_document(name, filename, group, output_location, output_mode, template_directory, field_map)
+            for name, group in documents if group]
+
+def verify_outputs(file_paths, output_location, output_mode='files', template_directory='', config_file=CONFIG_FILE,
+                   workers=1, group_key=None, executor=None):
+    """
+    변환한 Hwpx 문서들을 다시 열어 입력 파일의 값, 계의 합계와 대조하는 제너레이터입니다.
+
+    workers가 2 이상이면 여러 프로세스에 입력 파일을 나누어 확인합니다. 각 문서의 section0.xml은
+    XML이 올바른지 확인한 뒤 템플릿의 자리마다 들어간 값을 읽어 행별, 항목별로 입력 값과 대조하고,
+    채워지지 않은 자리표시자, 다른 값이나 다른 행의 값이 들어간 자리, 합계 불일치를 찾습니다.
+
+    Parameters:
+        file_paths (list[str]): 변환한 입력 파일 경로 목록
+        output_location (str): 출력 디렉토리 (묶음이면 묶음 파일 경로)
+        output_mode (str): 출력 방식 ('files', 'sharded', 'zip', 'tar')
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        workers (int): 사용할 프로세스 수
+        group_key (str): 문서를 나눌 key (None이면 입력 파일 하나가 문서 하나)
+        executor (Executor): 계속 띄워 둔 프로세스 풀 (있으면 workers 대신 이 풀을 사용하고 닫지 않습니다.)
+
+    Yields:
+        DocumentCheck: 문서별 확인 결과 (입력 순서)
+    """
+    count = len(file_paths)
+    arguments = (file_paths, [output_location] * count, [output_mode] * count, [template_directory] * count,
+                 [config_file] * count, [group_key] * count)
+
+    if executor is None and (workers <= 1 or count <= 1):
+        for checks in map(verify_file, *arguments):
+            yield from checks
+        return
+
+    # 파일 하나는 금방 확인하므로 여러 파일을 한 번에 넘겨 프로세스 간 통신을 줄입니다.
+    chunksize = max(1, count // ((workers if executor is None else 1) * 4))
+    if executor is not None:
+        for checks in executor.map(verify_file, *arguments, chunksize=chunksize):
+            yield from checks
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, count), initializer=worker_initializer()) as executor:
+        for checks in executor.map(verify_file, *arguments, chunksize=chunksize):
+            yield from checks
+
+class VerificationReport:
+    """
+    문서별 확인 결과를 모아 불일치 리포트(JSON)를 만드는 클래스입니다.
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.documents = 0
+        self.mismatched_documents = 0
+        self.mismatches = []
+
+    def add(self, check):
+        """
+        문서 하나의 확인 결과를 추가합니다.
+
+        Parameters:
+            check (DocumentCheck): 확인 결과
+        """
+        self.documents += 1
+        if check.mismatches:
+            self.mismatched_documents += 1
+            self.mismatches.extend(check.mismatches)
+
+    def to_dict(self, include_mismatches=True):
+        elapsed_seconds = time.perf_counter() - self.start_time
+        report = {
+            'documents': self.documents,
+            'mismatched_documents': self.mismatched_documents,
+            'kinds': dict(Counter(mismatch.kind for mismatch in self.mismatches)),
+            'elapsed_seconds': round(elapsed_seconds, 3),
+            'documents_per_second': round(self.documents / elapsed_seconds, 3) if elapsed_seconds else None,
+        }
+        if include_mismatches:
+            report['mismatches'] = [mismatch._asdict() for mismatch in self.mismatches]
+        return report
+
+    def write(self, report_file):
+        """
+        리포트를 JSON 파일로 저장합니다.
+
+        Parameters:
+            report_file (str): 저장할 파일 경로
+        """
+        with open(report_file, 'wt', encoding='UTF-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
@@ -0,0 +1,201 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from hangulo_config import CONFIG_FILE, load_field_map
+from hangulo_core import BUNDLE_MODES, ConversionRun, find_output_name_collisions, resolve_output_directory, worker_initializer
+from hangulo_readers import is_input_file
+
+# 폴더를 다시 확인하는 간격 (초)
+POLL_INTERVAL = 1.0
+
+# 파일 크기와 수정 시각이 이 시간 동안 바뀌지 않아야 다 쓰인 것으로 봅니다. (초)
+SETTLE_SECONDS = 2.0
+
+class FolderWatcher:
+    """
+    입력 디렉토리를 주기적으로 확인해 새로 들어오거나 바뀐 입력 파일(xlsx, CSV, JSON-lines)을 찾는 클래스입니다.
+
+    복사 중이거나 엑셀에서 저장 중인 파일은 크기와 수정 시각이 settle_seconds 동안 그대로일 때까지 기다립니다.
+    """
+
+    def __init__(self, input_directory, settle_seconds=SETTLE_SECONDS):
+        self.input_directory = input_directory
+        self.settle_seconds = settle_seconds
+
+        # 파일 이름 -> (크기, 수정 시각, 처음 그 상태를 본 시각)
+        self._pending = {}
+
+        # 파일 이름 -> 처리한 때의 (크기, 수정 시각)
+        self._done = {}
+
+    def input_files(self):
+        """
+        입력 디렉토리에 지금 있는 입력 파일의 크기와 수정 시각을 리턴합니다. (다 쓰였는지와 관계없이 모든 파일)
+
+        Returns:
+            dict: 파일 이름 -> (크기, 수정 시각)
+        """
+        stats = {}
+        with os.scandir(self.input_directory) as entries:
+            for entry in entries:
+                # '~$'로 시작하는 엑셀 잠금 파일은 is_input_file()에서 제외합니다.
+                if not is_input_file(entry.name) or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                stats[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def poll(self, now=None):
+        """
+        다 쓰인 새 파일이나 바뀐 파일의 경로 목록을 리턴합니다. (이름 순)
+
+        Parameters:
+            now (float): 현재 시각 (time.monotonic() 기준, None이면 지금)
+
+        Returns:
+            list[str]: 변환할 입력 파일 경로 목록
+        """
+        now = time.monotonic() if now is None else now
+        stats = self.input_files()
+
+        ready = []
+        for name, state in sorted(stats.items()):
+            if self._done.get(name) == state:
+                continue
+
+            pending = self._pending.get(name)
+            if pending is None or pending[:2] != state:
+                self._pending[name] = state + (now,)
+                continue
+
+            if now - pending[2] >= self.settle_seconds:
+                ready.append(os.path.join(self.input_directory, name))
+
+        # 사라진 파일은 잊습니다. (다시 들어오면 새 파일로 봅니다.)
+        for name in list(self._pending):
+            if name not in stats:
+                del self._pending[name]
+        for name in list(self._done):
+            if name not in stats:
+                del self._done[name]
+
+        return ready
+
+    def mark_done(self, file_path):
+        """
+        파일을 처리했다고 기록합니다. 내용이 바뀌기 전까지는 다시 돌려주지 않습니다.
+
+        Parameters:
+            file_path (str): 처리한 입력 파일 경로
+        """
+        name = os.path.basename(file_path)
+        pending = self._pending.pop(name, None)
+        if pending is not None:
+            self._done[name] = pending[:2]
+
+def watch_folder(input_directory, output_directory=None, template_directory='', config_file=CONFIG_FILE,
+                 workers=None, group_key=None, poll_interval=POLL_INTERVAL, settle_seconds=SETTLE_SECONDS,
+                 on_result=None, stop_event=None, output_mode=None):
+    """
+    입력 디렉토리에 들어오는 입력 파일을 계속 Hwpx 파일로 변환하는 함수입니다.
+
+    템플릿 캐시, 설정, 프로세스 풀을 파일마다 새로 만들지 않고 계속 유지합니다.
+    출력 디렉토리의 변환 기록을 사용하므로 다시 시작해도 이미 변환한 파일은 건너뜁니다.
+    변환할 수 없는 파일은 내용이 바뀔 때까지 다시 시도하지 않습니다.
+
+    Parameters:
+        input_directory (str): 감시할 디렉토리
+        output_directory (str): Hwpx 파일을 저장할 디렉토리 (None이면 설정 파일 값, 그것도 없으면 입력 디렉토리)
+        template_directory (str): template-tax-N.hwpx 파일이 있는 디렉토리
+        config_file (str): 설정 파일 경로
+        workers (int): 사용할 프로세스 수 (None이면 설정 파일 값, 0이면 CPU 코어 수)
+        group_key (str): 입력 파일 하나를 여러 문서로 나눌 key (None이면 설정 파일 값)
+        poll_interval (float): 디렉토리를 다시 확인하는 간격 (초)
+        settle_seconds (float): 파일이 다 쓰였다고 볼 때까지 기다리는 시간 (초)
+        on_result (callable): 문서마다 ConversionResult를 받아 호출할 함수
+        stop_event (threading.Event): set()되면 감시를 멈춥니다. (None이면 Ctrl+C로 멈출 때까지)
+        output_mode (str): 출력 방식 ('files', 'sharded', None이면 설정 파일 값)
+
+    Raises:
+        ValueError: 출력 방식이 묶음(zip, tar)인 경우 (감시는 끝이 없으므로 묶음을 닫을 수 없습니다.)
+    """
+    stop_event = stop_event or threading.Event()
+
+    # 설정 파일은 시작할 때 한 번 검증합니다. (이후에는 수정되었을 때만 다시 읽습니다.)
+    field_map = load_field_map(config_file)
+    output_directory = output_directory or resolve_output_directory(input_directory, field_map.output_directory)
+    output_mode = output_mode or field_map.output_mode
+    if output_mode in BUNDLE_MODES:
+        raise ValueError(f"폴더 감시에서는 묶음 출력({output_mode})을 사용할 수 없습니다. files 또는 sharded를 사용해 주세요.")
+    if workers is None:
+        workers = field_map.workers
+    elif workers <= 0:
+        workers = os.cpu_count() or 1
+
+    os.makedirs(output_directory, exist_ok=True)
+    watcher = FolderWatcher(input_directory, settle_seconds)
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=worker_initializer()) if workers > 1 else None
+    try:
+        while not stop_event.is_set():
+            file_paths = watcher.poll()
+            if file_paths:
+                _convert_ready_files(watcher, file_paths, output_directory, template_directory, config_file,
+                                     workers, group_key or load_field_map(config_file).group_key, executor, on_result,
+                                     output_mode)
+            stop_event.wait(poll_interval)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def _convert_ready_files(watcher, file_paths, output_directory, template_directory, config_file, workers,
+                         group_key, executor, on_result, output_mode):
+    # 확장자만 다른 입력 파일(예: case.xlsx와 case.csv)은 같은 Hwpx 파일을 덮어쓰게 되므로 변환하지 않습니다.
+    # 디렉토리에 있는 다른 파일과 겹치는지 보아야 하므로 이번에 준비된 파일만이 아니라 전체를 확인합니다.
+    collisions = find_output_name_collisions(watcher.input_files())
+    colliding = {name for names in collisions.values() for name in names}
+    for file_path in [path for path in file_paths if os.path.basename(path) in colliding]:
+        name = os.path.basename(file_path)
+        others = next(names for names in collisions.values() if name in names)
+        print(f"변환 건너뜀: {name}: 확장자만 다른 입력 파일({', '.join(others)})과 같은 Hwpx 파일로 변환됩니다.",
+              file=sys.stderr)
+        watcher.mark_done(file_path)
+    file_paths = [path for path in file_paths if os.path.basename(path) not in colliding]
+    if not file_paths:
+        return
+
+    run = ConversionRun(file_paths, output_directory, template_directory, config_file, workers, group_key,
+                        incremental=True, executor=executor, output_mode=output_mode)
+    # 마지막(final) 결과가 나와 모든 문서를 변환한 입력 파일 이름
+    done_sources = set()
+    # 문서 일부만 변환한 입력 파일 이름 (여러 문서로 나누는 경우, 없으면 None)
+    current_source = None
+    try:
+        for result in run.results():
+            if result.final:
+                done_sources.add(result.source)
+                current_source = None
+            else:
+                current_source = result.source
+            if on_result is not None:
+                on_result(result)
+    except Exception as e:
+        # 깨진 입력 파일 하나 때문에 감시가 멈추지 않도록 모든 오류를 잡아 기록합니다.
+        # 문서 일부만 변환한 파일이 있으면 그 파일에서, 없으면 결과가 입력 순서대로 나오므로
+        # 아직 끝나지 않은 첫 번째 파일에서 오류가 난 것입니다.
+        # 그 파일은 바뀔 때까지 건너뛰고, 나머지는 다음 확인 때 다시 변환합니다.
+        remaining = [path for path in file_paths if os.path.basename(path) not in done_sources]
+        failed = next((path for path in remaining if os.path.basename(path) == current_source),
+                      remaining[0] if remaining else None)
+        if failed is not None:
+            print(f"변환 실패: {os.path.basename(failed)}: {e}", file=sys.stderr)
+            watcher.mark_done(failed)
+
+    for file_path in file_paths:
+        if os.path.basename(file_path) in done_sources:
+            watcher.mark_done(file_path)
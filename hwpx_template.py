@@ -0,0 +1,622 @@
+import os
+import re
+import json
+import uuid
+import struct
+import threading
+from collections import OrderedDict
+
+from hwpx_writer import SECTION_NAME, RawMember, decompress_member, read_raw_members
+
+# '%변수%' 형태의 자리표시자 패턴
+PLACEHOLDER_PATTERN = re.compile(r'%(\w+)%')
+
+# section0.xml을 태그와 텍스트로 나누는 패턴
+XML_TOKEN_PATTERN = re.compile(r'<[^>]*>|[^<]+')
+
+# 한글이 자리표시자 하나를 여러 조각으로 나누어 저장할 때 조각 사이에 오는 태그
+TEXT_RUN_TAG_PATTERN = re.compile(r'</?hp:(?:run|t)\b[^>]*>')
+
+# 컴파일된 템플릿 파일을 저장할 디렉토리 (템플릿 파일과 같은 디렉토리 아래)
+TEMPLATE_ARTIFACT_DIRECTORY = '.hangulo-templates'
+
+# 컴파일된 템플릿 파일 형식: MAGIC, 헤더 길이(4 byte), JSON 헤더, 멤버 바이트와 고정 문자열 조각
+TEMPLATE_ARTIFACT_MAGIC = b'HGTPL\x00'
+TEMPLATE_ARTIFACT_VERSION = 2
+TEMPLATE_ARTIFACT_HEADER_STRUCT = struct.Struct('<I')
+
+def normalize_placeholders(xml_content):
+    """
+    여러 <hp:run>/<hp:t>에 나뉘어 저장된 자리표시자를 첫 번째 조각의 <hp:t> 안으로 모으는 함수입니다.
+
+    한글에서 자리표시자 일부의 글자 모양을 바꾸거나 고쳐 쓰면 '%세'와 '액%'처럼 나뉘어 저장되어
+    문자열 치환으로는 찾을 수 없습니다. 같은 문단에서 <hp:run>/<hp:t> 태그로만 떨어진 텍스트를 이어서
+    자리표시자를 찾고, 나뉜 조각을 첫 번째 조각(그 글자 모양)으로 옮깁니다. 뒤쪽 <hp:t>는 비어 있을 수 있습니다.
+
+    Parameters:
+        xml_content (str): section0.xml 내용
+
+    Returns:
+        tuple[str, int]: (정리된 section0.xml 내용, 합친 자리표시자 수)
+    """
+    if xml_content.count('%') < 2:
+        return xml_content, 0
+
+    tokens = XML_TOKEN_PATTERN.findall(xml_content)
+
+    # <hp:run>/<hp:t> 태그로만 이어진 <hp:t> 텍스트 토큰 묶음
+    chains = []
+    chain = []
+    in_text = False
+    for index, token in enumerate(tokens):
+        if token.startswith('<'):
+            if TEXT_RUN_TAG_PATTERN.fullmatch(token):
+                if token.startswith('<hp:t') and not token.endswith('/>'):
+                    in_text = True
+                elif token.startswith('</hp:t'):
+                    in_text = False
+                continue
+            if len(chain) > 1:
+                chains.append(chain)
+            chain = []
+            in_text = False
+        elif in_text:
+            chain.append(index)
+    if len(chain) > 1:
+        chains.append(chain)
+
+    merged = 0
+    for chain in chains:
+        texts = [tokens[index] for index in chain]
+        joined = ''.join(texts)
+        if joined.count('%') < 2:
+            continue
+
+        # 글자마다 어느 토큰에 속하는지 기록하고, 나뉜 자리표시자의 글자를 첫 번째 토큰으로 옮깁니다.
+        owners = [position for position, text in enumerate(texts) for _ in text]
+        chain_merged = 0
+        for match in PLACEHOLDER_PATTERN.finditer(joined):
+            first = owners[match.start()]
+            if owners[match.end() - 1] != first:
+                owners[match.start():match.end()] = [first] * (match.end() - match.start())
+                chain_merged += 1
+        if not chain_merged:
+            continue
+
+        parts = [[] for _ in texts]
+        for char, owner in zip(joined, owners):
+            parts[owner].append(char)
+        for index, part in zip(chain, parts):
+            tokens[index] = ''.join(part)
+        merged += chain_merged
+
+    if not merged:
+        return xml_content, 0
+    return ''.join(tokens), merged
+
+class CompiledTemplate:
+    """
+    section0.xml 내용을 한 번만 분해하여 고정 문자열 조각과 자리표시자 슬롯으로 보관하는 클래스입니다.
+
+    같은 템플릿으로 여러 문서를 만들 때 매번 XML 전체를 검색/치환하지 않고,
+    render() 한 번의 join으로 결과 문서를 만듭니다.
+
+    Attributes:
+        segments (list[str]): 자리표시자 사이의 고정 문자열 조각 (len(slots) + 1 개)
+        slots (list[tuple[str, int]]): 문서 순서대로 (key, 해당 key의 몇 번째 등장인지)
+    """
+
+    def __init__(self, xml_content=None, segments=None, slots=None):
+        if xml_content is None:
+            # 컴파일된 템플릿 파일에서 읽은 조각과 슬롯을 그대로 사용합니다.
+            self.segments = segments
+            self.slots = slots
+            self.occurrences = {}
+            for key, _ in slots:
+                self.occurrences[key] = self.occurrences.get(key, 0) + 1
+            return
+
+        segments = []
+        slots = []
+        occurrences = {}
+        position = 0
+
+        for match in PLACEHOLDER_PATTERN.finditer(xml_content):
+            key = match.group(1)
+            index = occurrences.get(key, 0)
+            occurrences[key] = index + 1
+
+            segments.append(xml_content[position:match.start()])
+            slots.append((key, index))
+            position = match.end()
+
+        segments.append(xml_content[position:])
+
+        self.segments = segments
+        self.slots = slots
+        self.occurrences = occurrences
+
+    @property
+    def keys(self):
+        """템플릿에 등장하는 key 목록 (처음 등장한 순서)"""
+        return list(self.occurrences)
+
+    def count(self, key):
+        """
+        템플릿에서 주어진 key가 등장하는 횟수를 리턴하는 함수입니다.
+
+        Parameters:
+            key (str): 자리표시자 key (예: '세액')
+
+        Returns:
+            int: 등장 횟수 (없으면 0)
+        """
+        return self.occurrences.get(key, 0)
+
+    def to_xml(self):
+        """
+        분해된 조각과 자리표시자를 다시 이어 section0.xml 내용을 리턴하는 함수입니다.
+        """
+        parts = [self.segments[0]]
+        for i, (key, _) in enumerate(self.slots, start=1):
+            parts.append(f'%{key}%')
+            parts.append(self.segments[i])
+        return ''.join(parts)
+
+    def render(self, values):
+        """
+        자리표시자를 값으로 채운 XML 문자열을 리턴하는 함수입니다.
+
+        Parameters:
+            values (dict): key -> 값.
+                값이 str이면 해당 key의 모든 자리에 같은 값을 넣고,
+                list이면 n번째 등장하는 자리에 n번째 값을 넣습니다.
+                값이 없는 자리는 원래의 '%key%' 문자열을 그대로 둡니다.
+
+        Returns:
+            str: 렌더링된 XML 문자열
+        """
+        segments = self.segments
+        parts = [segments[0]]
+
+        for i, (key, index) in enumerate(self.slots, start=1):
+            value = values.get(key)
+            if isinstance(value, str):
+                parts.append(value)
+            elif value is not None and index < len(value):
+                parts.append(value[index])
+            else:
+                parts.append(f'%{key}%')
+            parts.append(segments[i])
+
+        return ''.join(parts)
+
+def compile_template_file(xml_file):
+    """
+    section0.xml 파일을 읽어 CompiledTemplate으로 만드는 함수입니다.
+
+    Parameters:
+        xml_file (str): section0.xml 파일 경로
+
+    Returns:
+        CompiledTemplate: 분해된 템플릿
+    """
+    with open(xml_file, 'rt', encoding='UTF-8') as file:
+        xml_content = file.read()
+
+    xml_content, _ = normalize_placeholders(xml_content)
+    return CompiledTemplate(xml_content)
+
+# 표 구조를 찾기 위한 태그 패턴
+TABLE_TAG_PATTERN = re.compile(r'<(/?)hp:(tbl|tr)\b[^>]*>')
+ROW_ADDR_PATTERN = re.compile(r'rowAddr="(\d+)"')
+ROW_SPAN_PATTERN = re.compile(r'rowSpan="(\d+)"')
+CELL_PATTERN = re.compile(r'<hp:cellAddr colAddr="(\d+)" rowAddr="\d+"/><hp:cellSpan colSpan="(\d+)" rowSpan="(\d+)"/><hp:cellSz width="\d+" height="(\d+)"/>')
+ROW_CNT_PATTERN = re.compile(r'rowCnt="(\d+)"')
+TABLE_SIZE_PATTERN = re.compile(r'(<hp:sz width="\d+" widthRelTo="\w+" height=")(\d+)(")')
+
+def _find_table_rows(xml_content, position):
+    """position을 포함하는 표의 시작/끝 위치와 그 표에 직접 속한 <hp:tr> 목록을 찾습니다."""
+    tables = []
+    for match in TABLE_TAG_PATTERN.finditer(xml_content):
+        closing, tag = match.group(1), match.group(2)
+        if tag == 'tbl' and not closing:
+            tables.append({'start': match.start(), 'rows': [], 'row_start': None})
+        elif tag == 'tr' and not closing:
+            tables[-1]['row_start'] = match.start()
+        elif tag == 'tr':
+            table = tables[-1]
+            table['rows'].append((table['row_start'], match.end()))
+        else:
+            table = tables.pop()
+            if table['start'] <= position < match.end():
+                return table['start'], match.end(), table['rows']
+
+    raise ValueError('자리표시자를 포함하는 표를 찾을 수 없습니다.')
+
+def _shift_row_addr(row_xml, delta):
+    if delta == 0:
+        return row_xml
+    return ROW_ADDR_PATTERN.sub(lambda match: f'rowAddr="{int(match.group(1)) + delta}"', row_xml)
+
+def _row_signature(row_xml):
+    return [(column, col_span, row_span) for column, col_span, row_span, _ in CELL_PATTERN.findall(row_xml)]
+
+def expand_table_rows(xml_content, row_count, row_key):
+    """
+    표에서 행별 자리표시자가 들어 있는 행을 row_count번 복제한 section0.xml 내용을 리턴하는 함수입니다.
+
+    row_key 자리표시자가 있는 <hp:tr> (rowSpan으로 묶인 행들 포함)을 반복 행으로 보고 복제합니다.
+    반복 행 바로 뒤에 같은 모양의 빈 행들이 있으면 먼저 그 행들을 채우고, 모자란 만큼만 새 행을 추가합니다.
+    추가된 행 수만큼 rowCnt, 아래쪽 행들의 rowAddr, 표 높이를 조정합니다.
+
+    Parameters:
+        xml_content (str): 기준 템플릿의 section0.xml 내용 (행별 자리표시자가 한 행에만 있어야 합니다.)
+        row_count (int): 필요한 행(건) 수
+        row_key (str): 반복 행을 찾을 때 사용할 자리표시자 key (예: '계')
+
+    Returns:
+        str: 행이 확장된 section0.xml 내용
+    """
+    position = xml_content.find(f'%{row_key}%')
+    if position < 0:
+        raise ValueError(f"기준 템플릿에서 반복 행을 찾을 '%{row_key}%'가 존재하지 않습니다.")
+
+    table_start, table_end, rows = _find_table_rows(xml_content, position)
+    if xml_content.count('<hp:tbl', table_start + 1, table_end) > 0:
+        raise ValueError('표 안에 다른 표가 들어 있는 템플릿은 행을 확장할 수 없습니다.')
+
+    row_index = next(i for i, (start, end) in enumerate(rows) if start <= position < end)
+    anchor_xml = xml_content[rows[row_index][0]:rows[row_index][1]]
+
+    # rowSpan으로 묶인 행들을 한 건의 반복 단위로 봅니다.
+    group_size = max(int(span) for span in ROW_SPAN_PATTERN.findall(anchor_xml))
+    group_rows = rows[row_index:row_index + group_size]
+    if len(group_rows) < group_size:
+        raise ValueError('반복 행의 rowSpan이 표의 행 수를 넘습니다.')
+
+    group_start, group_end = group_rows[0][0], group_rows[-1][1]
+    group_xml = xml_content[group_start:group_end]
+    group_signature = [_row_signature(xml_content[start:end]) for start, end in group_rows]
+    spanning_heights = [int(height) for _, _, span, height in CELL_PATTERN.findall(anchor_xml) if int(span) == group_size]
+    group_height = max(spanning_heights, default=0)
+
+    # 반복 행 뒤에 이어지는 같은 모양의 빈 행 묶음 수
+    blank_groups = 0
+    next_index = row_index + group_size
+    while next_index + group_size <= len(rows):
+        candidate = rows[next_index:next_index + group_size]
+        candidate_xml = xml_content[candidate[0][0]:candidate[-1][1]]
+        if PLACEHOLDER_PATTERN.search(candidate_xml):
+            break
+        if [_row_signature(xml_content[start:end]) for start, end in candidate] != group_signature:
+            break
+        blank_groups += 1
+        next_index += group_size
+    region_end = rows[next_index - 1][1]
+
+    # 빈 행 묶음을 먼저 채우고, 모자란 만큼만 새로 추가합니다.
+    remaining_blanks = max(0, blank_groups - (row_count - 1))
+    added_groups = max(0, row_count - 1 - blank_groups)
+    added_rows = added_groups * group_size
+
+    parts = [xml_content[table_start:group_start]]
+    for i in range(row_count):
+        parts.append(_shift_row_addr(group_xml, i * group_size))
+    if remaining_blanks:
+        # 남는 빈 행 묶음은 원래 자리 그대로입니다.
+        kept_start = rows[next_index - remaining_blanks * group_size][0]
+        parts.append(xml_content[kept_start:region_end])
+    parts.append(_shift_row_addr(xml_content[region_end:table_end], added_rows))
+
+    table_xml = ''.join(parts)
+    if added_rows:
+        header_end = table_xml.index('>') + 1
+        table_header = ROW_CNT_PATTERN.sub(lambda match: f'rowCnt="{int(match.group(1)) + added_rows}"', table_xml[:header_end], count=1)
+        table_body = TABLE_SIZE_PATTERN.sub(lambda match: f'{match.group(1)}{int(match.group(2)) + added_groups * group_height}{match.group(3)}', table_xml[header_end:], count=1)
+        table_xml = table_header + table_body
+
+    return xml_content[:table_start] + table_xml + xml_content[table_end:]
+
+class TemplatePack:
+    """
+    템플릿 Hwpx 파일 하나를 메모리에 올려둔 결과입니다.
+
+    Attributes:
+        path (str): 템플릿 파일의 절대 경로
+        mtime (int): 읽을 당시의 파일 수정 시각 (ns)
+        members (list[RawMember]): zip 중앙 디렉토리 정보와 압축된 바이트를 담은 멤버 목록
+        template (CompiledTemplate): 분해된 section0.xml
+        section_xml (str): 분해하기 전의 section0.xml 내용 (나뉜 자리표시자를 합친 뒤)
+        normalized (int): 여러 조각으로 나뉘어 있어 합친 자리표시자 수
+        size (int): 메모리 사용량 추정치 (bytes)
+    """
+
+    def __init__(self, path, mtime, members, section_xml=None, template=None, normalized=0):
+        self.path = path
+        self.mtime = mtime
+        self.members = members
+        self.normalized = normalized
+
+        if template is not None:
+            # 컴파일된 템플릿 파일에서 읽은 경우 section0.xml은 필요할 때 다시 만듭니다.
+            self._section_xml = None
+            self.template = template
+            self.size = sum(len(member.data) for member in members) + sum(len(segment) for segment in template.segments)
+            return
+
+        if section_xml is None:
+            section_member = next((member for member in members if member.name == SECTION_NAME), None)
+            if section_member is None:
+                raise ValueError(f"템플릿 Hwp 파일 '{path}'에 '{SECTION_NAME}'이 존재하지 않습니다.")
+            section_xml, self.normalized = normalize_placeholders(decompress_member(section_member).decode('UTF-8'))
+            self.size = sum(len(member.data) for member in members) + len(section_xml.encode('UTF-8'))
+        else:
+            # 행을 확장한 템플릿은 기준 템플릿의 멤버를 함께 쓰므로 section0.xml 크기만 셉니다.
+            self.size = len(section_xml.encode('UTF-8'))
+
+        self._section_xml = section_xml
+        self.template = CompiledTemplate(section_xml)
+
+    @property
+    def section_xml(self):
+        if self._section_xml is None:
+            self._section_xml = self.template.to_xml()
+        return self._section_xml
+
+def template_artifact_path(hwpx_file):
+    """
+    템플릿 Hwpx 파일의 컴파일된 템플릿 파일 경로를 리턴하는 함수입니다.
+
+    Parameters:
+        hwpx_file (str): 템플릿 Hwpx 파일 경로
+
+    Returns:
+        str: '<템플릿 디렉토리>/.hangulo-templates/<파일 이름>.tpl'
+    """
+    directory, name = os.path.split(os.path.abspath(hwpx_file))
+    return os.path.join(directory, TEMPLATE_ARTIFACT_DIRECTORY, f'{name}.tpl')
+
+def write_template_artifact(artifact_file, pack, source_stat):
+    """
+    TemplatePack을 컴파일된 템플릿 파일로 저장하는 함수입니다.
+
+    고정 문자열 조각, 자리표시자 슬롯, 압축된 멤버 바이트를 파일 하나에 담아
+    다음 실행이나 새 작업 프로세스에서 템플릿을 다시 분해하지 않고 한 번에 읽을 수 있게 합니다.
+
+    Parameters:
+        artifact_file (str): 저장할 파일 경로
+        pack (TemplatePack): 저장할 템플릿
+        source_stat (os.stat_result): 템플릿 Hwpx 파일의 stat (바뀌었는지 확인하는 데 사용합니다.)
+    """
+    members = pack.members
+    segments = [segment.encode('UTF-8') for segment in pack.template.segments]
+
+    header = json.dumps({
+        'version': TEMPLATE_ARTIFACT_VERSION,
+        'source_mtime': source_stat.st_mtime_ns,
+        'source_size': source_stat.st_size,
+        'normalized': pack.normalized,
+        'members': [[member.name, member.compress_type, member.flag_bits, list(member.date_time), member.crc,
+                     member.compress_size, member.file_size, member.create_system, member.external_attr]
+                    for member in members],
+        'segments': [len(segment) for segment in segments],
+        'slots': pack.template.slots,
+    }, ensure_ascii=False, separators=(',', ':')).encode('UTF-8')
+
+    os.makedirs(os.path.dirname(artifact_file), exist_ok=True)
+    temp_path = f'{artifact_file}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(TEMPLATE_ARTIFACT_MAGIC)
+            file.write(TEMPLATE_ARTIFACT_HEADER_STRUCT.pack(len(header)))
+            file.write(header)
+            for member in members:
+                file.write(member.data)
+            for segment in segments:
+                file.write(segment)
+        os.replace(temp_path, artifact_file)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def read_template_artifact(artifact_file, path, source_stat):
+    """
+    컴파일된 템플릿 파일을 한 번에 읽어 TemplatePack을 만드는 함수입니다.
+
+    Parameters:
+        artifact_file (str): 컴파일된 템플릿 파일 경로
+        path (str): 템플릿 Hwpx 파일의 절대 경로
+        source_stat (os.stat_result): 현재 템플릿 Hwpx 파일의 stat
+
+    Returns:
+        TemplatePack: 읽은 템플릿 (파일이 없거나, 형식이 다르거나, 템플릿이 바뀌었으면 None)
+    """
+    try:
+        with open(artifact_file, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    offset = len(TEMPLATE_ARTIFACT_MAGIC)
+    if not data.startswith(TEMPLATE_ARTIFACT_MAGIC) or len(data) < offset + TEMPLATE_ARTIFACT_HEADER_STRUCT.size:
+        return None
+    header_length, = TEMPLATE_ARTIFACT_HEADER_STRUCT.unpack_from(data, offset)
+    offset += TEMPLATE_ARTIFACT_HEADER_STRUCT.size
+    try:
+        header = json.loads(data[offset:offset + header_length].decode('UTF-8'))
+    except ValueError:
+        return None
+    offset += header_length
+
+    if (header.get('version') != TEMPLATE_ARTIFACT_VERSION
+            or header.get('source_mtime') != source_stat.st_mtime_ns
+            or header.get('source_size') != source_stat.st_size):
+        return None
+
+    view = memoryview(data)
+    members = []
+    for name, compress_type, flag_bits, date_time, crc, compress_size, file_size, create_system, external_attr in header['members']:
+        members.append(RawMember(name, compress_type, flag_bits, tuple(date_time), crc, compress_size,
+                                 file_size, create_system, external_attr, bytes(view[offset:offset + compress_size])))
+        offset += compress_size
+
+    segments = []
+    for length in header['segments']:
+        segments.append(str(view[offset:offset + length], 'UTF-8'))
+        offset += length
+    if offset != len(data) or len(segments) != len(header['slots']) + 1:
+        return None
+
+    template = CompiledTemplate(segments=segments, slots=[tuple(slot) for slot in header['slots']])
+    return TemplatePack(path, source_stat.st_mtime_ns, members, template=template, normalized=header['normalized'])
+
+class TemplateCache:
+    """
+    템플릿 Hwpx 파일을 (경로, 수정 시각) 기준으로 한 번만 읽어 재사용하는 캐시입니다.
+
+    파일이 수정되면 다시 읽고, 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 템플릿부터 버립니다.
+    persist가 True이면 처음 분해한 템플릿 Hwpx 파일을 컴파일된 템플릿 파일로 저장해 두고,
+    다음 실행이나 새 작업 프로세스에서는 템플릿을 다시 분해하지 않고 그 파일을 읽습니다.
+    행을 확장한 템플릿은 건수마다 크기가 커지므로 저장하지 않고 항상 메모리에서 만듭니다.
+    여러 스레드에서 함께 사용할 수 있습니다.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, persist=False):
+        self.max_bytes = max_bytes
+        self.persist = persist
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.artifact_hits = 0
+        self.current_bytes = 0
+        self._packs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, hwpx_file):
+        """
+        템플릿 Hwpx 파일에 해당하는 TemplatePack을 리턴하는 함수입니다.
+
+        Parameters:
+            hwpx_file (str): 템플릿 Hwpx 파일 경로
+
+        Returns:
+            TemplatePack: 메모리에 올려둔 템플릿
+        """
+        path = os.path.abspath(hwpx_file)
+        source_stat = os.stat(path)
+
+        pack = self._lookup(path, source_stat.st_mtime_ns)
+        if pack is None:
+            pack = self._load(path, source_stat, lambda: TemplatePack(path, source_stat.st_mtime_ns, read_raw_members(path)))
+            pack = self._store(path, pack)
+
+        return pack
+
+    def get_expanded(self, hwpx_file, row_count, row_key):
+        """
+        기준 템플릿의 반복 행을 row_count번 복제한 TemplatePack을 리턴하는 함수입니다.
+
+        Parameters:
+            hwpx_file (str): 기준 템플릿 Hwpx 파일 경로
+            row_count (int): 필요한 행(건) 수
+            row_key (str): 반복 행을 찾을 때 사용할 자리표시자 key
+
+        Returns:
+            TemplatePack: 행이 확장된 템플릿 (멤버는 기준 템플릿과 같습니다.)
+        """
+        base_pack = self.get(hwpx_file)
+        key = (base_pack.path, row_count, row_key)
+
+        pack = self._lookup(key, base_pack.mtime)
+        if pack is None:
+            section_xml = expand_table_rows(base_pack.section_xml, row_count, row_key)
+            pack = self._store(key, TemplatePack(base_pack.path, base_pack.mtime, base_pack.members, section_xml))
+
+        return pack
+
+    def _load(self, path, source_stat, build):
+        # 컴파일된 템플릿 파일이 최신이면 그것을 읽고, 아니면 분해한 뒤 저장해 둡니다.
+        if not self.persist:
+            return build()
+
+        artifact_file = template_artifact_path(path)
+        pack = read_template_artifact(artifact_file, path, source_stat)
+        if pack is not None:
+            with self._lock:
+                self.artifact_hits += 1
+            return pack
+
+        pack = build()
+        try:
+            write_template_artifact(artifact_file, pack, source_stat)
+        except OSError:
+            # 템플릿 디렉토리에 쓸 수 없으면 저장하지 않고 계속합니다.
+            pass
+        return pack
+
+    def _lookup(self, key, mtime):
+        with self._lock:
+            pack = self._packs.get(key)
+            if pack is not None and pack.mtime == mtime:
+                self.hits += 1
+                self._packs.move_to_end(key)
+                return pack
+            self.misses += 1
+            return None
+
+    def _store(self, key, pack):
+        with self._lock:
+            old_pack = self._packs.pop(key, None)
+            if old_pack is not None:
+                self.current_bytes -= old_pack.size
+            self._packs[key] = pack
+            self.current_bytes += pack.size
+
+            # 메모리 한도를 넘으면 가장 오래 쓰지 않은 템플릿부터 버립니다. (방금 읽은 템플릿은 남겨둡니다.)
+            while self.current_bytes > self.max_bytes and len(self._packs) > 1:
+                _, evicted = self._packs.popitem(last=False)
+                self.current_bytes -= evicted.size
+                self.evictions += 1
+
+        return pack
+
+    def clear(self):
+        """캐시에 올려둔 템플릿을 모두 버립니다."""
+        with self._lock:
+            self._packs.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        캐시 사용 현황을 리턴하는 함수입니다.
+
+        Returns:
+            dict: hits, misses, evictions, artifact_hits, templates, bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'artifact_hits': self.artifact_hits,
+                'templates': len(self._packs),
+                'bytes': self.current_bytes,
+            }
+
+# 한 프로세스 안의 모든 변환이 함께 사용하는 템플릿 캐시
+# 컴파일된 템플릿 파일은 명령줄 변환에서 enable_template_artifacts()로 켰을 때만 씁니다.
+# (API나 서버에서 사용할 때는 템플릿 디렉토리에 파일을 만들지 않습니다.)
+template_cache = TemplateCache()
+
+def enable_template_artifacts(enabled=True):
+    """
+    현재 프로세스의 template_cache가 컴파일된 템플릿 파일을 읽고 쓰도록 하는 함수입니다. (프로세스 풀의 작업 프로세스에서도 호출합니다.)
+
+    Parameters:
+        enabled (bool): 켤지 여부
+    """
+    template_cache.persist = enabled
@@ -0,0 +1,462 @@
+import re
+import struct
+import zipfile
+import zlib
+import threading
+from collections import namedtuple
+
+MIMETYPE_NAME = 'mimetype'
+SECTION_NAME = 'Contents/section0.xml'
+
+# zip 로컬 파일 헤더 / 중앙 디렉토리 / 중앙 디렉토리 끝 레코드 구조
+LOCAL_HEADER_STRUCT = struct.Struct('<4s5H3L2H')
+CENTRAL_DIR_STRUCT = struct.Struct('<4s6H3L5H2L')
+END_OF_CENTRAL_DIR_STRUCT = struct.Struct('<4s4H2LH')
+
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+CENTRAL_DIR_SIGNATURE = b'PK\x01\x02'
+END_OF_CENTRAL_DIR_SIGNATURE = b'PK\x05\x06'
+
+# 데이터 디스크립터 사용 플래그 (로컬 헤더에 crc/크기를 직접 기록하므로 제거합니다.)
+FLAG_DATA_DESCRIPTOR = 0x08
+# 파일 이름이 UTF-8로 인코딩되었음을 나타내는 플래그
+FLAG_UTF8_NAME = 0x800
+
+ZIP_VERSION = 20
+
+# ZIP64 없이 기록할 수 있는 최대 크기/위치와 최대 항목 수
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+
+# 이미 압축된 형식이라 deflate해도 거의 줄지 않으므로 압축하지 않고(stored) 기록할 파일 확장자
+STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+
+# 새로 압축하는 멤버(section0.xml 등)의 기본 deflate 압축 레벨
+DEFAULT_COMPRESS_LEVEL = 6
+
+# 템플릿 zip 파일 안의 멤버 하나를 압축된 상태 그대로 보관하는 자료형
+RawMember = namedtuple('RawMember', [
+    'name',
+    'compress_type',
+    'flag_bits',
+    'date_time',
+    'crc',
+    'compress_size',
+    'file_size',
+    'create_system',
+    'external_attr',
+    'data',
+])
+
+def read_raw_members(hwpx_file):
+    """
+    Hwpx(zip) 파일의 멤버들을 압축을 풀지 않고 원래 순서대로 읽어오는 함수입니다.
+
+    Parameters:
+        hwpx_file (str | file): 템플릿 Hwpx 파일 경로 또는 읽기용 바이너리 파일 객체 (seek 가능해야 합니다.)
+
+    Returns:
+        list[RawMember]: 압축된 바이트를 그대로 담은 멤버 목록
+    """
+    if hasattr(hwpx_file, 'read'):
+        return _read_raw_members(hwpx_file, getattr(hwpx_file, 'name', '<memory>'))
+
+    with open(hwpx_file, 'rb') as fp:
+        return _read_raw_members(fp, hwpx_file)
+
+def _read_raw_members(fp, hwpx_file):
+    members = []
+    with zipfile.ZipFile(fp) as zip_ref:
+        for info in zip_ref.infolist():
+            fp.seek(info.header_offset)
+            header = LOCAL_HEADER_STRUCT.unpack(fp.read(LOCAL_HEADER_STRUCT.size))
+            if header[0] != LOCAL_HEADER_SIGNATURE:
+                raise ValueError(f"템플릿 Hwp 파일 '{hwpx_file}'의 '{info.filename}' 항목이 손상되었습니다.")
+            name_length, extra_length = header[9], header[10]
+            fp.seek(info.header_offset + LOCAL_HEADER_STRUCT.size + name_length + extra_length)
+            data = fp.read(info.compress_size)
+
+            members.append(RawMember(
+                name=info.filename,
+                compress_type=info.compress_type,
+                flag_bits=info.flag_bits,
+                date_time=info.date_time,
+                crc=info.CRC,
+                compress_size=info.compress_size,
+                file_size=info.file_size,
+                create_system=info.create_system,
+                external_attr=info.external_attr,
+                data=data,
+            ))
+
+    return members
+
+def decompress_member(member):
+    """
+    RawMember의 압축을 풀어 원본 바이트를 리턴하는 함수입니다.
+
+    Parameters:
+        member (RawMember): 압축 해제할 멤버
+
+    Returns:
+        bytes: 원본 바이트
+    """
+    if member.compress_type == zipfile.ZIP_STORED:
+        return member.data
+    if member.compress_type == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(member.data, -zlib.MAX_WBITS)
+    raise ValueError(f"'{member.name}' 항목의 압축 방식({member.compress_type})을 지원하지 않습니다.")
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_date, dos_time
+
+def encode_member(name, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=DEFAULT_COMPRESS_LEVEL,
+                  date_time=(1980, 1, 1, 0, 0, 0), create_system=0, external_attr=0):
+    """
+    원본 바이트를 압축하여 RawMember로 만드는 함수입니다.
+
+    Parameters:
+        name (str): zip 안의 경로 (예: 'Contents/section0.xml')
+        data (bytes | str): 기록할 내용 (str이면 UTF-8로 인코딩)
+        compress_type (int): zipfile.ZIP_STORED 또는 zipfile.ZIP_DEFLATED
+        compresslevel (int): deflate 압축 레벨
+
+    Returns:
+        RawMember: 압축된 멤버
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    if compress_type == zipfile.ZIP_STORED:
+        compressed = data
+    elif compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+    else:
+        raise ValueError(f"'{name}' 항목의 압축 방식({compress_type})을 지원하지 않습니다.")
+
+    return RawMember(
+        name=name,
+        compress_type=compress_type,
+        flag_bits=0,
+        date_time=date_time,
+        crc=zlib.crc32(data),
+        compress_size=len(compressed),
+        file_size=len(data),
+        create_system=create_system,
+        external_attr=external_attr,
+        data=compressed,
+    )
+
+class CompressionPolicy:
+    """
+    Hwpx 멤버마다 압축 방식을 정하는 클래스입니다.
+
+    - mimetype과 이미 압축된 이미지(PNG, JPEG, GIF): 압축하지 않음 (stored)
+    - 문서마다 새로 만드는 멤버(section0.xml 등): compress_level로 deflate (0이면 stored)
+
+    템플릿에서 바뀌지 않은 멤버는 압축된 바이트를 그대로 복사합니다. (reuse)
+    단, 템플릿에서 압축된 mimetype과 이미지는 압축을 풀어 stored로 바꿉니다.
+    reuse가 False이면 템플릿 멤버도 위 규칙과 compress_level로 다시 압축합니다.
+    템플릿 멤버를 정책에 맞게 바꾸는 일은 템플릿마다 한 번만 하고, 문서마다 새로 압축하는 것은 바뀐 멤버뿐입니다.
+    """
+
+    # 정책에 맞게 바꾼 멤버 목록을 보관할 최대 템플릿 수
+    MAX_PREPARED = 256
+
+    def __init__(self, compress_level=DEFAULT_COMPRESS_LEVEL, reuse=True):
+        if not 0 <= compress_level <= 9:
+            raise ValueError(f"압축 레벨 {compress_level}이 올바르지 않습니다. (0 ~ 9)")
+        self.compress_level = compress_level
+        self.reuse = reuse
+
+        # id(템플릿 멤버 목록) -> (템플릿 멤버 목록, 정책에 맞게 바꾼 멤버 목록)
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def must_store(name):
+        """
+        압축하지 않아야 하는 멤버(mimetype, 이미 압축된 이미지)인지 확인합니다.
+        """
+        return name == MIMETYPE_NAME or name.lower().endswith(STORED_EXTENSIONS)
+
+    def compress_type(self, name):
+        """
+        새로 압축할 멤버의 압축 방식(zipfile.ZIP_STORED 또는 zipfile.ZIP_DEFLATED)을 리턴합니다.
+        """
+        if self.must_store(name) or self.compress_level == 0:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def encode(self, name, data, date_time=(1980, 1, 1, 0, 0, 0), create_system=0, external_attr=0):
+        """
+        새 내용을 정책에 맞게 압축한 RawMember를 리턴합니다.
+        """
+        return encode_member(name, data, self.compress_type(name), self.compress_level,
+                             date_time, create_system, external_attr)
+
+    def prepare(self, members):
+        """
+        템플릿 멤버 목록을 정책에 맞게 바꾼 목록을 리턴합니다. (mimetype이 맨 앞, 나머지는 템플릿 순서)
+
+        Parameters:
+            members (list[RawMember]): read_raw_members()로 읽은 템플릿 멤버 목록
+
+        Returns:
+            list[RawMember]: 정책에 맞는 멤버 목록 (같은 목록은 다시 만들지 않습니다.)
+        """
+        entry = self._prepared.get(id(members))
+        if entry is not None and entry[0] is members:
+            return entry[1]
+
+        # 정렬은 안정적이므로 mimetype만 맨 앞으로 옮기고 나머지는 템플릿 순서를 유지합니다.
+        prepared = [self._prepare_member(member) for member in sorted(members, key=lambda member: member.name != MIMETYPE_NAME)]
+
+        with self._lock:
+            if len(self._prepared) >= self.MAX_PREPARED:
+                self._prepared.clear()
+            self._prepared[id(members)] = (members, prepared)
+        return prepared
+
+    def _prepare_member(self, member):
+        if self.must_store(member.name):
+            if member.compress_type == zipfile.ZIP_STORED:
+                return member
+        elif self.reuse:
+            return member
+
+        compress_type = self.compress_type(member.name)
+        return encode_member(member.name, decompress_member(member), compress_type, self.compress_level,
+                             member.date_time, member.create_system, member.external_attr)
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+def compression_policy(compress_level=DEFAULT_COMPRESS_LEVEL, reuse=True):
+    """
+    압축 레벨별로 프로세스에서 함께 사용하는 CompressionPolicy를 리턴하는 함수입니다.
+    """
+    key = (compress_level, reuse)
+    policy = _policies.get(key)
+    if policy is None:
+        with _policies_lock:
+            policy = _policies.setdefault(key, CompressionPolicy(compress_level, reuse))
+    return policy
+
+class HwpxPackageWriter:
+    """
+    zip 구조를 직접 기록하는 Hwpx 출력기입니다.
+
+    템플릿에서 바뀌지 않은 멤버는 압축된 바이트를 재압축 없이 그대로 복사하고,
+    바뀐 멤버만 새로 압축하여 씁니다. 임시 디렉토리나 임시 zip 파일을 만들지 않습니다.
+    ZIP64는 기록하지 않으므로 파일 크기와 위치는 4GB, 항목 수는 65535개를 넘을 수 없습니다.
+    """
+
+    def __init__(self, fileobj):
+        self.fp = fileobj
+        self.offset = 0
+        self.entries = []
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.offset += len(data)
+
+    def write_raw(self, member):
+        """
+        압축된 멤버를 그대로 기록합니다.
+
+        Parameters:
+            member (RawMember): 기록할 멤버
+
+        Raises:
+            ValueError: 멤버 크기, 기록할 위치, 항목 수가 ZIP64 없이 기록할 수 있는 한도를 넘는 경우
+        """
+        if len(self.entries) >= ZIP_MAX_ENTRIES:
+            raise ValueError(f"Hwp 파일 하나에 담을 수 있는 항목 수({ZIP_MAX_ENTRIES}개)를 넘었습니다. 문서를 나누어 저장해 주세요.")
+        if max(member.compress_size, member.file_size, self.offset) > ZIP_MAX_SIZE:
+            raise ValueError(f"Hwp 파일 하나의 크기가 4GB를 넘었습니다. ('{member.name}') 문서를 나누어 저장해 주세요.")
+
+        name = member.name.encode('utf-8')
+        flag_bits = member.flag_bits & ~FLAG_DATA_DESCRIPTOR
+        if not member.name.isascii():
+            flag_bits |= FLAG_UTF8_NAME
+        dos_date, dos_time = _dos_date_time(member.date_time)
+
+        header_offset = self.offset
+        self._write(LOCAL_HEADER_STRUCT.pack(
+            LOCAL_HEADER_SIGNATURE, ZIP_VERSION, flag_bits, member.compress_type,
+            dos_time, dos_date, member.crc, member.compress_size, member.file_size,
+            len(name), 0))
+        self._write(name)
+        self._write(member.data)
+
+        self.entries.append((member, name, flag_bits, dos_date, dos_time, header_offset))
+
+    def write_data(self, name, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=DEFAULT_COMPRESS_LEVEL,
+                   date_time=(1980, 1, 1, 0, 0, 0), create_system=0, external_attr=0):
+        """
+        원본 바이트를 압축하여 새 멤버로 기록합니다.
+
+        Parameters:
+            name (str): zip 안의 경로 (예: 'Contents/section0.xml')
+            data (bytes | str): 기록할 내용 (str이면 UTF-8로 인코딩)
+            compress_type (int): zipfile.ZIP_STORED 또는 zipfile.ZIP_DEFLATED
+            compresslevel (int): deflate 압축 레벨
+        """
+        self.write_raw(encode_member(name, data, compress_type, compresslevel, date_time, create_system, external_attr))
+
+    def close(self):
+        """
+        중앙 디렉토리를 기록하여 zip 파일을 마무리합니다.
+
+        Raises:
+            ValueError: 중앙 디렉토리의 위치나 크기가 4GB를 넘는 경우
+        """
+        central_dir_offset = self.offset
+        for member, name, flag_bits, dos_date, dos_time, header_offset in self.entries:
+            self._write(CENTRAL_DIR_STRUCT.pack(
+                CENTRAL_DIR_SIGNATURE, member.create_system << 8 | ZIP_VERSION, ZIP_VERSION,
+                flag_bits, member.compress_type, dos_time, dos_date, member.crc,
+                member.compress_size, member.file_size, len(name), 0, 0, 0, 0,
+                member.external_attr, header_offset))
+            self._write(name)
+        central_dir_size = self.offset - central_dir_offset
+        if max(central_dir_offset, central_dir_size) > ZIP_MAX_SIZE:
+            raise ValueError("Hwp 파일 하나의 크기가 4GB를 넘었습니다. 문서를 나누어 저장해 주세요.")
+
+        self._write(END_OF_CENTRAL_DIR_STRUCT.pack(
+            END_OF_CENTRAL_DIR_SIGNATURE, 0, 0, len(self.entries), len(self.entries),
+            central_dir_size, central_dir_offset, 0))
+
+def write_hwpx(members, fileobj, replacements, policy=None):
+    """
+    템플릿 멤버들을 복사하면서 일부 멤버만 새 내용으로 바꾼 Hwpx 파일을 쓰는 함수입니다.
+
+    'mimetype'은 항상 첫 번째 항목으로, 압축하지 않고(stored) 기록합니다.
+
+    Parameters:
+        members (list[RawMember]): read_raw_members()로 읽은 템플릿 멤버 목록
+        fileobj: 바이너리 쓰기 모드로 열린 파일 객체
+        replacements (dict): zip 안의 경로 -> 새 내용 (bytes 또는 str)
+        policy (CompressionPolicy): 멤버별 압축 방식 (None이면 기본 압축 레벨)
+    """
+    policy = policy or compression_policy()
+    writer = HwpxPackageWriter(fileobj)
+
+    for member in policy.prepare(members):
+        if member.name in replacements:
+            writer.write_raw(policy.encode(member.name, replacements[member.name],
+                                           member.date_time, member.create_system, member.external_attr))
+        else:
+            writer.write_raw(member)
+
+    writer.close()
+
+HEADER_NAME = 'Contents/header.xml'
+CONTENT_HPF_NAME = 'Contents/content.hpf'
+CONTAINER_RDF_NAME = 'META-INF/container.rdf'
+
+SECTION_COUNT_PATTERN = re.compile(r'(<hh:head\b[^>]*\bsecCnt=")(\d+)(")')
+# content.hpf의 구역 항목 (속성 순서와 관계없이 찾습니다.)
+SECTION_ITEM_PATTERN = re.compile(r'<opf:item\b[^>]*\bid="section0"[^>]*/>')
+SECTION_ITEMREF_PATTERN = re.compile(r'<opf:itemref\b[^>]*\bidref="section0"[^>]*/>')
+# container.rdf에서 section0.xml을 가리키는 rdf:Description (hasPart, SectionFile 형식)
+SECTION_DESCRIPTION_PATTERN = re.compile(
+    r'<rdf:Description\b(?:(?!</rdf:Description>).)*?"Contents/section0\.xml"(?:(?!</rdf:Description>).)*</rdf:Description>',
+    re.DOTALL)
+
+class MergedHwpxWriter:
+    """
+    여러 문서를 각각 하나의 구역(section)으로 담은 Hwpx 파일 하나를 쓰는 출력기입니다.
+
+    문서는 들어오는 대로 Contents/section{N}.xml로 바로 기록하고,
+    공통 header.xml, content.hpf(manifest, spine), container.rdf는 close()에서 한 번만 기록합니다.
+
+    header.xml은 첫 번째 문서의 템플릿 것 하나만 기록하므로, 모든 문서의 템플릿은 header.xml이 같아야 합니다.
+    (구역의 글자 모양, 문단 모양, 테두리 등은 header.xml의 ID로 참조하기 때문입니다.)
+    건수에 따라 template-tax-N.hwpx를 고르는 경우 모든 template-tax-N.hwpx가 같은 header.xml을 쓰도록
+    기준 템플릿에서 만들어야 합니다. 다르면 add_section()에서 ValueError가 발생합니다.
+    """
+
+    def __init__(self, fileobj, policy=None):
+        self.writer = HwpxPackageWriter(fileobj)
+        self.policy = policy or compression_policy()
+        self.members = None
+        self.header = None
+        self.section_count = 0
+
+    def add_section(self, members, section_xml):
+        """
+        문서 하나를 새 구역으로 추가합니다.
+
+        Parameters:
+            members (list[RawMember]): 문서를 만든 템플릿의 멤버 목록
+            section_xml (str | bytes): 값이 채워진 section0.xml 내용
+
+        Raises:
+            ValueError: 템플릿의 header.xml이 앞 문서의 템플릿과 다른 경우
+        """
+        header = next(member for member in members if member.name == HEADER_NAME)
+
+        if self.members is None:
+            self.members = members
+            self.header = header
+            self.writer.write_raw(self.policy.prepare(members)[0])
+        elif (header.crc, header.file_size) != (self.header.crc, self.header.file_size) or \
+                decompress_member(header) != decompress_member(self.header):
+            raise ValueError("header.xml이 다른 템플릿으로 만든 문서는 하나의 Hwp 파일로 합칠 수 없습니다.")
+
+        section = next(member for member in members if member.name == SECTION_NAME)
+        self.writer.write_raw(self.policy.encode(f'Contents/section{self.section_count}.xml', section_xml,
+                                                 section.date_time, section.create_system, section.external_attr))
+        self.section_count += 1
+
+    def _repeat_sections(self, pattern, xml, member_name):
+        # section0을 가리키는 부분을 구역 수만큼 복제합니다. (찾지 못하면 구역이 빠진 파일이 되므로 오류)
+        def repeat(match):
+            return ''.join(match.group(0).replace('section0', f'section{i}') for i in range(self.section_count))
+
+        xml, count = pattern.subn(repeat, xml)
+        if count == 0:
+            raise ValueError(f"템플릿의 '{member_name}'에서 구역(section0) 항목을 찾을 수 없어 문서를 합칠 수 없습니다.")
+        return xml
+
+    def close(self):
+        """
+        공통 멤버와 구역 목록을 기록하여 Hwpx 파일을 마무리합니다.
+
+        Raises:
+            ValueError: 합칠 문서가 없거나, 템플릿의 header.xml, content.hpf, container.rdf에서 구역 항목을 찾을 수 없는 경우
+        """
+        if self.members is None:
+            raise ValueError("합칠 문서가 없습니다.")
+
+        for member in self.policy.prepare(self.members):
+            if member.name in (MIMETYPE_NAME, SECTION_NAME):
+                continue
+
+            if member.name == HEADER_NAME:
+                header_xml = decompress_member(member).decode('UTF-8')
+                header_xml, count = SECTION_COUNT_PATTERN.subn(
+                    lambda match: f'{match.group(1)}{self.section_count}{match.group(3)}', header_xml, count=1)
+                if count == 0:
+                    raise ValueError(f"템플릿의 '{HEADER_NAME}'에서 구역 수(secCnt)를 찾을 수 없어 문서를 합칠 수 없습니다.")
+                xml = header_xml
+            elif member.name == CONTENT_HPF_NAME:
+                content_hpf = decompress_member(member).decode('UTF-8')
+                content_hpf = self._repeat_sections(SECTION_ITEM_PATTERN, content_hpf, member.name)
+                xml = self._repeat_sections(SECTION_ITEMREF_PATTERN, content_hpf, member.name)
+            elif member.name == CONTAINER_RDF_NAME:
+                xml = self._repeat_sections(SECTION_DESCRIPTION_PATTERN, decompress_member(member).decode('UTF-8'), member.name)
+            else:
+                self.writer.write_raw(member)
+                continue
+
+            self.writer.write_raw(self.policy.encode(member.name, xml, member.date_time,
+                                                     member.create_system, member.external_attr))
+
+        self.writer.close()
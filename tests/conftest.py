@@ -0,0 +1,43 @@
+import os
+import sys
+import shutil
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hangulo_config import load_field_map
+
+@pytest.fixture
+def template_directory():
+    """
+    template-tax-N.hwpx 파일이 있는 저장소 루트 디렉토리입니다.
+    """
+    return ROOT
+
+@pytest.fixture
+def config_file(tmp_path):
+    """
+    저장소의 config.ini를 복사한 설정 파일입니다. (테스트에서 고쳐 써도 저장소 파일은 바뀌지 않습니다.)
+    """
+    path = tmp_path / 'config.ini'
+    shutil.copyfile(os.path.join(ROOT, 'config.ini'), path)
+    return str(path)
+
+@pytest.fixture
+def field_map(config_file):
+    return load_field_map(config_file)
+
+@pytest.fixture
+def make_workbooks(tmp_path, field_map):
+    """
+    hangulo_bench.generate_workbooks()로 config.ini의 열 배치에 맞는 xlsx 파일들을 만드는 함수입니다.
+    """
+    from hangulo_bench import generate_workbooks
+
+    def make(name, document_count, row_count, layout='files', seed=0):
+        directory = tmp_path / name
+        directory.mkdir()
+        return generate_workbooks(str(directory), field_map, document_count, row_count, layout, seed)
+
+    return make
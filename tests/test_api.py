@@ -0,0 +1,56 @@
+import io
+import os
+import shutil
+import zipfile
+import datetime
+from hwpx_template import TEMPLATE_ARTIFACT_DIRECTORY
+from hwpx_writer import SECTION_NAME
+from hangulo_api import HwpxRenderer, render_hwpx
+
+RECORD = {
+    '문서번호': '징수과-123',
+    '사건번호': '2023-123',
+    '성명': '양동호',
+    '주민등록번호': '111111-1111111',
+    '주소': '경기 하남 & 광주',
+    '과세연도': '2022',
+    '과세번호': '0231425',
+    '법정기일': datetime.datetime(2022, 5, 30),
+    '세액': 40000,
+    '가산금': 400,
+    '계': 40400,
+}
+
+def section_xml(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return archive.read(SECTION_NAME).decode('UTF-8')
+
+def test_render_does_not_print_or_persist(tmp_path, template_directory, config_file, capsys):
+    shutil.copyfile(os.path.join(template_directory, 'template-tax-1.hwpx'), tmp_path / 'template-tax-1.hwpx')
+
+    # template-tax-4.hwpx가 없으므로 기준 템플릿을 확장합니다.
+    records = [dict(RECORD, 과세번호=f'02314{index}') for index in range(4)]
+    data = render_hwpx(records, template_directory=str(tmp_path), config_file=config_file)
+
+    assert capsys.readouterr().out == ''
+    assert not (tmp_path / TEMPLATE_ARTIFACT_DIRECTORY).exists()
+    xml = section_xml(data)
+    assert all(f'02314{index}' in xml for index in range(4))
+    assert '161,600원' in xml
+    assert '경기 하남 &amp; 광주' in xml
+    assert '%' + '계%' not in xml
+
+def test_iter_render_splits_by_group_key(template_directory, config_file):
+    records = [RECORD, dict(RECORD, 문서번호='징수과-124', 성명='최윤희'), dict(RECORD, 문서번호=None, 과세번호='0999999')]
+    documents = list(HwpxRenderer(template_directory=template_directory, config_file=config_file)
+                     .iter_render(records, '문서번호'))
+    assert [name for name, _ in documents] == ['징수과-123', '징수과-124']
+    assert '최윤희' in section_xml(documents[1][1])
+    assert '0999999' in section_xml(documents[1][1])
+
+def test_render_from_csv_bytes(template_directory, config_file):
+    data = ('성명,계,세액,가산금,법정기일\n양동호,"40,400",40000,400,2022-05-30\n').encode('utf-8')
+    renderer = HwpxRenderer(template_directory=template_directory, config_file=config_file)
+    buffer = io.BytesIO(data)
+    buffer.name = 'rows.csv'
+    assert '40,400' in section_xml(renderer.render(buffer))
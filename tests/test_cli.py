@@ -0,0 +1,49 @@
+import os
+import glob
+import json
+import shutil
+import pytest
+from hwpx_template import template_cache
+from hangulo_cli import main, parse_args
+
+@pytest.mark.parametrize('argv, expected', [
+    ([], None),
+    (['--incremental'], True),
+    (['--no-incremental'], False),
+])
+def test_incremental_flag(argv, expected):
+    assert parse_args(['input'] + argv).incremental is expected
+
+@pytest.mark.parametrize('argv, expected', [([], None), (['--pipeline'], True), (['--no-pipeline'], False)])
+def test_pipeline_flag(argv, expected):
+    assert parse_args(['input'] + argv).pipeline is expected
+
+@pytest.mark.parametrize('argv, expected', [([], None), (['--verify'], True), (['--no-verify'], False)])
+def test_verify_flag(argv, expected):
+    assert parse_args(['input'] + argv).verify is expected
+
+def test_no_incremental_overrides_config(tmp_path, make_workbooks, template_directory, config_file, capsys, monkeypatch):
+    # main()은 컴파일된 템플릿 파일을 켜므로, 저장소가 아닌 복사한 템플릿을 쓰고 끝나면 설정을 되돌립니다.
+    monkeypatch.setattr(template_cache, 'persist', template_cache.persist)
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    for path in glob.glob(os.path.join(template_directory, 'template-tax-*.hwpx')):
+        shutil.copy(path, templates)
+    template_directory = str(templates)
+
+    with open(config_file, encoding='UTF-8') as file:
+        config = file.read().replace('incremental=no', 'incremental=yes')
+    with open(config_file, 'w', encoding='UTF-8') as file:
+        file.write(config)
+    input_directory = os.path.dirname(make_workbooks('in', 2, 1)[0])
+    output_directory = str(tmp_path / 'out')
+
+    def converted(*argv):
+        # 요약(JSON)은 표준 출력의 마지막 줄입니다.
+        main([input_directory, '-o', output_directory, '-t', template_directory, '-c', config_file, *argv])
+        return json.loads(capsys.readouterr().out.splitlines()[-1])['converted']
+
+    assert len(converted()) == 2
+    # 설정 파일이 incremental=yes이면 바뀌지 않은 파일은 건너뜁니다.
+    assert converted() == []
+    assert len(converted('--no-incremental')) == 2
@@ -0,0 +1,55 @@
+import os
+import re
+import pytest
+from hwpx_template import CompiledTemplate, TemplateCache, expand_table_rows
+
+ROW_FIELDS = ('과세연도', '과세번호', '법정기일', '세액', '가산금', '계')
+
+TABLE_PATTERN = re.compile(r'<hp:tbl\b.*?</hp:tbl>', re.DOTALL)
+
+@pytest.fixture(scope='module')
+def cache():
+    return TemplateCache()
+
+def tables(xml_content):
+    # 표마다 (rowCnt, <hp:tr> 수, rowAddr 목록)
+    result = []
+    for table in TABLE_PATTERN.findall(xml_content):
+        row_count = int(re.search(r'rowCnt="(\d+)"', table).group(1))
+        addresses = sorted({int(address) for address in re.findall(r'rowAddr="(\d+)"', table)})
+        result.append((row_count, table.count('<hp:tr'), addresses))
+    return result
+
+@pytest.mark.parametrize('row_count', [2, 3, 5])
+def test_expanded_base_matches_hand_made_template(cache, template_directory, row_count):
+    base = os.path.join(template_directory, 'template-tax-1.hwpx')
+    expanded = cache.get_expanded(base, row_count, '계').template
+    hand_made = cache.get(os.path.join(template_directory, f'template-tax-{row_count}.hwpx')).template
+
+    # 자리표시자가 같은 순서로 같은 횟수만큼 나옵니다.
+    assert expanded.slots == hand_made.slots
+    assert [(count, rows) for count, rows, _ in tables(expanded.to_xml())] == \
+        [(count, rows) for count, rows, _ in tables(hand_made.to_xml())]
+
+@pytest.mark.parametrize('row_count', [1, 2, 5, 8, 20])
+def test_expanded_rows_are_numbered_in_order(cache, template_directory, row_count):
+    expanded = cache.get_expanded(os.path.join(template_directory, 'template-tax-1.hwpx'), row_count, '계').template
+
+    for key in ROW_FIELDS:
+        assert expanded.count(key) == row_count
+    assert expanded.count('성명') == 1
+    for count, rows, addresses in tables(expanded.to_xml()):
+        assert count == rows
+        assert addresses == list(range(count))
+
+def test_missing_row_key(cache, template_directory):
+    xml_content = cache.get(os.path.join(template_directory, 'template-tax-1.hwpx')).template.to_xml()
+    with pytest.raises(ValueError, match='없는항목'):
+        expand_table_rows(xml_content, 3, '없는항목')
+
+def test_expansion_keeps_text_outside_the_table(cache, template_directory):
+    xml_content = cache.get(os.path.join(template_directory, 'template-tax-1.hwpx')).template.to_xml()
+    expanded = expand_table_rows(xml_content, 4, '계')
+    start = xml_content.index('<hp:tbl')
+    assert expanded.startswith(xml_content[:start])
+    assert CompiledTemplate(expanded).keys == CompiledTemplate(xml_content).keys
@@ -0,0 +1,74 @@
+import os
+import glob
+import json
+import shutil
+import pytest
+import hangulo_manifest
+from hangulo_core import convert_batch
+from hangulo_pipeline import convert_pipeline
+from hangulo_manifest import MANIFEST_FILE
+
+@pytest.fixture
+def templates(tmp_path, template_directory):
+    directory = tmp_path / 'templates'
+    directory.mkdir()
+    for path in glob.glob(os.path.join(template_directory, 'template-tax-*.hwpx')):
+        shutil.copy(path, directory)
+    return str(directory)
+
+@pytest.fixture(params=['batch', 'pipeline'])
+def convert(request, tmp_path, templates, config_file):
+    output_directory = tmp_path / 'out'
+    output_directory.mkdir()
+
+    def run(file_paths):
+        if request.param == 'batch':
+            results = convert_batch(file_paths, str(output_directory), templates, 1, config_file, incremental=True)
+        else:
+            results = convert_pipeline(file_paths, str(output_directory), templates, config_file, incremental=True)
+        return {result.source: result.status for result in results}
+
+    return run
+
+def touch_template(templates, name):
+    with open(os.path.join(templates, name), 'ab') as file:
+        file.write(b'\0')
+
+def test_unused_template_change_keeps_outputs(convert, make_workbooks, templates):
+    file_paths = make_workbooks('in', 2, 2)
+    assert set(convert(file_paths).values()) == {'converted'}
+
+    touch_template(templates, 'template-tax-3.hwpx')
+    assert set(convert(file_paths).values()) == {'up-to-date'}
+
+    touch_template(templates, 'template-tax-2.hwpx')
+    assert set(convert(file_paths).values()) == {'converted'}
+
+def test_new_template_for_expanded_row_count(convert, make_workbooks, templates):
+    file_paths = make_workbooks('in', 1, 6)
+    assert set(convert(file_paths).values()) == {'converted'}
+    assert set(convert(file_paths).values()) == {'up-to-date'}
+
+    shutil.copy(os.path.join(templates, 'template-tax-5.hwpx'), os.path.join(templates, 'template-tax-6.hwpx'))
+    assert set(convert(file_paths).values()) == {'converted'}
+
+def test_touched_input_is_hashed_once(convert, make_workbooks, tmp_path, monkeypatch):
+    file_paths = make_workbooks('in', 1, 2)
+    convert(file_paths)
+    stat = os.stat(file_paths[0])
+    os.utime(file_paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    hashed = []
+    file_digest = hangulo_manifest.file_digest
+    monkeypatch.setattr(hangulo_manifest, 'file_digest', lambda path: hashed.append(path) or file_digest(path))
+
+    assert set(convert(file_paths).values()) == {'up-to-date'}
+    assert hashed.count(file_paths[0]) == 1
+
+    hashed.clear()
+    assert set(convert(file_paths).values()) == {'up-to-date'}
+    assert file_paths[0] not in hashed
+
+    with open(tmp_path / 'out' / MANIFEST_FILE, encoding='UTF-8') as file:
+        entries = [json.loads(line) for line in file]
+    assert [entry['mtime'] for entry in entries] == [stat.st_mtime_ns + 10 ** 9]
@@ -0,0 +1,87 @@
+import random
+import pytest
+from hangulo_numerals import MAX_AMOUNT, korean_numeral, number_to_korean_amount, number_to_korean_amounts
+
+# 네 자리마다 붙는 큰 단위 (변환기의 표와 따로 둡니다.)
+BIG_UNITS = ('', '만', '억', '조', '경', '해', '자', '양', '구', '간', '정', '재', '극')
+
+def reference_korean_numeral(number):
+    # 한 자리씩 읽으며 변환하는 단순한 구현 (0 -> '')
+    digits = str(number)
+    length = len(digits)
+    text = ''
+    group_has_digit = False
+    for i, char in enumerate(digits):
+        position = length - 1 - i
+        digit = int(char)
+        if digit:
+            text += '일이삼사오육칠팔구'[digit - 1] + ('', '십', '백', '천')[position % 4]
+            group_has_digit = True
+        if position % 4 == 0:
+            if group_has_digit:
+                text += BIG_UNITS[position // 4]
+            group_has_digit = False
+    return text
+
+def boundary_numbers():
+    # 큰 단위 자리마다 네 자리 전체(0 ~ 9999)와, 아래 자리가 모두 0이거나 일부만 0인 값
+    rng = random.Random(0)
+    for big_unit_index in range(1, len(BIG_UNITS)):
+        unit = 10 ** (4 * big_unit_index)
+        yield from (unit - 1, unit + 1)
+        for group in range(10000):
+            yield group * unit
+        for group in (1, 10, 1000, 9999):
+            for lower in (1, 10, 1000, 10000, unit // 10, unit - 1):
+                yield group * unit + lower
+    # 무작위로 네 자리 묶음을 0으로 만든 큰 수
+    for _ in range(20000):
+        groups = [rng.randrange(10000) if rng.random() < 0.5 else 0 for _ in BIG_UNITS]
+        yield sum(group * 10 ** (4 * index) for index, group in enumerate(groups))
+    yield MAX_AMOUNT - 1
+
+@pytest.mark.parametrize('number, expected', [
+    # 0은 기존 변환기와 같이 숫자 없이 '금원정'입니다.
+    (0, '금원정'),
+    (1, '금일원정'),
+    (10, '금일십원정'),
+    (11, '금일십일원정'),
+    (10000, '금일만원정'),
+    (128600, '금일십이만팔천육백원정'),
+    (100000000, '금일억원정'),
+    (1000000000000, '금일조원정'),
+    # 중간 자리나 네 자리 전체가 0인 경우
+    (10203, '금일만이백삼원정'),
+    (100010001, '금일억일만일원정'),
+    (1000000001, '금일십억일원정'),
+    (100000010000, '금일천억일만원정'),
+    (1000100000000, '금일조일억원정'),
+    (99999999, '금구천구백구십구만구천구백구십구원정'),
+])
+def test_number_to_korean_amount(number, expected):
+    assert number_to_korean_amount(number) == expected
+
+def test_matches_reference_below_100000():
+    for number in range(100000):
+        expected = reference_korean_numeral(number)
+        assert korean_numeral.__wrapped__(number) == expected, number
+        assert number_to_korean_amount(number) == f'금{expected}원정', number
+
+def test_matches_reference_at_unit_boundaries():
+    for number in boundary_numbers():
+        assert korean_numeral.__wrapped__(number) == reference_korean_numeral(number), number
+
+def test_largest_amount():
+    assert korean_numeral(MAX_AMOUNT - 1).startswith('구천구백구십구극')
+
+@pytest.mark.parametrize('number', [-1, MAX_AMOUNT])
+def test_out_of_range(number):
+    with pytest.raises(ValueError):
+        korean_numeral(number)
+
+def test_number_to_korean_amounts():
+    assert number_to_korean_amounts([10, 0, 10]) == ['금일십원정', '금원정', '금일십원정']
+
+def test_number_to_korean_amounts_matches_single_values():
+    numbers = list(boundary_numbers())[::97] + list(range(0, 100000, 7)) + [0, 10, 0]
+    assert number_to_korean_amounts(numbers) == [number_to_korean_amount(number) for number in numbers]
@@ -0,0 +1,73 @@
+import os
+import tarfile
+import zipfile
+import pytest
+from hangulo_core import ConversionRun
+from hangulo_config import load_field_map
+from hangulo_pipeline import PipelineRun
+
+def convert(run_class, file_paths, output_directory, template_directory, config_file, workers, group_key):
+    os.makedirs(output_directory)
+    run = run_class(file_paths, output_directory, template_directory, config_file, workers, group_key)
+    assert all(result.status == 'converted' for result in run.results())
+
+    outputs = {}
+    for name in sorted(os.listdir(output_directory)):
+        with open(os.path.join(output_directory, name), 'rb') as file:
+            outputs[name] = file.read()
+    return outputs
+
+@pytest.mark.parametrize('row_count, layout, group_key', [
+    (1, 'files', None),
+    (3, 'files', None),
+    (7, 'files', None),
+    (2, 'split', '문서번호'),
+])
+def test_serial_parallel_and_pipeline_outputs_are_identical(tmp_path, make_workbooks, template_directory, config_file,
+                                                            row_count, layout, group_key):
+    file_paths = make_workbooks('in', 4, row_count, layout)
+
+    serial = convert(ConversionRun, file_paths, str(tmp_path / 'serial'), template_directory, config_file, 1, group_key)
+    parallel = convert(ConversionRun, file_paths, str(tmp_path / 'parallel'), template_directory, config_file, 2, group_key)
+    pipeline = convert(PipelineRun, file_paths, str(tmp_path / 'pipeline'), template_directory, config_file, 1, group_key)
+
+    assert len(serial) == (len(file_paths) if group_key is None else 4)
+    assert parallel == serial
+    assert pipeline == serial
+
+def read_bundle(bundle_file):
+    # 묶음의 (항목 이름, 내용) 목록 (묶음에 들어간 순서)
+    if tarfile.is_tarfile(bundle_file):
+        with tarfile.open(bundle_file) as archive:
+            return [(member.name, archive.extractfile(member).read()) for member in archive.getmembers()]
+    with zipfile.ZipFile(bundle_file) as archive:
+        return [(name, archive.read(name)) for name in archive.namelist()]
+
+def convert_bundle(run_class, file_paths, bundle_file, template_directory, config_file, workers, group_key, output_mode,
+                   **kwargs):
+    run = run_class(file_paths, os.path.dirname(bundle_file), template_directory, config_file, workers, group_key,
+                    output_mode=output_mode, bundle_file=bundle_file, **kwargs)
+    assert all(result.status == 'converted' for result in run.results())
+    return read_bundle(bundle_file)
+
+@pytest.mark.parametrize('output_mode', ['zip', 'tar'])
+@pytest.mark.parametrize('layout, group_key', [('files', None), ('split', '문서번호')])
+def test_pipeline_bundle_is_written_in_input_order(tmp_path, make_workbooks, template_directory, config_file,
+                                                   output_mode, layout, group_key):
+    file_paths = make_workbooks('in', 12, 3, layout)
+    # 단계마다 스레드를 여럿 두어 문서가 입력 순서와 다르게 끝나도록 합니다.
+    settings = load_field_map(config_file).pipeline._replace(
+        workers={'discover': 1, 'read': 3, 'render': 3, 'package': 3, 'write': 3}, queue_size=2)
+
+    serial = convert_bundle(ConversionRun, file_paths, str(tmp_path / f'serial.{output_mode}'), template_directory,
+                            config_file, 1, group_key, output_mode)
+    parallel = convert_bundle(ConversionRun, file_paths, str(tmp_path / f'parallel.{output_mode}'), template_directory,
+                              config_file, 2, group_key, output_mode)
+    pipelines = [convert_bundle(PipelineRun, file_paths, str(tmp_path / f'pipeline-{index}.{output_mode}'),
+                                template_directory, config_file, 1, group_key, output_mode, settings=settings)
+                 for index in range(3)]
+
+    assert len(serial) == 13
+    assert parallel == serial
+    for pipeline in pipelines:
+        assert pipeline == serial
@@ -0,0 +1,31 @@
+import pytest
+import hangulo_profiler
+from hangulo_pipeline import convert_pipeline
+from hangulo_profiler import STAGES, ProfileReport
+
+@pytest.fixture
+def profiling(monkeypatch):
+    monkeypatch.setattr(hangulo_profiler, '_enabled', True)
+
+@pytest.mark.parametrize('group_key', [None, '문서번호'])
+def test_pipeline_results_carry_stage_timings(tmp_path, make_workbooks, template_directory, config_file, profiling, group_key):
+    layout = 'split' if group_key else 'files'
+    file_paths = make_workbooks('in', 3, 2, layout)
+    output_directory = tmp_path / 'out'
+    output_directory.mkdir()
+
+    report = ProfileReport('test', 1)
+    results = list(convert_pipeline(file_paths, str(output_directory), template_directory, config_file, group_key))
+    for result in results:
+        report.add(result)
+
+    data = report.to_dict()
+    assert data['document_count'] == 3
+    assert set(data['stages']) == set(STAGES) | {'total'}
+    for document in data['documents']:
+        assert document['total'] >= document['render']
+
+def test_pipeline_without_profiling_has_no_timings(tmp_path, make_workbooks, template_directory, config_file):
+    file_paths = make_workbooks('in', 2, 1)
+    results = list(convert_pipeline(file_paths, str(tmp_path), template_directory, config_file))
+    assert [result.timings for result in results] == [None, None]
@@ -0,0 +1,38 @@
+import pytest
+from hangulo_core import ConversionResult, ConversionRun
+from hangulo_pipeline import PipelineRun
+from hangulo_progress import ProgressTracker
+
+def test_split_file_counts_only_on_final_result():
+    tracker = ProgressTracker(1)
+    snapshot = tracker.update(ConversionResult('a_1.hwpx', 'converted', None, 'a.xlsx', final=False))
+    assert (snapshot.files_done, snapshot.percent, snapshot.documents) == (0, 0, 0)
+    assert snapshot.eta_seconds is None
+
+    snapshot = tracker.update(ConversionResult('a_2.hwpx', 'converted', None, 'a.xlsx'))
+    assert (snapshot.files_done, snapshot.percent, snapshot.eta_seconds) == (1, 100, 0.0)
+
+def test_up_to_date_files_are_not_counted_in_speed():
+    tracker = ProgressTracker(2)
+    snapshot = tracker.update(ConversionResult('a.xlsx', 'up-to-date', None, 'a.xlsx'))
+    assert snapshot.files_done == 1
+    assert snapshot.files_per_second == 0.0
+
+@pytest.mark.parametrize('run_class', [ConversionRun, PipelineRun])
+def test_split_mode_marks_last_document_final(tmp_path, make_workbooks, template_directory, config_file, run_class):
+    file_paths = make_workbooks('split', 4, 2, 'split') + make_workbooks('single', 1, 1)
+    run = run_class(file_paths, str(tmp_path / 'out'), template_directory, config_file, group_key='문서번호')
+    (tmp_path / 'out').mkdir()
+
+    tracker = ProgressTracker(len(file_paths))
+    done = []
+    results = []
+    for result in run.results():
+        results.append(result)
+        done.append(tracker.update(result).files_done)
+
+    split_results = [result for result in results if result.source == 'bench.xlsx']
+    assert [result.final for result in split_results] == [False, False, False, True]
+    assert sum(result.final for result in results) == 2
+    assert done[-1] == 2
+    assert max(done[:results.index(split_results[-1])], default=0) <= 1
@@ -0,0 +1,91 @@
+import io
+import datetime
+import pytest
+from openpyxl import Workbook
+from hangulo_core import ConversionRun, check_output_names, find_output_name_collisions
+from hangulo_readers import group_records, is_input_file, iter_records, read_records
+
+CSV_HEADER = '문서번호,사건번호,성명,주민등록번호,주소,과세연도,과세번호,법정기일,세액,가산금,계\n'
+CSV_ROW = '징수과-123,2023-123,양동호,111111-1111111,경기 하남,2022,0231425,2022-5-30,"40,000",400,40400\n'
+
+EXPECTED = {
+    '문서번호': '징수과-123',
+    '사건번호': '2023-123',
+    '성명': '양동호',
+    '주민등록번호': '111111-1111111',
+    '주소': '경기 하남',
+    '과세연도': '2022',
+    '과세번호': '0231425',
+    '법정기일': datetime.datetime(2022, 5, 30),
+    '세액': 40000,
+    '가산금': 400,
+    '계': 40400,
+}
+
+def write_xlsx(path, field_map, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws['A1'] = '제목'
+    for row_number, values in enumerate(rows, 2):
+        for key, value in values.items():
+            ws[f'{field_map.columns[key]}{row_number}'] = value
+    wb.save(path)
+
+def test_csv_by_header_name(field_map):
+    records = read_records(io.BytesIO((CSV_HEADER + CSV_ROW).encode('utf-8-sig')), field_map, '.csv')
+    assert records == [EXPECTED]
+
+def test_csv_cp949_and_blank_rows(field_map):
+    data = (CSV_HEADER + CSV_ROW + ',,,,,,,,,,\n').encode('cp949')
+    assert read_records(io.BytesIO(data), field_map, 'csv') == [EXPECTED]
+
+def test_csv_unknown_encoding(field_map):
+    with pytest.raises(ValueError):
+        read_records(io.BytesIO(b'\xff\xfe\xfa' * 10), field_map, '.csv')
+
+def test_jsonl_converts_text_values(field_map):
+    line = ('{"문서번호": "징수과-123", "사건번호": "2023-123", "성명": "양동호", "주민등록번호": "111111-1111111", '
+            '"주소": "경기 하남", "과세연도": "2022", "과세번호": "0231425", "법정기일": "2022.05.30", '
+            '"세액": "40,000", "가산금": 400, "계": 40400}\n\n')
+    assert read_records(io.BytesIO(line.encode('utf-8')), field_map, '.jsonl') == [EXPECTED]
+
+def test_jsonl_rejects_non_object(field_map):
+    with pytest.raises(ValueError, match='2번째 줄'):
+        read_records(io.BytesIO(b'{"a": 1}\n[1, 2]\n'), field_map, '.jsonl')
+
+def test_xlsx_reads_configured_columns(tmp_path, field_map):
+    path = tmp_path / 'case.xlsx'
+    write_xlsx(path, field_map, [EXPECTED, dict(EXPECTED, 성명='최윤희')])
+    records = read_records(str(path), field_map)
+    assert [record['성명'] for record in records] == ['양동호', '최윤희']
+    assert records[0] == EXPECTED
+
+def test_unknown_format(field_map):
+    with pytest.raises(ValueError):
+        list(iter_records(io.BytesIO(b''), field_map, '.tsv'))
+
+def test_is_input_file():
+    assert is_input_file('case.XLSX')
+    assert is_input_file('rows.ndjson')
+    assert not is_input_file('~$case.xlsx')
+    assert not is_input_file('case.hwpx')
+
+def test_group_records_continues_blank_group_values():
+    records = [{'문서번호': 'A'}, {'문서번호': None}, {'문서번호': 'B'}, {'문서번호': 'B'}, {'문서번호': 'A'}]
+    groups = list(group_records(records, '문서번호'))
+    assert [(value, len(group)) for value, group in groups] == [('A', 2), ('B', 2), ('A', 1)]
+
+def test_output_name_collisions():
+    assert find_output_name_collisions(['a/case.xlsx', 'b/other.csv']) == {}
+    assert find_output_name_collisions(['a/case.xlsx', 'a/case.csv']) == {'case.hwpx': ['case.xlsx', 'case.csv']}
+    with pytest.raises(ValueError, match='case.hwpx'):
+        check_output_names(['case.xlsx', 'case.jsonl'])
+
+def test_run_rejects_collisions_before_converting(tmp_path, template_directory, config_file):
+    (tmp_path / 'case.csv').write_bytes((CSV_HEADER + CSV_ROW).encode('utf-8'))
+    (tmp_path / 'case.jsonl').write_bytes(b'{"\xec\x84\xb1\xeb\xaa\x85": "x"}\n')
+    run = ConversionRun([str(tmp_path / 'case.csv'), str(tmp_path / 'case.jsonl')], str(tmp_path / 'out'),
+                        template_directory, config_file)
+    with pytest.raises(ValueError, match='case.hwpx'):
+        list(run.results())
+    assert not (tmp_path / 'out' / 'case.hwpx').exists()
@@ -0,0 +1,62 @@
+import io
+import json
+import zipfile
+import threading
+import http.client
+import pytest
+from hangulo_server import ConversionService, create_server
+
+ROW = {'문서번호': '징수과-123', '성명': '양동호', '과세번호': '0231425', '법정기일': '2022.05.30',
+       '세액': '40,000', '가산금': '400', '계': '40,400'}
+
+@pytest.fixture
+def service(template_directory, config_file):
+    service = ConversionService(template_directory, config_file, workers=2)
+    yield service
+    service.close()
+
+@pytest.fixture
+def server(template_directory, config_file):
+    server = create_server('127.0.0.1', 0, template_directory, config_file, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+def request(server, method, path, body=None, content_type='application/json'):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+    headers = {'Content-Type': content_type} if body is not None else {}
+    connection.request(method, path, body, headers)
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    return response.status, data
+
+def test_json_rows_are_converted_like_jsonl(service):
+    body = json.dumps({'rows': [ROW, {'성명': ''}]}, ensure_ascii=False).encode('utf-8')
+    jsonl = json.dumps(ROW, ensure_ascii=False).encode('utf-8')
+
+    documents = service.read_documents(body, 'application/json')
+    assert documents == [('document-1', service.read_documents(jsonl, 'application/x-ndjson')[0][1])]
+    assert documents[0][1][0]['계'] == 40400
+
+def test_convert_json_rows(service):
+    body = json.dumps([ROW], ensure_ascii=False).encode('utf-8')
+    name, data = service.convert(body, 'application/json')
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        section = archive.read('Contents/section0.xml').decode('utf-8')
+    assert name == 'document-1'
+    assert '40,400' in section
+
+def test_unknown_paths_share_one_metrics_key(server):
+    for path in ('/a', '/b', '/c?x=1'):
+        assert request(server, 'GET', path)[0] == 404
+    assert request(server, 'GET', '/health')[0] == 200
+
+    status, data = request(server, 'GET', '/metrics')
+    endpoints = json.loads(data)['endpoints']
+    assert status == 200
+    assert endpoints['other']['count'] == 3
+    assert set(endpoints) == {'other', '/health'}
@@ -0,0 +1,39 @@
+import os
+import shutil
+from hwpx_template import TEMPLATE_ARTIFACT_DIRECTORY, TemplateCache, template_artifact_path, template_cache
+
+def copy_base_template(tmp_path, template_directory):
+    hwpx_file = tmp_path / 'template-tax-1.hwpx'
+    shutil.copyfile(os.path.join(template_directory, 'template-tax-1.hwpx'), hwpx_file)
+    return str(hwpx_file)
+
+def test_module_cache_does_not_persist():
+    assert template_cache.persist is False
+
+def test_default_cache_writes_no_artifacts(tmp_path, template_directory):
+    hwpx_file = copy_base_template(tmp_path, template_directory)
+    cache = TemplateCache()
+    cache.get(hwpx_file)
+    cache.get_expanded(hwpx_file, 7, '계')
+    assert not (tmp_path / TEMPLATE_ARTIFACT_DIRECTORY).exists()
+
+def test_persisting_cache_stores_only_base_template(tmp_path, template_directory):
+    hwpx_file = copy_base_template(tmp_path, template_directory)
+    cache = TemplateCache(persist=True)
+    expanded = cache.get_expanded(hwpx_file, 7, '계')
+    assert os.listdir(tmp_path / TEMPLATE_ARTIFACT_DIRECTORY) == ['template-tax-1.hwpx.tpl']
+
+    # 새 프로세스처럼 빈 캐시로 읽으면 저장한 기준 템플릿을 쓰고, 확장 결과는 같습니다.
+    reloaded = TemplateCache(persist=True)
+    assert reloaded.get_expanded(hwpx_file, 7, '계').template.segments == expanded.template.segments
+    assert reloaded.stats()['artifact_hits'] == 1
+
+def test_stale_artifact_is_ignored(tmp_path, template_directory):
+    hwpx_file = copy_base_template(tmp_path, template_directory)
+    TemplateCache(persist=True).get(hwpx_file)
+    with open(template_artifact_path(hwpx_file), 'r+b') as file:
+        file.write(b'broken')
+
+    cache = TemplateCache(persist=True)
+    assert cache.get(hwpx_file).template.count('계') == 1
+    assert cache.stats()['artifact_hits'] == 0
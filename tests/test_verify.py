@@ -0,0 +1,93 @@
+import io
+import os
+import zipfile
+import pytest
+from hwpx_writer import SECTION_NAME, read_raw_members, write_hwpx
+from hwpx_template import CompiledTemplate
+from hangulo_core import ConversionRun, fill_template
+from hangulo_verify import reconcile, verify_outputs
+from hangulo_numerals import MAX_AMOUNT
+
+@pytest.fixture
+def converted(tmp_path, make_workbooks, template_directory, config_file):
+    """
+    행이 3개인 문서 하나를 변환하고 (입력 파일 경로 목록, 출력 디렉토리, Hwpx 파일 경로)를 리턴합니다.
+    """
+    file_paths = make_workbooks('input', 1, 3)
+    output_directory = str(tmp_path / 'out')
+    os.makedirs(output_directory)
+    list(ConversionRun(file_paths, output_directory, template_directory, config_file).results())
+    return file_paths, output_directory, os.path.join(output_directory, 'bench-000000.hwpx')
+
+def rewrite_section(hwpx_file, change):
+    with open(hwpx_file, 'rb') as file:
+        members = read_raw_members(io.BytesIO(file.read()))
+    with zipfile.ZipFile(hwpx_file) as archive:
+        section_xml = archive.read(SECTION_NAME).decode('UTF-8')
+    with open(hwpx_file, 'wb') as file:
+        write_hwpx(members, file, {SECTION_NAME: change(section_xml)})
+
+def mismatches(converted, template_directory, config_file):
+    file_paths, output_directory, _ = converted
+    return [mismatch for check in verify_outputs(file_paths, output_directory, 'files', template_directory, config_file)
+            for mismatch in check.mismatches]
+
+def swap(text, first, second):
+    return text.replace(first, '\0').replace(second, first).replace('\0', second)
+
+def test_untouched_output_matches(converted, template_directory, config_file):
+    assert mismatches(converted, template_directory, config_file) == []
+
+def test_swapped_rows_are_found(converted, template_directory, config_file):
+    # 두 행의 과세번호를 서로 바꾸면 문서에는 두 값이 모두 있지만 행이 다릅니다.
+    rewrite_section(converted[2], lambda xml: swap(xml, '과세번호-0-0', '과세번호-0-1'))
+    found = mismatches(converted, template_directory, config_file)
+    assert [(m.kind, m.key, m.row, m.found) for m in found] == [
+        ('value_mismatch', '과세번호', 0, '과세번호-0-1'),
+        ('value_mismatch', '과세번호', 1, '과세번호-0-0'),
+    ]
+
+def test_value_in_other_field_is_found(converted, template_directory, config_file):
+    # 같은 행의 과세연도와 과세번호 자리가 바뀐 경우
+    rewrite_section(converted[2], lambda xml: swap(xml, '과세연도-0-2', '과세번호-0-2'))
+    found = mismatches(converted, template_directory, config_file)
+    assert {(m.key, m.row) for m in found} == {('과세연도', 2), ('과세번호', 2)}
+
+def test_wrong_total_is_found(converted, template_directory, config_file):
+    def change_korean_total(xml):
+        start = xml.index('원(금') + 3
+        end = xml.index('원정)', start)
+        return xml[:start] + '일' + xml[start:end] + xml[end:]
+
+    rewrite_section(converted[2], change_korean_total)
+    found = mismatches(converted, template_directory, config_file)
+    assert [(m.kind, m.key) for m in found] == [('total_mismatch', 'TAX_TOTAL_AMOUNT_STR')]
+
+def test_broken_xml_and_missing_output(converted, template_directory, config_file):
+    rewrite_section(converted[2], lambda xml: xml.replace('과세번호-0-0', '과세번호 & 0'))
+    assert [m.kind for m in mismatches(converted, template_directory, config_file)] == ['xml_error']
+
+    os.remove(converted[2])
+    assert [m.kind for m in mismatches(converted, template_directory, config_file)] == ['missing_output']
+
+def test_unreplaced_placeholder(converted, template_directory, config_file):
+    rewrite_section(converted[2], lambda xml: xml.replace('과세번호-0-1', '%과세번호%'))
+    found = mismatches(converted, template_directory, config_file)
+    assert [(m.kind, m.key, m.row) for m in found] == [('unreplaced_placeholder', '과세번호', 1)]
+
+def test_layout_change_is_reported(converted, template_directory, config_file):
+    rewrite_section(converted[2], lambda xml: xml.replace('</hp:t>', '</hp:t><hp:t/>', 1))
+    assert [m.kind for m in mismatches(converted, template_directory, config_file)] == ['layout_mismatch']
+
+TOTAL_TEMPLATE = '<hp:p><hp:t>%계%</hp:t><hp:t>%TAX_TOTAL_AMOUNT%</hp:t><hp:t>%TAX_TOTAL_AMOUNT_STR%</hp:t></hp:p>'
+
+@pytest.mark.parametrize('amount', [0, 10, 128600, 10 ** 16, 10 ** 20, 9 * 10 ** 32 + 19, MAX_AMOUNT - 1])
+def test_total_above_every_unit(field_map, amount):
+    template = CompiledTemplate(TOTAL_TEMPLATE)
+    records = [dict.fromkeys(field_map.fields, None) | {'계': amount}]
+    section_xml = fill_template(records, template, 'total', field_map)
+    assert reconcile('total.hwpx', 'total.xlsx', section_xml, records, template, field_map) == []
+
+    wrong = section_xml.replace('원정)', '만원정)') if amount else section_xml.replace('금원정', '금일원정')
+    found = reconcile('total.hwpx', 'total.xlsx', wrong, records, template, field_map)
+    assert [(m.kind, m.key) for m in found] == [('total_mismatch', 'TAX_TOTAL_AMOUNT_STR')]
@@ -0,0 +1,36 @@
+import shutil
+import hangulo_core
+from hangulo_watch import FolderWatcher, _convert_ready_files
+
+def test_failure_in_split_file_is_blamed_on_that_file(tmp_path, make_workbooks, template_directory, config_file,
+                                                      monkeypatch, capsys):
+    input_directory = tmp_path / 'watch'
+    input_directory.mkdir()
+    for name in ('a', 'b'):
+        shutil.move(make_workbooks(name, 3, 1, 'split')[0], input_directory / f'{name}.xlsx')
+    output_directory = tmp_path / 'out'
+    output_directory.mkdir()
+
+    # a.xlsx의 세 번째 문서에서 오류가 나도록 합니다.
+    calls = []
+    write_document = hangulo_core.write_document
+
+    def failing_write_document(records, gen_hwpx_file_path, *args):
+        calls.append(gen_hwpx_file_path)
+        if len(calls) == 3:
+            raise ValueError('broken document')
+        write_document(records, gen_hwpx_file_path, *args)
+
+    monkeypatch.setattr(hangulo_core, 'write_document', failing_write_document)
+
+    watcher = FolderWatcher(str(input_directory), settle_seconds=0)
+    watcher.poll(now=0)
+    file_paths = watcher.poll(now=0)
+    results = []
+    _convert_ready_files(watcher, file_paths, str(output_directory), template_directory, config_file, 1,
+                         '문서번호', None, results.append, 'files')
+
+    assert [(result.source, result.final) for result in results] == [('a.xlsx', False)]
+    assert '변환 실패: a.xlsx: broken document' in capsys.readouterr().err
+    # 실패한 a.xlsx는 바뀔 때까지 건너뛰고, 변환하지 못한 b.xlsx는 다음 확인 때 다시 변환합니다.
+    assert watcher.poll(now=1) == [str(input_directory / 'b.xlsx')]
@@ -0,0 +1,101 @@
+import io
+import os
+import re
+import json
+import tarfile
+import zipfile
+import pytest
+import hwpx_writer
+from hwpx_writer import (CONTAINER_RDF_NAME, CONTENT_HPF_NAME, HEADER_NAME, SECTION_NAME, HwpxPackageWriter,
+                         MergedHwpxWriter, RawMember, read_raw_members, write_hwpx)
+from hangulo_bundle import INDEX_NAME, BundleWriter, read_bundle_index
+
+def base_members(template_directory):
+    return read_raw_members(os.path.join(template_directory, 'template-tax-1.hwpx'))
+
+def test_write_hwpx_replaces_only_given_member(template_directory):
+    members = base_members(template_directory)
+    buffer = io.BytesIO()
+    write_hwpx(members, buffer, {SECTION_NAME: '<section/>'})
+
+    with zipfile.ZipFile(buffer) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [member.name for member in members]
+        assert archive.infolist()[0].compress_type == zipfile.ZIP_STORED
+        assert archive.read(SECTION_NAME) == b'<section/>'
+        with zipfile.ZipFile(os.path.join(template_directory, 'template-tax-1.hwpx')) as template:
+            assert archive.read(HEADER_NAME) == template.read(HEADER_NAME)
+
+def test_merged_writer_lists_every_section(template_directory):
+    members = base_members(template_directory)
+    buffer = io.BytesIO()
+    writer = MergedHwpxWriter(buffer)
+    for index in range(3):
+        writer.add_section(members, f'<section index="{index}"/>')
+    writer.close()
+
+    with zipfile.ZipFile(buffer) as archive:
+        assert archive.testzip() is None
+        assert [archive.read(f'Contents/section{i}.xml') for i in range(3)] == \
+            [f'<section index="{i}"/>'.encode() for i in range(3)]
+        assert re.search(r'secCnt="3"', archive.read(HEADER_NAME).decode())
+
+        content_hpf = archive.read(CONTENT_HPF_NAME).decode()
+        rdf = archive.read(CONTAINER_RDF_NAME).decode()
+        for i in range(3):
+            assert f'<opf:item id="section{i}" href="Contents/section{i}.xml"' in content_hpf
+            assert f'<opf:itemref idref="section{i}" linear="yes"/>' in content_hpf
+            assert f'rdf:resource="Contents/section{i}.xml"' in rdf
+            assert f'<rdf:Description rdf:about="Contents/section{i}.xml">' in rdf
+        assert 'section3' not in content_hpf + rdf
+
+def test_merged_writer_rejects_different_header(template_directory):
+    members = base_members(template_directory)
+    other = [hwpx_writer.encode_member(HEADER_NAME, b'<other/>') if member.name == HEADER_NAME else member
+             for member in members]
+    writer = MergedHwpxWriter(io.BytesIO())
+    writer.add_section(members, '<section/>')
+    with pytest.raises(ValueError, match='header.xml'):
+        writer.add_section(other, '<section/>')
+
+def test_merged_writer_requires_section_entries(template_directory):
+    members = [hwpx_writer.encode_member(CONTENT_HPF_NAME, b'<opf:package/>') if member.name == CONTENT_HPF_NAME
+               else member for member in base_members(template_directory)]
+    writer = MergedHwpxWriter(io.BytesIO())
+    writer.add_section(members, '<section/>')
+    with pytest.raises(ValueError, match='content.hpf'):
+        writer.close()
+
+def test_package_writer_refuses_zip64_sizes():
+    member = RawMember('big.bin', zipfile.ZIP_STORED, 0, (1980, 1, 1, 0, 0, 0), 0, 0x100000000, 0x100000000, 0, 0, b'')
+    with pytest.raises(ValueError, match='4GB'):
+        HwpxPackageWriter(io.BytesIO()).write_raw(member)
+
+def test_package_writer_refuses_too_many_entries(monkeypatch):
+    monkeypatch.setattr(hwpx_writer, 'ZIP_MAX_ENTRIES', 2)
+    writer = HwpxPackageWriter(io.BytesIO())
+    writer.write_data('a.xml', b'a')
+    writer.write_data('b.xml', b'b')
+    with pytest.raises(ValueError, match='항목 수'):
+        writer.write_data('c.xml', b'c')
+
+@pytest.mark.parametrize('bundle_format', ['zip', 'tar'])
+def test_bundle_index(tmp_path, bundle_format):
+    bundle_file = tmp_path / f'batch.{bundle_format}'
+    with open(bundle_file, 'wb') as file:
+        bundle = BundleWriter(file, bundle_format)
+        bundle.add('case1.hwpx', b'one', 'case1.xlsx')
+        bundle.add('case2.hwpx', b'two', 'case2.csv')
+        with pytest.raises(ValueError):
+            bundle.add('case1.hwpx', b'again', 'case1.csv')
+        bundle.close()
+
+    index = read_bundle_index(str(bundle_file))
+    assert [(entry['name'], entry['source'], entry['size']) for entry in index] == \
+        [('case1.hwpx', 'case1.xlsx', 3), ('case2.hwpx', 'case2.csv', 3)]
+    if bundle_format == 'tar':
+        with tarfile.open(bundle_file) as archive:
+            assert archive.getnames() == ['case1.hwpx', 'case2.hwpx', INDEX_NAME]
+    else:
+        with zipfile.ZipFile(bundle_file) as archive:
+            assert json.loads(archive.read(INDEX_NAME).splitlines()[1])['name'] == 'case2.hwpx'